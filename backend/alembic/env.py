@@ -12,6 +12,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 from app.database import Base
 from app.models.user import User
 from app.models.transaction import Transaction
+from app.models.transaction_rollup import TransactionRollup
 from app.models.plaid import PlaidItem, PlaidAccount
 from app.models.personality import PersonalityProfile
 
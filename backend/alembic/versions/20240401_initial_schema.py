@@ -0,0 +1,135 @@
+"""initial schema
+
+Revision ID: 20240401_initial_schema
+Revises: 
+Create Date: 2024-04-01 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20240401_initial_schema'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Tables as they were before migrations tracked them, so a new database
+    # can be built with ``alembic upgrade head`` alone
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('hashed_password', sa.String(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_users_id', 'users', ['id'])
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+
+    op.create_table(
+        'plaid_items',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('item_id', sa.String(), nullable=True),
+        sa.Column('access_token', sa.String(), nullable=True),
+        sa.Column('institution_id', sa.String(), nullable=True),
+        sa.Column('institution_name', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('access_token')
+    )
+    op.create_index('ix_plaid_items_id', 'plaid_items', ['id'])
+    op.create_index('ix_plaid_items_item_id', 'plaid_items', ['item_id'], unique=True)
+
+    op.create_table(
+        'plaid_accounts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('plaid_item_id', sa.Integer(), nullable=True),
+        sa.Column('account_id', sa.String(), nullable=True),
+        sa.Column('name', sa.String(), nullable=True),
+        sa.Column('official_name', sa.String(), nullable=True),
+        sa.Column('type', sa.String(), nullable=True),
+        sa.Column('subtype', sa.String(), nullable=True),
+        sa.Column('mask', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['plaid_item_id'], ['plaid_items.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_plaid_accounts_id', 'plaid_accounts', ['id'])
+    op.create_index(
+        'ix_plaid_accounts_account_id', 'plaid_accounts', ['account_id'], unique=True
+    )
+
+    op.create_table(
+        'personality_profiles',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('openness', sa.String(), nullable=False),
+        sa.Column('social_energy', sa.String(), nullable=False),
+        sa.Column('learning_style', sa.String(), nullable=False),
+        sa.Column('activity_intensity', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id')
+    )
+    op.create_index('ix_personality_profiles_id', 'personality_profiles', ['id'])
+
+    op.create_table(
+        'transactions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('plaid_item_id', sa.Integer(), nullable=False),
+        sa.Column('plaid_account_id', sa.Integer(), nullable=False),
+        sa.Column('amount', sa.Float(), nullable=False),
+        sa.Column('currency', sa.String(), nullable=False),
+        sa.Column(
+            'type',
+            sa.Enum(
+                'INCOME',
+                'EXPENSE',
+                'INVESTMENT',
+                'TRANSFER',
+                name='transactiontypeenum',
+            ),
+            nullable=False,
+        ),
+        sa.Column('category', sa.String(), nullable=False),
+        sa.Column('merchant_name', sa.String(), nullable=True),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column(
+            'status',
+            sa.Enum('PENDING', 'POSTED', name='transactionstatusenum'),
+            nullable=False,
+        ),
+        sa.Column('transaction_date', sa.DateTime(), nullable=False),
+        sa.Column('posted_date', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['plaid_item_id'], ['plaid_items.id']),
+        sa.ForeignKeyConstraint(['plaid_account_id'], ['plaid_accounts.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_transactions_id', 'transactions', ['id'])
+    op.create_index('ix_transactions_user_id', 'transactions', ['user_id'])
+    op.create_index(
+        'ix_transactions_plaid_account_id', 'transactions', ['plaid_account_id']
+    )
+    op.create_index(
+        'ix_transactions_transaction_date', 'transactions', ['transaction_date']
+    )
+    op.create_index('ix_transactions_status', 'transactions', ['status'])
+
+def downgrade() -> None:
+    op.drop_table('transactions')
+    op.drop_table('personality_profiles')
+    op.drop_table('plaid_accounts')
+    op.drop_table('plaid_items')
+    op.drop_table('users')
@@ -1,7 +1,7 @@
 """add sessions table
 
 Revision ID: 20240420_add_sessions
-Revises: 
+Revises: 20240401_initial_schema
 Create Date: 2024-04-20 17:00:00.000000
 
 """
@@ -11,7 +11,7 @@ from sqlalchemy.dialects import sqlite
 
 # revision identifiers, used by Alembic.
 revision = '20240420_add_sessions'
-down_revision = None
+down_revision = '20240401_initial_schema'
 branch_labels = None
 depends_on = None
 
@@ -0,0 +1,52 @@
+"""add transaction rollups
+
+Revision ID: 20261018_add_transaction_rollups
+Revises: 20261018_transaction_composite_indexes
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261018_add_transaction_rollups'
+down_revision = '20261018_transaction_composite_indexes'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        'transaction_rollups',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('year_month', sa.String(length=7), nullable=False),
+        sa.Column('category', sa.String(), nullable=False),
+        sa.Column(
+            'type',
+            sa.Enum(
+                'INCOME',
+                'EXPENSE',
+                'INVESTMENT',
+                'TRANSFER',
+                name='transactiontypeenum',
+            ),
+            nullable=False,
+        ),
+        sa.Column('total', sa.Float(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('user_id', 'year_month', 'category', 'type')
+    )
+    # Backfill from existing transactions; the API keeps it current from here on
+    op.execute(
+        """
+        INSERT INTO transaction_rollups
+            (user_id, year_month, category, type, total, count)
+        SELECT user_id, strftime('%Y-%m', transaction_date), category, type,
+               SUM(amount), COUNT(*)
+        FROM transactions
+        GROUP BY user_id, strftime('%Y-%m', transaction_date), category, type
+        """
+    )
+
+def downgrade() -> None:
+    op.drop_table('transaction_rollups')
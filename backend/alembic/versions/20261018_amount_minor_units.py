@@ -0,0 +1,107 @@
+"""store transaction amounts as integer minor units
+
+Revision ID: 20261018_amount_minor_units
+Revises: 20261018_add_transaction_rollups
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261018_amount_minor_units'
+down_revision = '20261018_add_transaction_rollups'
+branch_labels = None
+depends_on = None
+
+# 10 ** minor-unit exponent per currency (see app.utils.money)
+SCALE = "CASE currency WHEN 'JPY' THEN 1 ELSE 100 END"
+
+def upgrade() -> None:
+    op.add_column(
+        'transactions', sa.Column('amount_minor', sa.Integer(), nullable=True)
+    )
+    op.execute(
+        "UPDATE transactions"
+        f" SET amount_minor = CAST(ROUND(amount * {SCALE}) AS INTEGER)"
+    )
+    with op.batch_alter_table('transactions') as batch_op:
+        batch_op.alter_column(
+            'amount_minor', existing_type=sa.Integer(), nullable=False
+        )
+        batch_op.drop_column('amount')
+
+    # Rollup buckets gain the currency so totals never mix units
+    op.drop_table('transaction_rollups')
+    op.create_table(
+        'transaction_rollups',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('year_month', sa.String(length=7), nullable=False),
+        sa.Column('category', sa.String(), nullable=False),
+        sa.Column(
+            'type',
+            sa.Enum(
+                'INCOME',
+                'EXPENSE',
+                'INVESTMENT',
+                'TRANSFER',
+                name='transactiontypeenum',
+            ),
+            nullable=False,
+        ),
+        sa.Column('currency', sa.String(), nullable=False),
+        sa.Column('total_minor', sa.Integer(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('user_id', 'year_month', 'category', 'type', 'currency')
+    )
+    op.execute(
+        """
+        INSERT INTO transaction_rollups
+            (user_id, year_month, category, type, currency, total_minor, count)
+        SELECT user_id, strftime('%Y-%m', transaction_date), category, type, currency,
+               SUM(amount_minor), COUNT(*)
+        FROM transactions
+        GROUP BY user_id, strftime('%Y-%m', transaction_date), category, type, currency
+        """
+    )
+
+def downgrade() -> None:
+    op.add_column('transactions', sa.Column('amount', sa.Float(), nullable=True))
+    op.execute(f"UPDATE transactions SET amount = CAST(amount_minor AS REAL) / {SCALE}")
+    with op.batch_alter_table('transactions') as batch_op:
+        batch_op.alter_column('amount', existing_type=sa.Float(), nullable=False)
+        batch_op.drop_column('amount_minor')
+
+    op.drop_table('transaction_rollups')
+    op.create_table(
+        'transaction_rollups',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('year_month', sa.String(length=7), nullable=False),
+        sa.Column('category', sa.String(), nullable=False),
+        sa.Column(
+            'type',
+            sa.Enum(
+                'INCOME',
+                'EXPENSE',
+                'INVESTMENT',
+                'TRANSFER',
+                name='transactiontypeenum',
+            ),
+            nullable=False,
+        ),
+        sa.Column('total', sa.Float(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('user_id', 'year_month', 'category', 'type')
+    )
+    op.execute(
+        """
+        INSERT INTO transaction_rollups
+            (user_id, year_month, category, type, total, count)
+        SELECT user_id, strftime('%Y-%m', transaction_date), category, type,
+               SUM(amount), COUNT(*)
+        FROM transactions
+        GROUP BY user_id, strftime('%Y-%m', transaction_date), category, type
+        """
+    )
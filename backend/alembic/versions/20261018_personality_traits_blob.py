@@ -0,0 +1,117 @@
+"""pack encrypted personality traits into one column
+
+Revision ID: 20261018_personality_traits_blob
+Revises: 20261018_plaid_balance_snapshots
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+import json
+from base64 import b64decode, b64encode
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.security import fernet
+
+# revision identifiers, used by Alembic.
+revision = '20261018_personality_traits_blob'
+down_revision = '20261018_plaid_balance_snapshots'
+branch_labels = None
+depends_on = None
+
+TRAITS = ('openness', 'social_energy', 'learning_style', 'activity_intensity')
+BATCH_SIZE = 500
+
+profiles = sa.table(
+    'personality_profiles',
+    sa.column('id', sa.Integer()),
+    sa.column('encrypted_traits', sa.LargeBinary()),
+    *(sa.column(trait, sa.String()) for trait in TRAITS),
+)
+
+def decrypt_trait(value):
+    """A trait as the old ``decrypt_data`` read it: empty or NULL means ``''``."""
+    return fernet.decrypt(b64decode(value)).decode() if value else ''
+
+def encrypt_trait(value):
+    """A trait as the old ``encrypt_data`` stored it: ``''`` stays ``''``."""
+    return b64encode(fernet.encrypt(value.encode())).decode() if value else ''
+
+def batches(columns):
+    """Yield ``personality_profiles`` rows by ascending id, BATCH_SIZE at a time."""
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(profiles.c.id, *columns)
+            .where(profiles.c.id > last_id)
+            .order_by(profiles.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1].id
+
+def upgrade() -> None:
+    op.add_column(
+        'personality_profiles',
+        sa.Column('encrypted_traits', sa.LargeBinary(), nullable=True),
+    )
+
+    # Decryption errors abort the migration rather than lose traits
+    bind = op.get_bind()
+    for rows in batches([profiles.c[trait] for trait in TRAITS]):
+        bind.execute(
+            profiles.update()
+            .where(profiles.c.id == sa.bindparam('row_id'))
+            .values(encrypted_traits=sa.bindparam('token')),
+            [
+                {
+                    'row_id': row.id,
+                    'token': fernet.encrypt(json.dumps(
+                        {trait: decrypt_trait(row._mapping[trait]) for trait in TRAITS},
+                        separators=(',', ':'),
+                    ).encode()),
+                }
+                for row in rows
+            ],
+        )
+
+    with op.batch_alter_table('personality_profiles') as batch_op:
+        batch_op.alter_column(
+            'encrypted_traits', existing_type=sa.LargeBinary(), nullable=False
+        )
+        for trait in TRAITS:
+            batch_op.drop_column(trait)
+
+def downgrade() -> None:
+    for trait in TRAITS:
+        op.add_column(
+            'personality_profiles', sa.Column(trait, sa.String(), nullable=True)
+        )
+
+    bind = op.get_bind()
+    for rows in batches([profiles.c.encrypted_traits]):
+        bind.execute(
+            profiles.update()
+            .where(profiles.c.id == sa.bindparam('row_id'))
+            .values({trait: sa.bindparam(f'new_{trait}') for trait in TRAITS}),
+            [
+                {
+                    'row_id': row.id,
+                    **{
+                        f'new_{trait}': encrypt_trait(value)
+                        for trait, value in json.loads(
+                            fernet.decrypt(row.encrypted_traits)
+                        ).items()
+                    },
+                }
+                for row in rows
+            ],
+        )
+
+    with op.batch_alter_table('personality_profiles') as batch_op:
+        for trait in TRAITS:
+            batch_op.alter_column(trait, existing_type=sa.String(), nullable=False)
+        batch_op.drop_column('encrypted_traits')
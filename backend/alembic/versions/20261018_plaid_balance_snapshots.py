@@ -0,0 +1,35 @@
+"""plaid balance snapshots
+
+Revision ID: 20261018_plaid_balance_snapshots
+Revises: 20261018_plaid_refresh_status
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261018_plaid_balance_snapshots'
+down_revision = '20261018_plaid_refresh_status'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        'plaid_balance_snapshots',
+        sa.Column('plaid_account_id', sa.Integer(), nullable=False),
+        sa.Column('snapshot_date', sa.Date(), nullable=False),
+        sa.Column(
+            'resolution',
+            sa.Enum('DAY', 'WEEK', 'MONTH', name='balanceresolutionenum'),
+            nullable=False,
+        ),
+        sa.Column('currency', sa.String(), nullable=False),
+        sa.Column('current_minor', sa.Integer(), nullable=True),
+        sa.Column('available_minor', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['plaid_account_id'], ['plaid_accounts.id'], ),
+        sa.PrimaryKeyConstraint('plaid_account_id', 'snapshot_date')
+    )
+
+def downgrade() -> None:
+    op.drop_table('plaid_balance_snapshots')
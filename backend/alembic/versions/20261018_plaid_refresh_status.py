@@ -0,0 +1,32 @@
+"""plaid item refresh status
+
+Revision ID: 20261018_plaid_refresh_status
+Revises: 20261018_plaid_transactions_sync
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261018_plaid_refresh_status'
+down_revision = '20261018_plaid_transactions_sync'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.add_column(
+        'plaid_items', sa.Column('last_synced_at', sa.DateTime(), nullable=True)
+    )
+    op.add_column(
+        'plaid_items', sa.Column('last_sync_duration_ms', sa.Integer(), nullable=True)
+    )
+    op.add_column(
+        'plaid_items', sa.Column('last_sync_error', sa.String(), nullable=True)
+    )
+
+def downgrade() -> None:
+    with op.batch_alter_table('plaid_items') as batch_op:
+        batch_op.drop_column('last_sync_error')
+        batch_op.drop_column('last_sync_duration_ms')
+        batch_op.drop_column('last_synced_at')
@@ -0,0 +1,47 @@
+"""plaid transactions sync cursor
+
+Revision ID: 20261018_plaid_transactions_sync
+Revises: 20261018_amount_minor_units
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261018_plaid_transactions_sync'
+down_revision = '20261018_amount_minor_units'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    with op.batch_alter_table('plaid_items') as batch_op:
+        batch_op.add_column(sa.Column('user_id', sa.Integer(), nullable=True))
+        batch_op.add_column(
+            sa.Column('transactions_cursor', sa.String(), nullable=True)
+        )
+        batch_op.create_foreign_key(
+            'fk_plaid_items_user_id_users', 'users', ['user_id'], ['id']
+        )
+        batch_op.create_index('ix_plaid_items_user_id', ['user_id'])
+
+    op.add_column(
+        'transactions', sa.Column('plaid_transaction_id', sa.String(), nullable=True)
+    )
+    op.create_index(
+        'ix_transactions_plaid_transaction_id',
+        'transactions',
+        ['plaid_transaction_id'],
+        unique=True,
+    )
+
+def downgrade() -> None:
+    op.drop_index('ix_transactions_plaid_transaction_id', table_name='transactions')
+    with op.batch_alter_table('transactions') as batch_op:
+        batch_op.drop_column('plaid_transaction_id')
+
+    with op.batch_alter_table('plaid_items') as batch_op:
+        batch_op.drop_index('ix_plaid_items_user_id')
+        batch_op.drop_constraint('fk_plaid_items_user_id_users', type_='foreignkey')
+        batch_op.drop_column('transactions_cursor')
+        batch_op.drop_column('user_id')
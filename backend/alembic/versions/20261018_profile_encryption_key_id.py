@@ -0,0 +1,36 @@
+"""personality profile encryption key id
+
+Revision ID: 20261018_profile_encryption_key_id
+Revises: 20261018_personality_traits_blob
+Create Date: 2026-10-18 23:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261018_profile_encryption_key_id'
+down_revision = '20261018_personality_traits_blob'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Existing rows stay NULL: the re-encryption job picks them up
+    op.add_column(
+        'personality_profiles',
+        sa.Column('encryption_key_id', sa.String(length=16), nullable=True),
+    )
+    op.create_index(
+        op.f('ix_personality_profiles_encryption_key_id'),
+        'personality_profiles',
+        ['encryption_key_id'],
+        unique=False,
+    )
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f('ix_personality_profiles_encryption_key_id'),
+        table_name='personality_profiles',
+    )
+    with op.batch_alter_table('personality_profiles') as batch_op:
+        batch_op.drop_column('encryption_key_id')
@@ -0,0 +1,42 @@
+"""add composite transaction listing indexes
+
+Revision ID: 20261018_transaction_composite_indexes
+Revises: 20240420_add_sessions
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '20261018_transaction_composite_indexes'
+down_revision = '20240420_add_sessions'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Composite indexes serve filtered listings in (transaction_date, id) order
+    op.create_index(
+        'ix_transactions_user_date',
+        'transactions',
+        ['user_id', 'transaction_date', 'id'],
+    )
+    op.create_index(
+        'ix_transactions_user_status_date',
+        'transactions',
+        ['user_id', 'status', 'transaction_date'],
+    )
+    op.create_index(
+        'ix_transactions_status_date',
+        'transactions',
+        ['status', 'transaction_date'],
+    )
+    # Superseded by the composites above, which share their leading column
+    op.drop_index('ix_transactions_user_id', table_name='transactions')
+    op.drop_index('ix_transactions_status', table_name='transactions')
+
+def downgrade() -> None:
+    op.create_index('ix_transactions_status', 'transactions', ['status'])
+    op.create_index('ix_transactions_user_id', 'transactions', ['user_id'])
+    op.drop_index('ix_transactions_status_date', table_name='transactions')
+    op.drop_index('ix_transactions_user_status_date', table_name='transactions')
+    op.drop_index('ix_transactions_user_date', table_name='transactions')
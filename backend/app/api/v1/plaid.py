@@ -2,43 +2,94 @@
 Plaid API routes.
 """
 
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.database import get_db
-from app.models.plaid import PlaidAccount, PlaidItem
+from app.database import get_async_db, get_async_sessionmaker
+from app.models.plaid import PlaidAccount, PlaidBalanceSnapshot, PlaidItem
 from app.schemas.plaid import (
+    DEFAULT_PLAID_TRANSACTION_FIELDS,
+    PLAID_ACCOUNT_FIELDS,
+    PLAID_TRANSACTION_FIELDS,
+    BalanceHistoryResponse,
+    BalancePoint,
     CreateLinkTokenRequest,
     ExchangeTokenRequest,
     ExchangeTokenResponse,
     LinkTokenResponse,
+    PlaidItemStatus,
+    RefreshResponse,
+    SyncTransactionsResponse,
     TransactionResponse,
+    WebhookRequest,
+    WebhookResponse,
 )
-from app.utils.plaid_client import PlaidError, create_link_token
-from app.utils.plaid_client import exchange_public_token as exchange_token
+from app.services.plaid_balances import downsample
+from app.services.plaid_refresh import PlaidRefreshWorker, get_refresh_worker
+from app.services.plaid_sync import sync_item
 from app.utils.plaid_client import (
+    PlaidError,
+    exchange_public_token_async,
+    get_link_token,
+    get_link_token_cache,
     get_plaid_client,
-    get_transactions,
+    get_transactions_async,
+    get_transactions_cache,
     handle_plaid_error,
+    invalidate_cached_transactions,
+    project_plaid_models,
 )
+from app.utils.money import from_minor
+from app.utils.plaid_webhooks import verify_webhook
 
 router = APIRouter(prefix="/plaid", tags=["plaid"])
 
+# Seconds a client waits for GET /plaid/transactions, retries included
+TRANSACTIONS_TIME_BUDGET = 30.0
+
+# Points in a balance history when the request gives no chart width
+DEFAULT_BALANCE_POINTS = 120
+MAX_BALANCE_POINTS = 2000
+# Range of a balance history when the request gives no start date
+DEFAULT_BALANCE_DAYS = 365
+
+# TRANSACTIONS webhook codes announcing changes that a sync picks up
+SYNC_WEBHOOK_CODES = {
+    "SYNC_UPDATES_AVAILABLE",
+    "DEFAULT_UPDATE",
+    "INITIAL_UPDATE",
+    "HISTORICAL_UPDATE",
+    "TRANSACTIONS_REMOVED",
+}
+
 
 @router.post("/create_link_token", response_model=LinkTokenResponse)
 async def create_plaid_link_token(
-    request: CreateLinkTokenRequest, db: Session = Depends(get_db)
+    request: CreateLinkTokenRequest, db: AsyncSession = Depends(get_async_db)
 ) -> LinkTokenResponse:
     """
     Create a Plaid Link token for initializing Plaid Link.
+
+    A user's token is reused until shortly before it expires.
     """
     try:
         client = get_plaid_client()
-        token = create_link_token(client, request.user_id, request.use_redirect)
+        token = await get_link_token(client, request.user_id, request.use_redirect)
         return LinkTokenResponse(link_token=token)
     except PlaidError as e:
         raise handle_plaid_error(e)
@@ -46,17 +97,15 @@ async def create_plaid_link_token(
 
 @router.post("/exchange_public_token", response_model=ExchangeTokenResponse)
 async def exchange_public_token(
-    request: ExchangeTokenRequest, db: Session = Depends(get_db)
+    request: ExchangeTokenRequest, db: AsyncSession = Depends(get_async_db)
 ) -> ExchangeTokenResponse:
     """
     Exchange public token for access token and store account info.
     """
     try:
         # Check for existing item
-        existing_item = (
-            db.query(PlaidItem)
-            .filter(PlaidItem.institution_id == request.institution_id)
-            .first()
+        existing_item = await db.scalar(
+            select(PlaidItem).where(PlaidItem.institution_id == request.institution_id)
         )
         if existing_item:
             raise HTTPException(
@@ -66,17 +115,20 @@ async def exchange_public_token(
 
         client = get_plaid_client()
         # Exchange public token for access token
-        access_token, item_id = exchange_token(client, request.public_token)
+        access_token, item_id = await exchange_public_token_async(
+            client, request.public_token, institution_id=request.institution_id
+        )
 
         # Create Plaid item record
         plaid_item = PlaidItem(
+            user_id=request.user_id,
             item_id=item_id,
             access_token=access_token,
             institution_id=request.institution_id,
             institution_name=request.institution_name,
         )
         db.add(plaid_item)
-        db.flush()  # Get the ID without committing
+        await db.flush()  # Get the ID without committing
 
         # Create account records
         for account_data in request.accounts:
@@ -91,19 +143,21 @@ async def exchange_public_token(
             )
             db.add(account)
 
-        db.commit()
+        await db.commit()
+        # A relinked item may return different data than before
+        invalidate_cached_transactions(item_id)
         return ExchangeTokenResponse(status="success", item_id=item_id)
     except HTTPException:
-        db.rollback()
+        await db.rollback()
         raise
     except PlaidError as e:
-        db.rollback()
+        await db.rollback()
         raise handle_plaid_error(e)
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -112,12 +166,34 @@ async def get_plaid_transactions(
     item_id: str,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
-    db: Session = Depends(get_db),
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated Plaid transaction attributes to return",
+    ),
+    db: AsyncSession = Depends(get_async_db),
 ) -> TransactionResponse:
     """
     Retrieve transactions for a connected Plaid account.
+
+    Each transaction is projected onto ``fields``, or a compact default set,
+    when it is converted from Plaid's model. Responses are cached per item,
+    date range and projection for ``PLAID_TRANSACTIONS_CACHE_TTL`` seconds,
+    or until the item is synced or relinked; ``X-Cache`` tells whether
+    Plaid was called.
     """
     try:
+        projection = DEFAULT_PLAID_TRANSACTION_FIELDS
+        if fields is not None:
+            projection = tuple(
+                dict.fromkeys(filter(None, map(str.strip, fields.split(","))))
+            )
+            unknown = [n for n in projection if n not in PLAID_TRANSACTION_FIELDS]
+            if unknown or not projection:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Invalid transaction fields: {fields!r}",
+                )
+
         # Validate date range
         if start_date and end_date:
             if end_date < start_date:
@@ -135,23 +211,229 @@ async def get_plaid_transactions(
 
         # Get the Plaid item
         try:
-            plaid_item = (
-                db.query(PlaidItem).filter(PlaidItem.item_id == item_id).first()
+            plaid_item = await db.scalar(
+                select(PlaidItem).where(PlaidItem.item_id == item_id)
             )
             if not plaid_item:
                 raise HTTPException(status_code=404, detail="Plaid item not found")
 
             # Ensure we have the access token before the session might be closed
             access_token = plaid_item.access_token
+            institution_id = plaid_item.institution_id
         except SQLAlchemyError as e:
             raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
+        cache = get_transactions_cache()
+        cache_key = (
+            item_id,
+            start_date.date() if start_date else None,
+            end_date.date() if end_date else None,
+            projection,
+        )
+        body = cache.get(cache_key)
+        if body is not None:
+            return Response(
+                body, media_type="application/json", headers={"X-Cache": "HIT"}
+            )
+
         client = get_plaid_client()
-        transactions_data = get_transactions(client, access_token, start_date, end_date)
-        return TransactionResponse(**transactions_data)
+        transactions_data = await get_transactions_async(
+            client,
+            access_token,
+            start_date,
+            end_date,
+            institution_id=institution_id,
+            timeout=TRANSACTIONS_TIME_BUDGET,
+        )
+        response = ORJSONResponse(
+            {
+                "accounts": project_plaid_models(
+                    transactions_data["accounts"], PLAID_ACCOUNT_FIELDS
+                ),
+                "transactions": project_plaid_models(
+                    transactions_data["transactions"], projection
+                ),
+            },
+            headers={"X-Cache": "MISS"},
+        )
+        cache.set(cache_key, response.body)
+        return response
     except PlaidError as e:
         raise handle_plaid_error(e)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@router.get("/cache/stats", response_model=Dict[str, Dict[str, int]])
+async def get_cache_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Hit/miss counters and current size of each Plaid response cache.
+    """
+    return {
+        "transactions": get_transactions_cache().stats.as_dict(),
+        "link_tokens": get_link_token_cache().stats.as_dict(),
+    }
+
+
+@router.post("/transactions/{item_id}/sync", response_model=SyncTransactionsResponse)
+async def sync_plaid_transactions(
+    item_id: str, db: AsyncSession = Depends(get_async_db)
+) -> SyncTransactionsResponse:
+    """
+    Pull transaction changes since the item's last sync into our ledger.
+    """
+    try:
+        plaid_item = await db.scalar(
+            select(PlaidItem).where(PlaidItem.item_id == item_id)
+        )
+        if not plaid_item:
+            raise HTTPException(status_code=404, detail="Plaid item not found")
+
+        result = await sync_item(db, get_plaid_client(), plaid_item)
+        return SyncTransactionsResponse.model_validate(result)
+    except HTTPException:
+        raise
+    except PlaidError as e:
+        await db.rollback()
+        raise handle_plaid_error(e)
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+
+@router.post(
+    "/refresh", response_model=RefreshResponse, status_code=status.HTTP_202_ACCEPTED
+)
+async def refresh_plaid_items(
+    session_factory: async_sessionmaker = Depends(get_async_sessionmaker),
+    worker: PlaidRefreshWorker = Depends(get_refresh_worker),
+) -> RefreshResponse:
+    """
+    Start syncing every linked item in the background.
+
+    Returns immediately; poll ``GET /plaid/items`` for the outcome.
+    """
+    return RefreshResponse(started=worker.trigger(session_factory))
+
+
+@router.get("/items", response_model=List[PlaidItemStatus])
+async def list_plaid_items(
+    db: AsyncSession = Depends(get_async_db),
+) -> List[PlaidItemStatus]:
+    """
+    List linked items with the outcome of their latest refresh.
+    """
+    items = await db.scalars(select(PlaidItem).order_by(PlaidItem.id))
+    return [PlaidItemStatus.model_validate(item) for item in items]
+
+
+@router.get("/accounts/{account_id}/balances", response_model=BalanceHistoryResponse)
+async def get_account_balances(
+    account_id: str,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    width: int = Query(
+        DEFAULT_BALANCE_POINTS,
+        ge=2,
+        le=MAX_BALANCE_POINTS,
+        description="Chart width in points; the series has at most this many",
+    ),
+    db: AsyncSession = Depends(get_async_db),
+) -> BalanceHistoryResponse:
+    """
+    Balance history of a Plaid account, downsampled to ``width`` points.
+
+    Served from the stored snapshots (daily, weekly or monthly depending on
+    their age) without calling Plaid. The range defaults to the past year.
+    """
+    end_date = end_date or datetime.utcnow().date()
+    start_date = start_date or end_date - timedelta(days=DEFAULT_BALANCE_DAYS)
+    if end_date < start_date:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid date range: end_date must be after start_date",
+        )
+    plaid_account_id = await db.scalar(
+        select(PlaidAccount.id).where(PlaidAccount.account_id == account_id)
+    )
+    if plaid_account_id is None:
+        raise HTTPException(status_code=404, detail="Plaid account not found")
+
+    rows = (
+        await db.execute(
+            select(
+                PlaidBalanceSnapshot.snapshot_date,
+                PlaidBalanceSnapshot.resolution,
+                PlaidBalanceSnapshot.currency,
+                PlaidBalanceSnapshot.current_minor,
+                PlaidBalanceSnapshot.available_minor,
+            )
+            .where(
+                PlaidBalanceSnapshot.plaid_account_id == plaid_account_id,
+                PlaidBalanceSnapshot.snapshot_date.between(start_date, end_date),
+            )
+            .order_by(PlaidBalanceSnapshot.snapshot_date)
+        )
+    ).all()
+
+    def major(minor: Optional[int], currency: str) -> Optional[float]:
+        return None if minor is None else float(from_minor(minor, currency))
+
+    return BalanceHistoryResponse(
+        account_id=account_id,
+        currency=rows[-1].currency if rows else None,
+        points=[
+            BalancePoint(
+                snapshot_date=row.snapshot_date,
+                resolution=row.resolution,
+                current=major(row.current_minor, row.currency),
+                available=major(row.available_minor, row.currency),
+            )
+            for row in downsample(rows, start_date, end_date, width)
+        ],
+    )
+
+
+@router.post("/webhook", response_model=WebhookResponse)
+async def receive_plaid_webhook(
+    webhook: WebhookRequest,
+    request: Request,
+    plaid_verification: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    session_factory: async_sessionmaker = Depends(get_async_sessionmaker),
+    worker: PlaidRefreshWorker = Depends(get_refresh_worker),
+) -> WebhookResponse:
+    """
+    Queue a sync of the item a TRANSACTIONS webhook is about.
+
+    Answers at once (Plaid retries slow or failed deliveries). Webhooks for
+    an item whose sync is already queued are coalesced into it. Other
+    webhook types and unknown items are acknowledged and ignored. Webhooks
+    without a valid ``Plaid-Verification`` signature are rejected with 401
+    before anything is queued.
+    """
+    try:
+        await verify_webhook(
+            get_plaid_client(), await request.body(), plaid_verification
+        )
+    except PlaidError as e:
+        raise handle_plaid_error(e)
+
+    if (
+        webhook.webhook_type != "TRANSACTIONS"
+        or webhook.webhook_code not in SYNC_WEBHOOK_CODES
+        or not webhook.item_id
+    ):
+        return WebhookResponse(status="ignored")
+
+    plaid_item_id = await db.scalar(
+        select(PlaidItem.id).where(
+            PlaidItem.item_id == webhook.item_id, PlaidItem.user_id.is_not(None)
+        )
+    )
+    if plaid_item_id is None:
+        return WebhookResponse(status="ignored")
+    queued = worker.enqueue(session_factory, plaid_item_id)
+    return WebhookResponse(status="queued" if queued else "coalesced")
@@ -3,17 +3,20 @@ API routes for personality profile operations.
 """
 
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 import logging
-from fastapi import APIRouter, Depends, HTTPException, Header, status
+from fastapi import APIRouter, Depends, HTTPException, Header, Response, status
+from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.responses import JSONResponse
 
-from app.database import get_db
+from app.database import get_async_db
 from app.models.personality import PersonalityProfile
 from app.models.user import User
 from app.schemas.personality import PersonalityProfileCreate, PersonalityProfileResponse
+from app.services.personality_cache import get_personality_cache
+from app.utils.etag import etag_matches, make_etag, not_modified
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -25,7 +28,7 @@ router = APIRouter(prefix="/user-profile/personality", tags=["personality"])
 @router.post("", status_code=status.HTTP_201_CREATED)
 async def create_personality_profile(
     profile: PersonalityProfileCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     x_user_id: Optional[str] = Header(None)
 ):
     """Create a new personality profile for a user."""
@@ -45,7 +48,7 @@ async def create_personality_profile(
 
     logger.info(f"Looking for user with ID: {user_id}")
     # Validate user exists
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     logger.info(f"User query result: {user}")
     
     if not user:
@@ -55,9 +58,9 @@ async def create_personality_profile(
         )
 
     # Check if profile already exists
-    existing_profile = db.query(PersonalityProfile).filter(
+    existing_profile = await db.scalar(select(PersonalityProfile).where(
         PersonalityProfile.user_id == user_id
-    ).first()
+    ))
     
     if existing_profile:
         raise HTTPException(
@@ -82,8 +85,9 @@ async def create_personality_profile(
         })
         
         db.add(new_profile)
-        db.commit()
-        db.refresh(new_profile)
+        await db.commit()
+        await db.refresh(new_profile)
+        get_personality_cache().invalidate_user(user_id)
 
         # Return success response
         return JSONResponse(
@@ -95,7 +99,7 @@ async def create_personality_profile(
         )
 
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Database error: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -103,26 +107,44 @@ async def create_personality_profile(
         )
 
 
+@router.get("/cache/stats", response_model=Dict[str, float])
+async def get_personality_cache_stats() -> Dict[str, float]:
+    """Hit ratio, size and decrypt timings of the decrypted profile cache."""
+    return get_personality_cache().stats()
+
+
 @router.get("/{user_id}", response_model=PersonalityProfileResponse)
 async def get_personality_profile(
     user_id: int,
-    db: Session = Depends(get_db)
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get a personality profile for a user."""
-    profile = db.query(PersonalityProfile).filter(
+    """Get a personality profile for a user.
+
+    Answers 304 when ``If-None-Match`` carries the current ``ETag``, before
+    any of the encrypted traits are decrypted. Otherwise the traits come
+    from the decrypted profile cache when this version of them is in it.
+    """
+    profile = await db.scalar(select(PersonalityProfile).where(
         PersonalityProfile.user_id == user_id
-    ).first()
+    ))
     
     if not profile:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Personality profile not found"
         )
-    
+
+    etag = make_etag(profile.id, profile.updated_at)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+
     return PersonalityProfileResponse(
         id=profile.id,
         user_id=profile.user_id,
-        **profile.get_personality_data(),
+        **get_personality_cache().get_personality_data(profile),
         created_at=profile.created_at,
         updated_at=profile.updated_at
     ) 
\ No newline at end of file
@@ -3,47 +3,74 @@ API routes for transaction operations.
 """
 
 from datetime import datetime
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Any, AsyncIterator, Dict, List, Optional
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.database import get_db
+from app.crud import transaction as transaction_crud
+from app.database import get_async_db, get_async_sessionmaker
 from app.models.transaction import Transaction as TransactionModel
 from app.models.user import User
 from app.models.plaid import PlaidItem, PlaidAccount
-from app.schemas.transaction import Transaction, TransactionCreate, TransactionUpdate
-from app.schemas.enums import TransactionTypeEnum, TransactionStatusEnum
+from app.schemas.transaction import (
+    MAX_BULK_TRANSACTIONS,
+    TRANSACTION_FIELDS,
+    Transaction,
+    TransactionBulkError,
+    TransactionBulkResult,
+    TransactionCreate,
+    TransactionRollupBucket,
+    TransactionTotal,
+    TransactionUpdate,
+)
+from app.schemas.enums import (
+    ExportFormatEnum,
+    TransactionStatusEnum,
+    TransactionTypeEnum,
+)
+from app.utils.etag import etag_matches, make_etag, not_modified
+from app.utils.export import EXPORT_COLUMNS, iter_csv, iter_ndjson
+from app.utils.money import from_minor, to_minor
+from app.utils.pagination import InvalidCursorError, decode_cursor, encode_cursor
 
 router = APIRouter(prefix="/transactions", tags=["transactions"])
 
+# Rows fetched per round-trip while streaming an export
+EXPORT_BATCH_SIZE = 1000
+
+# "YYYY-MM" bounds accepted by the summary endpoint
+YEAR_MONTH_PATTERN = r"^\d{4}-(0[1-9]|1[0-2])$"
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormatEnum.NDJSON: "application/x-ndjson",
+    ExportFormatEnum.CSV: "text/csv",
+}
+
 
 @router.post("/", response_model=Transaction, status_code=status.HTTP_201_CREATED)
 async def create_transaction(
-    transaction: TransactionCreate, db: Session = Depends(get_db)
+    transaction: TransactionCreate, db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new transaction."""
     # Collect all validation errors
     validation_errors = {}
 
     # Validate foreign key references
-    user = db.query(User).filter(User.id == transaction.user_id).first()
+    user = await db.get(User, transaction.user_id)
     if not user:
         validation_errors["user_id"] = "User not found"
 
-    plaid_item = db.query(PlaidItem).filter(PlaidItem.id == transaction.plaid_item_id).first()
+    plaid_item = await db.get(PlaidItem, transaction.plaid_item_id)
     if not plaid_item:
         validation_errors["plaid_item_id"] = "Plaid item not found"
 
-    plaid_account = db.query(PlaidAccount).filter(PlaidAccount.id == transaction.plaid_account_id).first()
+    plaid_account = await db.get(PlaidAccount, transaction.plaid_account_id)
     if not plaid_account:
         validation_errors["plaid_account_id"] = "Plaid account not found"
 
-    # Validate currency code (simple validation for now)
-    valid_currencies = ["USD", "EUR", "GBP", "CAD", "AUD", "JPY"]
-    if transaction.currency not in valid_currencies:
-        validation_errors["currency"] = "Invalid currency code"
-
     # If there are any validation errors, raise them all at once
     if validation_errors:
         raise HTTPException(
@@ -54,84 +81,325 @@ async def create_transaction(
     try:
         db_transaction = TransactionModel(**transaction.model_dump(exclude_unset=True))
         db.add(db_transaction)
-        db.commit()
-        db.refresh(db_transaction)
+        deltas: transaction_crud.RollupDeltas = {}
+        transaction_crud.add_rollup_delta(deltas, db_transaction)
+        await transaction_crud.apply_rollup_deltas(db, deltas)
+        await db.commit()
+        await db.refresh(db_transaction)
         return Transaction.model_validate(db_transaction)
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
 
 
+@router.post(
+    "/bulk",
+    response_model=TransactionBulkResult,
+    status_code=status.HTTP_201_CREATED,
+)
+async def bulk_create_transactions(
+    rows: List[Dict[str, Any]] = Body(...),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Create many transactions in one database transaction.
+
+    Each row is validated with the same rules as ``POST /transactions/``.
+    Foreign keys are checked with one ``IN (...)`` query per table, valid
+    rows are inserted with a single executemany and invalid rows are
+    reported by index without aborting the rest of the batch.
+    """
+    if len(rows) > MAX_BULK_TRANSACTIONS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {MAX_BULK_TRANSACTIONS} transactions per request"
+        )
+
+    errors: List[TransactionBulkError] = []
+    parsed: List[tuple] = []
+    for index, row in enumerate(rows):
+        try:
+            parsed.append((index, TransactionCreate.model_validate(row)))
+        except ValidationError as e:
+            errors.append(TransactionBulkError(
+                index=index,
+                errors={
+                    ".".join(str(part) for part in error["loc"]) or "row": error["msg"]
+                    for error in e.errors()
+                }
+            ))
+
+    user_ids = await transaction_crud.existing_ids(
+        db, User, (t.user_id for _, t in parsed)
+    )
+    item_ids = await transaction_crud.existing_ids(
+        db, PlaidItem, (t.plaid_item_id for _, t in parsed)
+    )
+    account_ids = await transaction_crud.existing_ids(
+        db, PlaidAccount, (t.plaid_account_id for _, t in parsed)
+    )
+
+    valid: List[TransactionCreate] = []
+    for index, transaction in parsed:
+        row_errors = {}
+        if transaction.user_id not in user_ids:
+            row_errors["user_id"] = "User not found"
+        if transaction.plaid_item_id not in item_ids:
+            row_errors["plaid_item_id"] = "Plaid item not found"
+        if transaction.plaid_account_id not in account_ids:
+            row_errors["plaid_account_id"] = "Plaid account not found"
+        if row_errors:
+            errors.append(TransactionBulkError(index=index, errors=row_errors))
+        else:
+            valid.append(transaction)
+
+    try:
+        created = await transaction_crud.bulk_insert_transactions(db, valid)
+        deltas: transaction_crud.RollupDeltas = {}
+        for transaction in valid:
+            transaction_crud.add_rollup_delta(deltas, transaction)
+        await transaction_crud.apply_rollup_deltas(db, deltas)
+        await db.commit()
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    errors.sort(key=lambda error: error.index)
+    return TransactionBulkResult(created=created, failed=len(errors), errors=errors)
+
+
 @router.get("/", response_model=List[Transaction])
 async def list_transactions(
     status: Optional[TransactionStatusEnum] = None,
     type: Optional[TransactionTypeEnum] = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
+    user_id: Optional[int] = None,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """List all transactions with pagination and filtering."""
-    query = db.query(TransactionModel)
+    """List transactions with pagination and filtering, optionally for one user.
+
+    Results are ordered by ``(transaction_date, id)``. Pass the
+    ``X-Next-Cursor`` response header back as ``cursor`` to fetch the next
+    page with keyset pagination instead of ``skip``.
 
-    if status:
-        query = query.filter(TransactionModel.status == status)
-    if type:
-        query = query.filter(TransactionModel.type == type)
-    if start_date:
-        query = query.filter(TransactionModel.transaction_date >= start_date)
-    if end_date:
-        query = query.filter(TransactionModel.transaction_date <= end_date)
+    Rows are read as plain tuples and encoded straight to JSON bytes; data
+    coming out of the database is trusted, so it is not re-validated
+    against ``response_model``. The page's ``ETag`` covers the id and
+    ``updated_at`` of every row on it; send it back in ``If-None-Match`` to
+    get an empty 304 while the page is unchanged.
+    """
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except InvalidCursorError as e:
+            raise HTTPException(
+                status_code=400,
+                detail=str(e)
+            )
 
-    transactions = query.offset(skip).limit(limit).all()
-    return [Transaction.model_validate(t) for t in transactions]
+    rows = await transaction_crud.list_transaction_rows(
+        db,
+        TRANSACTION_FIELDS,
+        status=status,
+        type=type,
+        start_date=start_date,
+        end_date=end_date,
+        user_id=user_id,
+        skip=skip,
+        limit=limit,
+        after=after,
+    )
+    headers = {}
+    if len(rows) == limit:
+        last = rows[-1]
+        headers["X-Next-Cursor"] = encode_cursor(last.transaction_date, last.id)
+    etag = make_etag(*((row.id, row.updated_at) for row in rows))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, headers)
+    headers["ETag"] = etag
+    return ORJSONResponse(
+        [dict(zip(TRANSACTION_FIELDS, row)) for row in rows], headers=headers
+    )
+
+
+@router.get("/export")
+async def export_transactions(
+    format: ExportFormatEnum = ExportFormatEnum.NDJSON,
+    status: Optional[TransactionStatusEnum] = None,
+    type: Optional[TransactionTypeEnum] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    user_id: Optional[int] = None,
+    session_factory: async_sessionmaker = Depends(get_async_sessionmaker)
+):
+    """Stream every matching transaction as NDJSON or CSV.
+
+    Accepts the same filters as ``GET /transactions/``. Rows are read in
+    batches from a server-side cursor and written out as they arrive.
+    """
+    async def generate() -> AsyncIterator[str]:
+        # FastAPI tears down yield dependencies before the body is streamed,
+        # so the generator opens its own session for the lifetime of the export.
+        async with session_factory() as db:
+            batches = transaction_crud.iter_transaction_rows(
+                db,
+                EXPORT_COLUMNS,
+                status=status,
+                type=type,
+                start_date=start_date,
+                end_date=end_date,
+                user_id=user_id,
+                batch_size=EXPORT_BATCH_SIZE,
+            )
+            encode = iter_csv if format == ExportFormatEnum.CSV else iter_ndjson
+            async for chunk in encode(batches):
+                yield chunk
+
+    return StreamingResponse(
+        generate(),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="transactions.{format.value}"'
+        },
+    )
+
+
+@router.get("/summary", response_model=List[TransactionRollupBucket])
+async def summarize_transactions(
+    user_id: int,
+    type: Optional[TransactionTypeEnum] = None,
+    start_month: Optional[str] = Query(None, pattern=YEAR_MONTH_PATTERN),
+    end_month: Optional[str] = Query(None, pattern=YEAR_MONTH_PATTERN),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get a user's totals per month, category and type.
+
+    Reads the incrementally maintained rollup table, so the cost grows with
+    the number of buckets rather than the number of transactions. Months are
+    ``YYYY-MM`` and both bounds are inclusive.
+    """
+    buckets = await transaction_crud.list_rollups(
+        db,
+        user_id,
+        type=type,
+        start_month=start_month,
+        end_month=end_month,
+    )
+    return [TransactionRollupBucket.model_validate(b) for b in buckets]
+
+
+@router.get("/totals", response_model=List[TransactionTotal])
+async def total_transactions(
+    status: Optional[TransactionStatusEnum] = None,
+    type: Optional[TransactionTypeEnum] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    user_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Sum the transactions matching the list filters, per currency.
+
+    The sum runs in SQL over integer minor units, so it is exact and no
+    individual transaction is loaded.
+    """
+    totals = await transaction_crud.total_amounts(
+        db,
+        status=status,
+        type=type,
+        start_date=start_date,
+        end_date=end_date,
+        user_id=user_id,
+    )
+    return [
+        TransactionTotal(currency=currency, total=total)
+        for currency, total in sorted(totals.items())
+    ]
 
 
 @router.get("/{transaction_id}", response_model=Transaction)
-async def get_transaction(transaction_id: int, db: Session = Depends(get_db)):
-    """Get a specific transaction by ID."""
-    transaction = (
-        db.query(TransactionModel).filter(TransactionModel.id == transaction_id).first()
+async def get_transaction(
+    transaction_id: int,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get a specific transaction by ID.
+
+    Answers 304 without a body when ``If-None-Match`` carries the current
+    ``ETag``.
+    """
+    row = await transaction_crud.get_transaction_row(
+        db, TRANSACTION_FIELDS, transaction_id
     )
-    if not transaction:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Transaction not found"
         )
-    return Transaction.model_validate(transaction)
+    etag = make_etag(row.id, row.updated_at)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return ORJSONResponse(dict(zip(TRANSACTION_FIELDS, row)), headers={"ETag": etag})
 
 
 @router.put("/{transaction_id}", response_model=Transaction)
 async def update_transaction(
     transaction_id: int,
     transaction_update: TransactionUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Update a specific transaction."""
-    db_transaction = (
-        db.query(TransactionModel).filter(TransactionModel.id == transaction_id).first()
+    """Update a specific transaction.
+
+    Answers 409 if the transaction changed between reading it and writing
+    the update, so its rollup bucket is never adjusted twice.
+    """
+    current = await transaction_crud.get_transaction_row(
+        db, ("id", *transaction_crud.ROLLUP_SOURCE_COLUMNS), transaction_id
     )
-    if not db_transaction:
+    if not current:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Transaction not found"
         )
 
-    # Update transaction fields
-    update_data = transaction_update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_transaction, field, value)
+    # Convert the new amount straight into minor units of the new currency;
+    # without a new amount, the current one is kept in the new currency
+    values = transaction_update.model_dump(exclude_unset=True)
+    if "amount" in values or "currency" in values:
+        currency = values.get("currency", current.currency)
+        amount = values.pop("amount", None)
+        if amount is None:
+            amount = from_minor(current.amount_minor, current.currency)
+        try:
+            values["amount_minor"] = to_minor(amount, currency)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=str(e)
+            )
 
     try:
-        db.commit()
-        db.refresh(db_transaction)
-        return Transaction.model_validate(db_transaction)
+        if not await transaction_crud.update_transaction(db, current._mapping, values):
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Transaction was modified concurrently"
+            )
+        await db.commit()
+        updated = await db.get(TransactionModel, transaction_id)
+        return Transaction.model_validate(updated)
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
@@ -139,24 +407,22 @@ async def update_transaction(
 
 
 @router.delete("/{transaction_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_transaction(transaction_id: int, db: Session = Depends(get_db)):
+async def delete_transaction(
+    transaction_id: int, db: AsyncSession = Depends(get_async_db)
+):
     """Delete a specific transaction."""
-    transaction = (
-        db.query(TransactionModel).filter(TransactionModel.id == transaction_id).first()
-    )
-    if not transaction:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Transaction not found"
-        )
-
     try:
-        db.delete(transaction)
-        db.commit()
-        return None
+        deleted = await transaction_crud.delete_transaction(db, transaction_id)
+        await db.commit()
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
-        ) 
\ No newline at end of file
+        )
+    if not deleted:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Transaction not found"
+        )
+    return None
@@ -4,6 +4,7 @@ Configuration settings for the LifeFlow application.
 
 from enum import Enum
 from pathlib import Path
+from typing import Dict, Optional, Union
 import os
 from cryptography.fernet import Fernet
 
@@ -23,6 +24,46 @@ class Environment(str, Enum):
     TEST = "test"
 
 
+# SQLite storage presets applied as PRAGMAs on every new connection.
+# WAL lets readers proceed while a writer commits; cache_size is in KiB when
+# negative; busy_timeout is in milliseconds.
+SQLITE_STORAGE_PROFILES: Dict[Environment, Dict[str, Union[str, int]]] = {
+    Environment.DEV: {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 0,
+        "cache_size": -16000,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    Environment.GAMMA: {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 268435456,
+        "cache_size": -64000,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    Environment.PROD: {
+        "journal_mode": "WAL",
+        # FULL keeps the last commits durable across power loss for ledger data
+        "synchronous": "FULL",
+        "mmap_size": 268435456,
+        "cache_size": -64000,
+        "temp_store": "MEMORY",
+        "busy_timeout": 10000,
+    },
+    Environment.TEST: {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 0,
+        "cache_size": -16000,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+}
+
+
 class Settings(BaseSettings):
     # Base Settings
     APP_NAME: str = "LifeFlow"
@@ -34,17 +75,92 @@ class Settings(BaseSettings):
     # For gamma/prod, we use a mounted volume at /app/data
     DATABASE_PATH: str = str(Path(__file__).parent.parent / "lifeflow.db")
 
+    # SQLite Storage Profile
+    # Each value overrides the environment preset in SQLITE_STORAGE_PROFILES
+    SQLITE_JOURNAL_MODE: Optional[str] = None
+    SQLITE_SYNCHRONOUS: Optional[str] = None
+    SQLITE_MMAP_SIZE: Optional[int] = None
+    SQLITE_CACHE_SIZE: Optional[int] = None
+    SQLITE_TEMP_STORE: Optional[str] = None
+    SQLITE_BUSY_TIMEOUT: Optional[int] = None
+
     # API Settings
     API_V1_PREFIX: str = "/api/v1"
 
     # Security Settings
     ENCRYPTION_KEY: str = Fernet.generate_key().decode()  # Default to a new key if not provided
+    # Keys ENCRYPTION_KEY replaced, comma-separated; decrypt only, until
+    # re-encryption is done
+    ENCRYPTION_PREVIOUS_KEYS: str = ""
+    ENCRYPTION_ROTATION_CHUNK_SIZE: int = 200  # Profiles re-encrypted per transaction
+    ENCRYPTION_ROTATION_PAUSE: float = 0.5  # Seconds between two re-encryption chunks
+
+    # Decrypted Personality Profile Cache
+    # In-process memory only; entries are keyed by profile version (updated_at)
+    PERSONALITY_CACHE_SIZE: int = 10000  # Max cached profiles; 0 disables the cache
+    PERSONALITY_CACHE_TTL: float = 300.0  # Seconds; 0 disables the cache
 
     # Plaid Settings
     PLAID_CLIENT_ID: str = "test_client_id"  # Default for testing
     PLAID_SECRET: str = "test_secret"  # Default for testing
     PLAID_ENV: PlaidEnv = PlaidEnv.SANDBOX
     PLAID_REDIRECT_URI: str = "http://localhost:8000/api/v1/plaid/oauth-redirect"
+    PLAID_HOST: Optional[str] = None  # Defaults to https://{PLAID_ENV}.plaid.com
+
+    # Plaid HTTP Connection Pool
+    # One client is shared per process; its pool keeps connections (and TLS
+    # sessions) to Plaid open between requests
+    PLAID_POOL_MAXSIZE: int = 10
+    PLAID_TCP_KEEPALIVE: bool = True
+    PLAID_CONNECT_TIMEOUT: float = 5.0  # Seconds
+    PLAID_READ_TIMEOUT: float = 30.0  # Seconds
+    # Parallel page fetches, shared by all transactions_get calls
+    PLAID_PAGE_CONCURRENCY: int = 4
+
+    # Plaid Thread Pool
+    # Blocking SDK calls run on a dedicated pool so they never stall the event loop
+    PLAID_EXECUTOR_WORKERS: int = 10  # Max Plaid calls in flight per process
+    PLAID_CALL_TIMEOUT: float = 40.0  # Seconds to wait for a single-request call
+    PLAID_PAGINATED_CALL_TIMEOUT: float = 120.0  # Seconds for transactions get/sync
+
+    # Plaid Retries and Circuit Breaker
+    # Rate limits and 5xx/institution outages are retried with jittered backoff;
+    # an institution's circuit opens after repeated failed calls
+    PLAID_RETRY_ATTEMPTS: int = 4  # Attempts per request, including the first
+    PLAID_RETRY_BASE_DELAY: float = 0.5  # Seconds; doubles per retry
+    PLAID_RETRY_MAX_DELAY: float = 8.0  # Seconds
+    PLAID_BREAKER_THRESHOLD: int = 5  # Consecutive failed calls that open the circuit
+    PLAID_BREAKER_RESET_TIMEOUT: float = 30.0  # Seconds before a trial call
+
+    # Plaid Transactions Response Cache
+    # GET /plaid/transactions/{item_id} responses, dropped when the item re-syncs
+    PLAID_TRANSACTIONS_CACHE_TTL: float = 300.0  # Seconds; 0 disables the cache
+    PLAID_TRANSACTIONS_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+
+    # Plaid Link Token Cache
+    # One token per (user, redirect mode), handed out until shortly before it expires
+    PLAID_LINK_TOKEN_CACHE_SIZE: int = 10000  # Max cached tokens
+    # Seconds of validity left when a cached token is replaced
+    PLAID_LINK_TOKEN_REFRESH_MARGIN: float = 1800.0
+
+    # Plaid Background Refresh
+    # Every linked item is synced on this schedule so reads hit local data
+    PLAID_REFRESH_INTERVAL: float = 900.0  # Seconds between refreshes; 0 disables
+    PLAID_REFRESH_CONCURRENCY: int = 4  # Items synced at the same time
+    # Min seconds between syncs per institution
+    PLAID_REFRESH_INSTITUTION_INTERVAL: float = 1.0
+
+    # Plaid Webhooks
+    # Passed to Link so Plaid announces new transactions instead of being polled
+    # e.g. https://lifeflow.app/api/v1/plaid/webhook
+    PLAID_WEBHOOK_URL: Optional[str] = None
+    PLAID_WEBHOOK_DEBOUNCE: float = 2.0  # Seconds to coalesce webhooks per item
+    PLAID_WEBHOOK_MAX_AGE: float = 300.0  # Seconds a webhook signature stays valid
+
+    # Plaid Balance History
+    # Snapshots are daily for this many days, then weekly, then monthly
+    PLAID_BALANCE_DAILY_DAYS: int = 90  # Days of daily points
+    PLAID_BALANCE_WEEKLY_DAYS: int = 730  # Age in days after which weeks become months
 
     def __init__(self, **kwargs):
         # Set env_file from ENV_FILE environment variable if provided
@@ -60,6 +176,21 @@ class Settings(BaseSettings):
             # For gamma and prod, use a mounted volume
             database_name = f"lifeflow_{self.ENVIRONMENT}.db"
             self.DATABASE_PATH = str(Path("/app/data") / database_name)
+
+    @property
+    def sqlite_pragmas(self) -> Dict[str, Union[str, int]]:
+        """Resolved storage PRAGMAs: the environment preset plus any overrides."""
+        pragmas = dict(SQLITE_STORAGE_PROFILES[self.ENVIRONMENT])
+        overrides = {
+            "journal_mode": self.SQLITE_JOURNAL_MODE,
+            "synchronous": self.SQLITE_SYNCHRONOUS,
+            "mmap_size": self.SQLITE_MMAP_SIZE,
+            "cache_size": self.SQLITE_CACHE_SIZE,
+            "temp_store": self.SQLITE_TEMP_STORE,
+            "busy_timeout": self.SQLITE_BUSY_TIMEOUT,
+        }
+        pragmas.update({k: v for k, v in overrides.items() if v is not None})
+        return pragmas
     
     model_config = {
         "env_file": ".env",
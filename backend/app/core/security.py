@@ -2,15 +2,61 @@
 Security utilities for data encryption and decryption.
 """
 
+import hashlib
+import json
+import logging
 import os
 from base64 import b64encode, b64decode
-from cryptography.fernet import Fernet
+from typing import Union
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
 # Load encryption key from environment or generate one
 ENCRYPTION_KEY = os.getenv('ENCRYPTION_KEY', Fernet.generate_key())
-fernet = Fernet(ENCRYPTION_KEY)
+
+# Keys ENCRYPTION_KEY replaced (settings.ENCRYPTION_PREVIOUS_KEYS, comma-separated):
+# still accepted for decryption until app.services.reencryption has moved every
+# token to ENCRYPTION_KEY
+ENCRYPTION_PREVIOUS_KEYS = [
+    key.strip() for key in settings.ENCRYPTION_PREVIOUS_KEYS.split(',') if key.strip()
+]
+
+# Encrypts with ENCRYPTION_KEY; decrypts with it or any previous key
+fernet = MultiFernet(
+    [Fernet(key) for key in (ENCRYPTION_KEY, *ENCRYPTION_PREVIOUS_KEYS)]
+)
+
+def key_id(key: Union[str, bytes]) -> str:
+    """
+    Short, non-secret fingerprint of a Fernet key.
+
+    Stored next to encrypted data to tell which key it was encrypted with.
+    """
+    if isinstance(key, str):
+        key = key.encode()
+    return hashlib.sha256(key).hexdigest()[:16]
+
+ENCRYPTION_KEY_ID = key_id(ENCRYPTION_KEY)
+
+def rotate_token(token: bytes) -> bytes:
+    """
+    Re-encrypt a Fernet token with ENCRYPTION_KEY.
+
+    Args:
+        token: Fernet token made with ENCRYPTION_KEY or a previous key
+
+    Returns:
+        Fernet token for the same plaintext under ENCRYPTION_KEY
+
+    Raises:
+        InvalidToken: If no configured key decrypts the token
+    """
+    return fernet.rotate(token)
 
 def encrypt_data(data: str) -> str:
     """
@@ -43,4 +89,41 @@ def decrypt_data(encrypted_data: str) -> str:
         decrypted = fernet.decrypt(b64decode(encrypted_data))
         return decrypted.decode()
     except Exception:
-        return ""  # Return empty string if decryption fails 
\ No newline at end of file
+        logger.warning(
+            "Could not decrypt data with the current or any previous encryption key"
+        )
+        return ""  # Return empty string if decryption fails
+
+def encrypt_json(data: dict) -> bytes:
+    """
+    Encrypt a JSON-serialisable dict as a single Fernet token.
+
+    The token is already URL-safe base64, so it is stored as is.
+
+    Args:
+        data: Dict to encrypt
+
+    Returns:
+        Fernet token
+    """
+    return fernet.encrypt(json.dumps(data, separators=(",", ":")).encode())
+
+def decrypt_json(token: bytes) -> dict:
+    """
+    Decrypt a token made by ``encrypt_json``.
+
+    Args:
+        token: Fernet token
+
+    Returns:
+        Decrypted dict, empty if decryption fails
+    """
+    if not token:
+        return {}
+    try:
+        return json.loads(fernet.decrypt(token))
+    except (InvalidToken, ValueError):
+        logger.warning(
+            "Could not decrypt data with the current or any previous encryption key"
+        )
+        return {}
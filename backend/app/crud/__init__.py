@@ -1,3 +1,10 @@
 from .onboarding_session import create_session, get_session, patch_data
+from .transaction import filter_transactions, transaction_list_query
 
-__all__ = ["create_session", "get_session", "patch_data"] 
\ No newline at end of file
+__all__ = [
+    "create_session",
+    "get_session",
+    "patch_data",
+    "filter_transactions",
+    "transaction_list_query",
+]
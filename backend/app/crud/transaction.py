@@ -0,0 +1,416 @@
+"""
+Query helpers for transactions.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from sqlalchemy import Row, Select, delete, func, insert, select, tuple_, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.transaction import Transaction
+from app.models.transaction_rollup import TransactionRollup
+from app.schemas.enums import TransactionStatusEnum, TransactionTypeEnum
+from app.schemas.transaction import TransactionCreate
+from app.utils.money import from_minor, to_minor
+
+# Rollup bucket key, in the order used by RollupDeltas keys
+ROLLUP_KEY_COLUMNS = ("user_id", "year_month", "category", "type", "currency")
+
+# Bucket key -> (total_minor, count) change
+RollupDeltas = Dict[Tuple[int, str, str, TransactionTypeEnum, str], Tuple[int, int]]
+
+# Columns a transaction's rollup contribution is computed from
+ROLLUP_SOURCE_COLUMNS = (
+    "user_id",
+    "transaction_date",
+    "category",
+    "type",
+    "currency",
+    "amount_minor",
+)
+
+
+def select_transaction(columns: Optional[Sequence[str]] = None) -> Select:
+    """Select whole transactions, or only the named attributes as tuples."""
+    if columns is None:
+        return select(Transaction)
+    return select(*(getattr(Transaction, name) for name in columns))
+
+
+def filter_transactions(
+    query: Select,
+    status: Optional[TransactionStatusEnum] = None,
+    type: Optional[TransactionTypeEnum] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    user_id: Optional[int] = None,
+) -> Select:
+    """Apply the standard list filters to a transaction select."""
+    if user_id is not None:
+        query = query.where(Transaction.user_id == user_id)
+    if status:
+        query = query.where(Transaction.status == status)
+    if type:
+        query = query.where(Transaction.type == type)
+    if start_date:
+        query = query.where(Transaction.transaction_date >= start_date)
+    if end_date:
+        query = query.where(Transaction.transaction_date <= end_date)
+    return query
+
+
+def transaction_list_query(
+    status: Optional[TransactionStatusEnum] = None,
+    type: Optional[TransactionTypeEnum] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    user_id: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[Tuple[datetime, int]] = None,
+    columns: Optional[Sequence[str]] = None,
+) -> Select:
+    """
+    Build the listing query ordered by ``(transaction_date, id)``.
+
+    When ``after`` is given the page starts strictly after that keyset
+    position and ``skip`` is ignored. The row-value comparison lets SQLite
+    seek straight into the date-ordered indexes (whose entries already end
+    in the rowid, i.e. ``id``), so every page costs the same regardless of
+    depth.
+
+    Selects ORM entities, or plain tuples of ``columns`` when given.
+    """
+    query = filter_transactions(
+        select_transaction(columns), status, type, start_date, end_date, user_id
+    ).order_by(Transaction.transaction_date, Transaction.id)
+    if after is not None:
+        query = query.where(
+            tuple_(Transaction.transaction_date, Transaction.id) > tuple_(*after)
+        )
+    else:
+        query = query.offset(skip)
+    return query.limit(limit)
+
+
+async def list_transaction_rows(
+    db: AsyncSession,
+    columns: Sequence[str],
+    status: Optional[TransactionStatusEnum] = None,
+    type: Optional[TransactionTypeEnum] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    user_id: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[Tuple[datetime, int]] = None,
+) -> Sequence[Row]:
+    """
+    List one page of transactions as column tuples.
+
+    Skips ORM identity-map bookkeeping for read-only endpoints that serialise
+    rows directly.
+    """
+    query = transaction_list_query(
+        status, type, start_date, end_date, user_id, skip, limit, after, columns
+    )
+    return (await db.execute(query)).all()
+
+
+async def get_transaction_row(
+    db: AsyncSession, columns: Sequence[str], transaction_id: int
+) -> Optional[Row]:
+    """Get one transaction as a column tuple, or ``None`` if it does not exist."""
+    query = select_transaction(columns).where(Transaction.id == transaction_id)
+    return (await db.execute(query)).first()
+
+
+async def iter_transaction_rows(
+    db: AsyncSession,
+    columns: Sequence[str],
+    status: Optional[TransactionStatusEnum] = None,
+    type: Optional[TransactionTypeEnum] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    user_id: Optional[int] = None,
+    batch_size: int = 1000,
+) -> AsyncIterator[Sequence[Row]]:
+    """
+    Stream matching transactions as batches of column tuples.
+
+    Rows are fetched ``batch_size`` at a time from a server-side cursor
+    (``yield_per``) and never materialised as ORM objects, so memory use is
+    bounded by the batch size rather than the history length.
+    """
+    query = filter_transactions(
+        select_transaction(columns),
+        status,
+        type,
+        start_date,
+        end_date,
+        user_id,
+    ).order_by(Transaction.transaction_date, Transaction.id)
+    result = await db.stream(query.execution_options(yield_per=batch_size))
+    async for batch in result.partitions():
+        yield batch
+
+
+async def existing_ids(db: AsyncSession, model, ids: Iterable[int]) -> Set[int]:
+    """Return the subset of ``ids`` present in ``model``'s table (one query)."""
+    wanted = set(ids)
+    if not wanted:
+        return set()
+    return set(await db.scalars(select(model.id).where(model.id.in_(wanted))))
+
+
+async def bulk_insert_transactions(
+    db: AsyncSession, transactions: List[TransactionCreate]
+) -> int:
+    """
+    Insert already-validated transactions with a single executemany.
+
+    The caller owns the surrounding database transaction.
+
+    Returns:
+        int: Number of rows inserted
+    """
+    if not transactions:
+        return 0
+    rows = []
+    for transaction in transactions:
+        row = transaction.model_dump()
+        row["amount_minor"] = to_minor(row.pop("amount"), row["currency"])
+        rows.append(row)
+    await db.execute(insert(Transaction), rows)
+    return len(rows)
+
+
+# Columns a Plaid upsert overwrites on an existing row; the owner, Plaid ids
+# and created_at are kept
+PLAID_UPSERT_UPDATE_COLUMNS = (
+    "plaid_account_id",
+    "amount_minor",
+    "currency",
+    "type",
+    "category",
+    "merchant_name",
+    "description",
+    "status",
+    "transaction_date",
+    "posted_date",
+    "updated_at",
+)
+
+
+async def upsert_plaid_transactions(db: AsyncSession, rows: List[Dict]) -> None:
+    """
+    Write Plaid transaction rows with one ``INSERT ... ON CONFLICT DO UPDATE``.
+
+    Rows are column dicts including ``plaid_transaction_id``; one that
+    already exists is updated in place instead of duplicated. The caller
+    owns the surrounding database transaction.
+    """
+    if not rows:
+        return
+    stmt = sqlite_insert(Transaction)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Transaction.plaid_transaction_id],
+        set_={name: stmt.excluded[name] for name in PLAID_UPSERT_UPDATE_COLUMNS},
+    )
+    await db.execute(stmt, rows)
+
+
+def add_rollup_delta(deltas: RollupDeltas, transaction, sign: int = 1) -> None:
+    """
+    Accumulate ``transaction`` into its rollup bucket in ``deltas``.
+
+    Use ``sign=-1`` to remove a transaction's previous contribution, e.g.
+    before applying an update or when deleting it.
+    """
+    key = (
+        transaction.user_id,
+        transaction.transaction_date.strftime("%Y-%m"),
+        transaction.category,
+        transaction.type,
+        transaction.currency,
+    )
+    total, count = deltas.get(key, (0, 0))
+    amount_minor = to_minor(transaction.amount, transaction.currency)
+    deltas[key] = (total + sign * amount_minor, count + sign)
+
+
+def add_rollup_row_delta(
+    deltas: RollupDeltas, row: Mapping[str, Any], sign: int = 1
+) -> None:
+    """``add_rollup_delta`` for a row of column values with ``amount_minor``."""
+    key = (
+        row["user_id"],
+        row["transaction_date"].strftime("%Y-%m"),
+        row["category"],
+        row["type"],
+        row["currency"],
+    )
+    total, count = deltas.get(key, (0, 0))
+    deltas[key] = (total + sign * row["amount_minor"], count + sign)
+
+
+async def apply_rollup_deltas(db: AsyncSession, deltas: RollupDeltas) -> None:
+    """
+    Add accumulated deltas to ``transaction_rollups`` with one upsert.
+
+    Buckets left without transactions are removed. The caller owns the
+    surrounding database transaction, so rollups commit or roll back together
+    with the transaction rows they summarise.
+    """
+    rows = [
+        dict(zip(ROLLUP_KEY_COLUMNS, key), total_minor=total, count=count)
+        for key, (total, count) in deltas.items()
+        if count or total
+    ]
+    if not rows:
+        return
+    stmt = sqlite_insert(TransactionRollup)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=ROLLUP_KEY_COLUMNS,
+        set_={
+            "total_minor": TransactionRollup.total_minor + stmt.excluded.total_minor,
+            "count": TransactionRollup.count + stmt.excluded.count,
+        },
+    )
+    await db.execute(stmt, rows)
+    await db.execute(
+        delete(TransactionRollup).where(
+            TransactionRollup.user_id.in_({row["user_id"] for row in rows}),
+            TransactionRollup.count <= 0,
+        )
+    )
+
+
+async def update_transaction(
+    db: AsyncSession, current: Mapping[str, Any], values: Dict[str, Any]
+) -> bool:
+    """
+    Write ``values`` to a transaction and move its rollup contribution.
+
+    ``current`` holds the transaction's ``id`` and ``ROLLUP_SOURCE_COLUMNS``
+    as read before the update. The row is only written while it still has
+    those values, so the contribution taken out of the rollups is the one
+    actually replaced; a transaction changed or deleted in between is left
+    alone. The caller owns the surrounding database transaction.
+
+    Returns:
+        bool: False if the transaction no longer matches ``current``
+    """
+    result = await db.execute(
+        update(Transaction)
+        .where(
+            Transaction.id == current["id"],
+            *(
+                getattr(Transaction, name) == current[name]
+                for name in ROLLUP_SOURCE_COLUMNS
+            ),
+        )
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    if not result.rowcount:
+        return False
+    deltas: RollupDeltas = {}
+    add_rollup_row_delta(deltas, current, -1)
+    add_rollup_row_delta(deltas, {**current, **values})
+    await apply_rollup_deltas(db, deltas)
+    return True
+
+
+async def delete_transaction(db: AsyncSession, transaction_id: int) -> bool:
+    """
+    Delete a transaction and take it out of its rollup bucket.
+
+    The rollup change is computed from the row the ``DELETE`` returns, so
+    only a row this statement removed is subtracted: of two concurrent
+    deletes of the same transaction, one finds nothing. The caller owns the
+    surrounding database transaction.
+
+    Returns:
+        bool: False if the transaction did not exist
+    """
+    row = (
+        await db.execute(
+            delete(Transaction)
+            .where(Transaction.id == transaction_id)
+            .returning(*(getattr(Transaction, name) for name in ROLLUP_SOURCE_COLUMNS))
+            .execution_options(synchronize_session=False)
+        )
+    ).first()
+    if row is None:
+        return False
+    deltas: RollupDeltas = {}
+    add_rollup_row_delta(deltas, row._mapping, -1)
+    await apply_rollup_deltas(db, deltas)
+    return True
+
+
+async def list_rollups(
+    db: AsyncSession,
+    user_id: int,
+    type: Optional[TransactionTypeEnum] = None,
+    start_month: Optional[str] = None,
+    end_month: Optional[str] = None,
+) -> List[TransactionRollup]:
+    """List a user's rollup buckets ordered by month, category and type."""
+    query = select(TransactionRollup).where(TransactionRollup.user_id == user_id)
+    if type:
+        query = query.where(TransactionRollup.type == type)
+    if start_month:
+        query = query.where(TransactionRollup.year_month >= start_month)
+    if end_month:
+        query = query.where(TransactionRollup.year_month <= end_month)
+    query = query.order_by(
+        TransactionRollup.year_month,
+        TransactionRollup.category,
+        TransactionRollup.type,
+        TransactionRollup.currency,
+    )
+    return list(await db.scalars(query))
+
+
+async def total_amounts(
+    db: AsyncSession,
+    status: Optional[TransactionStatusEnum] = None,
+    type: Optional[TransactionTypeEnum] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    user_id: Optional[int] = None,
+) -> Dict[str, Decimal]:
+    """
+    Sum matching transactions per currency.
+
+    The sum runs in SQL over integer minor units, so it is exact and never
+    loads individual rows.
+    """
+    query = filter_transactions(
+        select(Transaction.currency, func.sum(Transaction.amount_minor)),
+        status,
+        type,
+        start_date,
+        end_date,
+        user_id,
+    ).group_by(Transaction.currency)
+    return {
+        currency: from_minor(total, currency)
+        for currency, total in await db.execute(query)
+    }
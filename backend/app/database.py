@@ -3,14 +3,19 @@ Database connection and session management.
 """
 
 from pathlib import Path
-from sqlalchemy import create_engine
+from typing import Dict, Union
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from app.config import settings
 
-# Create SQLite database URL
+# Create SQLite database URLs (sync pysqlite driver and async aiosqlite driver)
 SQLALCHEMY_DATABASE_URL = f"sqlite:///{settings.DATABASE_PATH}"
+SQLALCHEMY_ASYNC_DATABASE_URL = f"sqlite+aiosqlite:///{settings.DATABASE_PATH}"
 
 # Create engine with SQLite connect_args for thread safety
 engine = create_engine(
@@ -20,8 +25,46 @@ engine = create_engine(
     echo=settings.DEBUG
 )
 
-# Create sessionmaker
+# Create async engine; aiosqlite runs each connection on its own thread so
+# queries never block the event loop
+async_engine = create_async_engine(
+    SQLALCHEMY_ASYNC_DATABASE_URL,
+    echo=settings.DEBUG
+)
+
+def apply_sqlite_pragmas(dbapi_connection, pragmas: Dict[str, Union[str, int]]) -> None:
+    """Run the storage profile PRAGMAs on a freshly opened SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            # PRAGMA arguments cannot be bound parameters, so only accept
+            # integers and bare keywords
+            if not isinstance(value, int) and not str(value).isalnum():
+                raise ValueError(f"Invalid value for PRAGMA {name}: {value!r}")
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+def configure_sqlite_engine(
+    target: Engine, pragmas: Dict[str, Union[str, int]]
+) -> None:
+    """Apply ``pragmas`` to every new connection opened by ``target``."""
+    @event.listens_for(target, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        apply_sqlite_pragmas(dbapi_connection, pragmas)
+
+# Apply the storage profile to both engines (async engines expose their
+# connection events through sync_engine)
+configure_sqlite_engine(engine, settings.sqlite_pragmas)
+configure_sqlite_engine(async_engine.sync_engine, settings.sqlite_pragmas)
+
+# Create sessionmakers
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Objects stay loaded after commit so handlers can serialize them without
+# triggering implicit (and, under asyncio, illegal) lazy refreshes
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
 
 # Create base class for models
 Base = declarative_base()
@@ -34,6 +77,15 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    """Get async database session for dependency injection."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def get_async_sessionmaker():
+    """Get the async session factory, for work that outlives the request scope."""
+    return AsyncSessionLocal
+
 def _initialize_models():
     """
     Import all models to ensure they're discovered when Base.metadata.create_all() is called.
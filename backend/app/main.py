@@ -2,17 +2,44 @@
 Main application entry point for LifeFlow.
 """
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1.router import router as api_v1_router
 from app.config import settings
+from app.core.security import ENCRYPTION_PREVIOUS_KEYS
+from app.database import get_async_sessionmaker
+from app.services.plaid_refresh import get_refresh_worker
+from app.services.reencryption import get_reencryption_job
+from app.utils.plaid_client import close_plaid_client
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Run the Plaid refresh schedule, and re-encryption while previous keys are
+    configured; release process-wide resources on shutdown.
+    """
+    worker = get_refresh_worker()
+    if settings.PLAID_REFRESH_INTERVAL > 0:
+        worker.start(get_async_sessionmaker(), settings.PLAID_REFRESH_INTERVAL)
+    reencryption = get_reencryption_job()
+    if ENCRYPTION_PREVIOUS_KEYS:
+        reencryption.trigger(get_async_sessionmaker())
+    yield
+    await reencryption.stop()
+    await worker.stop()
+    close_plaid_client()
+
 
 # Initialize FastAPI app
 app = FastAPI(
     title=settings.APP_NAME,
     description="Backend API for LifeFlow application",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -3,8 +3,9 @@ from app.database import Base
 
 # Import all models here
 from .user import User
-from .plaid import PlaidItem, PlaidAccount
+from .plaid import PlaidItem, PlaidAccount, PlaidBalanceSnapshot
 from .transaction import Transaction
+from .transaction_rollup import TransactionRollup
 from .personality import PersonalityProfile
 from .onboarding_session import OnboardingSession
 
@@ -13,7 +14,9 @@ __all__ = [
     'User',
     'PlaidItem',
     'PlaidAccount',
+    'PlaidBalanceSnapshot',
     'Transaction',
+    'TransactionRollup',
     'PersonalityProfile',
     'OnboardingSession',
 ]
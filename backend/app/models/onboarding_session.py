@@ -1,7 +1,7 @@
 from datetime import datetime, timedelta
 from uuid import uuid4
 from sqlalchemy import Column, String, DateTime, JSON
-from . import Base
+from app.database import Base
 
 class OnboardingSession(Base):
     """Model for storing onboarding session data."""
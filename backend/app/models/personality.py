@@ -3,11 +3,16 @@ SQLAlchemy model for storing user personality data.
 """
 
 from datetime import datetime
-from sqlalchemy import Column, DateTime, Integer, String, ForeignKey
+from sqlalchemy import Column, DateTime, Integer, LargeBinary, ForeignKey, String
 from sqlalchemy.orm import relationship
 
 from app.database import Base
-from app.core.security import encrypt_data, decrypt_data
+from app.core.security import ENCRYPTION_KEY_ID, encrypt_json, decrypt_json
+
+# Traits packed into ``PersonalityProfile.encrypted_traits``
+PERSONALITY_TRAITS = (
+    'openness', 'social_energy', 'learning_style', 'activity_intensity'
+)
 
 class PersonalityProfile(Base):
     """Model for storing user personality profile data."""
@@ -20,11 +25,10 @@ class PersonalityProfile(Base):
     # Foreign Key to User
     user_id = Column(Integer, ForeignKey("users.id"), unique=True, nullable=False)
     
-    # Encrypted Personality Data
-    openness = Column(String, nullable=False)  # Encrypted
-    social_energy = Column(String, nullable=False)  # Encrypted
-    learning_style = Column(String, nullable=False)  # Encrypted
-    activity_intensity = Column(String, nullable=False)  # Encrypted
+    # Encrypted Personality Data: one Fernet token over all traits as JSON
+    encrypted_traits = Column(LargeBinary, nullable=False)
+    # Fingerprint of the key encrypted_traits was encrypted with; NULL if unknown
+    encryption_key_id = Column(String(16), nullable=True, index=True)
     
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -34,17 +38,13 @@ class PersonalityProfile(Base):
     user = relationship("User", back_populates="personality_profile")
 
     def set_personality_data(self, data: dict):
-        """Encrypt and set personality data."""
-        self.openness = encrypt_data(data['openness'])
-        self.social_energy = encrypt_data(data['social_energy'])
-        self.learning_style = encrypt_data(data['learning_style'])
-        self.activity_intensity = encrypt_data(data['activity_intensity'])
+        """Encrypt and set personality data with a single Fernet operation."""
+        self.encrypted_traits = encrypt_json(
+            {trait: data[trait] for trait in PERSONALITY_TRAITS}
+        )
+        self.encryption_key_id = ENCRYPTION_KEY_ID
 
     def get_personality_data(self) -> dict:
-        """Decrypt and return personality data."""
-        return {
-            'openness': decrypt_data(self.openness),
-            'social_energy': decrypt_data(self.social_energy),
-            'learning_style': decrypt_data(self.learning_style),
-            'activity_intensity': decrypt_data(self.activity_intensity)
-        } 
\ No newline at end of file
+        """Decrypt and return personality data with a single Fernet operation."""
+        data = decrypt_json(self.encrypted_traits)
+        return {trait: data.get(trait, '') for trait in PERSONALITY_TRAITS}
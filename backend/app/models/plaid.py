@@ -4,10 +4,11 @@ Models for Plaid data.
 
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Column, Date, DateTime, Enum, ForeignKey, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.database import Base
+from app.schemas.enums import BalanceResolutionEnum
 
 
 class PlaidItem(Base):
@@ -16,10 +17,17 @@ class PlaidItem(Base):
     __tablename__ = "plaid_items"
 
     id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
     item_id = Column(String, unique=True, index=True)
     access_token = Column(String, unique=True)
     institution_id = Column(String)
     institution_name = Column(String)
+    # Position in Plaid's /transactions/sync change stream; None until the first sync
+    transactions_cursor = Column(String, nullable=True)
+    # Outcome of the latest background refresh
+    last_synced_at = Column(DateTime, nullable=True)  # Last successful sync
+    last_sync_duration_ms = Column(Integer, nullable=True)
+    last_sync_error = Column(String, nullable=True)  # None if the last sync succeeded
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -45,3 +53,27 @@ class PlaidAccount(Base):
 
     item = relationship("PlaidItem", back_populates="accounts")
     transactions = relationship("Transaction", back_populates="plaid_account")
+
+
+class PlaidBalanceSnapshot(Base):
+    """Balance of a Plaid account at the end of a day, week or month.
+
+    The refresh worker writes one row per account and day, overwritten by
+    each sync so it holds the day's latest balance. Rows are compacted to
+    one per week, then per month, as they age (see
+    ``app.services.plaid_balances``).
+    """
+
+    __tablename__ = "plaid_balance_snapshots"
+
+    plaid_account_id = Column(
+        Integer, ForeignKey("plaid_accounts.id"), primary_key=True
+    )
+    snapshot_date = Column(Date, primary_key=True)  # Day the balance was taken
+    resolution = Column(
+        Enum(BalanceResolutionEnum), nullable=False, default=BalanceResolutionEnum.DAY
+    )
+    currency = Column(String, nullable=False)
+    # Minor units (cents); None when Plaid does not report the balance
+    current_minor = Column(Integer, nullable=True)
+    available_minor = Column(Integer, nullable=True)
@@ -3,12 +3,19 @@ Transaction model for the database.
 """
 
 from datetime import datetime
+from decimal import Decimal
 
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String, Index, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    Column, DateTime, Float, ForeignKey, Integer, String, Index, Enum, type_coerce
+)
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import relationship, validates
 
 from app.database import Base
 from app.schemas.enums import TransactionTypeEnum, TransactionStatusEnum
+from app.utils.money import from_minor, minor_unit_divisor, to_minor
+
+DEFAULT_CURRENCY = "USD"
 
 
 class Transaction(Base):
@@ -23,10 +30,13 @@ class Transaction(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     plaid_item_id = Column(Integer, ForeignKey("plaid_items.id"), nullable=False)
     plaid_account_id = Column(Integer, ForeignKey("plaid_accounts.id"), nullable=False)
+    # Set for rows synced from Plaid
+    plaid_transaction_id = Column(String, nullable=True)
     
     # Transaction Details
-    amount = Column(Float, nullable=False)
-    currency = Column(String, nullable=False, default="USD")
+    # Exact amount in minor units (cents)
+    amount_minor = Column(Integer, nullable=False)
+    currency = Column(String, nullable=False, default=DEFAULT_CURRENCY)
     type = Column(Enum(TransactionTypeEnum), nullable=False)
     category = Column(String, nullable=False)
     merchant_name = Column(String, nullable=True)
@@ -44,10 +54,46 @@ class Transaction(Base):
     plaid_item = relationship("PlaidItem", back_populates="transactions")
     plaid_account = relationship("PlaidAccount", back_populates="transactions")
 
-    # Indexes for performance
+    def __init__(self, **kwargs):
+        # The currency decides how ``amount`` is scaled, so it must be set first
+        if "currency" in kwargs:
+            self.currency = kwargs.pop("currency")
+        super().__init__(**kwargs)
+
+    @hybrid_property
+    def amount(self) -> Decimal:
+        """Exact decimal amount in major units of ``currency``."""
+        return from_minor(self.amount_minor, self.currency or DEFAULT_CURRENCY)
+
+    @amount.inplace.setter
+    def _amount_setter(self, value) -> None:
+        self.amount_minor = to_minor(value, self.currency or DEFAULT_CURRENCY)
+
+    @amount.inplace.expression
+    @classmethod
+    def _amount_expression(cls):
+        # Read-only projection (exports); the division is done in SQLite as REAL
+        return type_coerce(cls.amount_minor / minor_unit_divisor(cls.currency), Float)
+
+    @validates("currency")
+    def _rescale_amount(self, key, currency):
+        """Keep the decimal amount unchanged when the currency changes."""
+        if self.amount_minor is not None and currency != self.currency:
+            self.amount_minor = to_minor(self.amount, currency)
+        return currency
+
+    # Indexes for performance. The composite indexes end in transaction_date
+    # (plus the implicit rowid, i.e. id) so filtered listings can be served in
+    # (transaction_date, id) order straight from the index.
     __table_args__ = (
-        Index('ix_transactions_user_id', 'user_id'),
+        Index('ix_transactions_user_date', 'user_id', 'transaction_date', 'id'),
+        Index(
+            'ix_transactions_user_status_date', 'user_id', 'status', 'transaction_date'
+        ),
         Index('ix_transactions_plaid_account_id', 'plaid_account_id'),
         Index('ix_transactions_transaction_date', 'transaction_date'),
-        Index('ix_transactions_status', 'status'),
+        Index('ix_transactions_status_date', 'status', 'transaction_date'),
+        Index(
+            'ix_transactions_plaid_transaction_id', 'plaid_transaction_id', unique=True
+        ),
     )
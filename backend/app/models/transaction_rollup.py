@@ -0,0 +1,38 @@
+"""
+Transaction rollup model for the database.
+"""
+
+from decimal import Decimal
+
+from sqlalchemy import Column, Enum, ForeignKey, Integer, String
+
+from app.database import Base
+from app.schemas.enums import TransactionTypeEnum
+from app.utils.money import from_minor
+
+
+class TransactionRollup(Base):
+    """Running totals of a user's transactions per month, category, type and currency.
+
+    Rows are maintained incrementally by the transaction routes in the same
+    database transaction as the change they summarise (see
+    ``app.crud.transaction.apply_rollup_deltas``).
+    """
+
+    __tablename__ = "transaction_rollups"
+
+    # Bucket key
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    year_month = Column(String(7), primary_key=True)  # "YYYY-MM"
+    category = Column(String, primary_key=True)
+    type = Column(Enum(TransactionTypeEnum), primary_key=True)
+    currency = Column(String, primary_key=True)
+
+    # Aggregates
+    total_minor = Column(Integer, nullable=False, default=0)  # Minor units (cents)
+    count = Column(Integer, nullable=False, default=0)
+
+    @property
+    def total(self) -> Decimal:
+        """Exact bucket total in major units of ``currency``."""
+        return from_minor(self.total_minor, self.currency)
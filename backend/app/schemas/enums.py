@@ -29,4 +29,16 @@ class TransactionTypeEnum(CaseInsensitiveEnum):
 class TransactionStatusEnum(CaseInsensitiveEnum):
     """Case-insensitive transaction status enum."""
     PENDING = "pending"
-    POSTED = "posted" 
\ No newline at end of file
+    POSTED = "posted" 
+
+class ExportFormatEnum(CaseInsensitiveEnum):
+    """Case-insensitive export file format enum."""
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class BalanceResolutionEnum(CaseInsensitiveEnum):
+    """Period a balance snapshot stands for; snapshots coarsen as they age."""
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
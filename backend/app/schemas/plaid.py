@@ -2,10 +2,14 @@
 Pydantic models for Plaid API requests and responses.
 """
 
+from datetime import date, datetime
 from typing import Dict, List, Literal, Optional
 
+from plaid.model.transaction import Transaction as PlaidTransaction
 from pydantic import BaseModel, ConfigDict
 
+from app.schemas.enums import BalanceResolutionEnum
+
 
 class LinkTokenResponse(BaseModel):
     """Response model for link token creation."""
@@ -34,6 +38,7 @@ class ExchangeTokenRequest(BaseModel):
     institution_id: str
     institution_name: str
     accounts: List[PlaidAccountRequest]
+    user_id: Optional[int] = None  # Owner of the synced transactions
 
 
 class ExchangeTokenResponse(BaseModel):
@@ -44,8 +49,43 @@ class ExchangeTokenResponse(BaseModel):
     item_id: str
 
 
+# Plaid transaction attributes ``GET /plaid/transactions`` can return
+PLAID_TRANSACTION_FIELDS = frozenset(PlaidTransaction.attribute_map)
+
+# Returned when the request has no ``fields``: what the app displays
+DEFAULT_PLAID_TRANSACTION_FIELDS = (
+    "transaction_id",
+    "account_id",
+    "amount",
+    "iso_currency_code",
+    "date",
+    "authorized_date",
+    "name",
+    "merchant_name",
+    "pending",
+    "personal_finance_category",
+)
+
+# Account attributes returned alongside the transactions
+PLAID_ACCOUNT_FIELDS = (
+    "account_id",
+    "name",
+    "official_name",
+    "mask",
+    "type",
+    "subtype",
+    "balances",
+)
+
+
 class TransactionResponse(BaseModel):
-    """Response model for transactions."""
+    """
+    Response model for transactions.
+
+    Each transaction holds only the requested Plaid attributes
+    (``DEFAULT_PLAID_TRANSACTION_FIELDS`` by default), and each account
+    only ``PLAID_ACCOUNT_FIELDS``.
+    """
 
     model_config = ConfigDict(from_attributes=True)
     accounts: List[Dict]
@@ -58,3 +98,66 @@ class CreateLinkTokenRequest(BaseModel):
     model_config = ConfigDict(from_attributes=True)
     user_id: str
     use_redirect: bool = True
+
+
+class SyncTransactionsResponse(BaseModel):
+    """Response model for an incremental transaction sync."""
+
+    model_config = ConfigDict(from_attributes=True)
+    added: int
+    modified: int
+    removed: int
+    skipped: int
+
+
+class RefreshResponse(BaseModel):
+    """Response model for triggering a background refresh."""
+
+    model_config = ConfigDict(from_attributes=True)
+    started: bool  # False if a refresh was already running
+
+
+class PlaidItemStatus(BaseModel):
+    """Refresh status of one Plaid item."""
+
+    model_config = ConfigDict(from_attributes=True)
+    item_id: str
+    institution_name: Optional[str] = None
+    last_synced_at: Optional[datetime] = None
+    last_sync_duration_ms: Optional[int] = None
+    last_sync_error: Optional[str] = None
+
+
+class BalancePoint(BaseModel):
+    """Closing balance of an account for one day, week or month."""
+
+    model_config = ConfigDict(from_attributes=True)
+    snapshot_date: date
+    resolution: BalanceResolutionEnum
+    current: Optional[float] = None
+    available: Optional[float] = None
+
+
+class BalanceHistoryResponse(BaseModel):
+    """Response model for an account's balance history."""
+
+    model_config = ConfigDict(from_attributes=True)
+    account_id: str
+    currency: Optional[str] = None  # None if there are no points
+    points: List[BalancePoint]
+
+
+class WebhookRequest(BaseModel):
+    """Webhook sent by Plaid; only the fields we act on are declared."""
+
+    model_config = ConfigDict(extra="allow")
+    webhook_type: str
+    webhook_code: str
+    item_id: Optional[str] = None
+
+
+class WebhookResponse(BaseModel):
+    """Response model for a received webhook."""
+
+    model_config = ConfigDict(from_attributes=True)
+    status: Literal["queued", "coalesced", "ignored"]
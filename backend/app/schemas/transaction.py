@@ -4,10 +4,17 @@ Pydantic schemas for transaction validation.
 
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional
-from pydantic import BaseModel, field_validator, ConfigDict
+from typing import Dict, List, Optional
+from pydantic import BaseModel, field_validator, model_validator, ConfigDict
 
 from app.schemas.enums import TransactionTypeEnum, TransactionStatusEnum
+from app.utils.money import currency_exponent
+
+# Supported ISO 4217 currency codes (simple validation for now)
+VALID_CURRENCIES = ["USD", "EUR", "GBP", "CAD", "AUD", "JPY"]
+
+# Maximum number of rows accepted by the bulk ingestion endpoint
+MAX_BULK_TRANSACTIONS = 5000
 
 
 class TransactionBase(BaseModel):
@@ -35,7 +42,26 @@ class TransactionBase(BaseModel):
             raise ValueError("Amount cannot be negative")
         return value
 
-    model_config = ConfigDict(from_attributes=True, json_encoders={Decimal: lambda v: float(v)})
+    @field_validator("currency")
+    def validate_currency(cls, value):
+        if value not in VALID_CURRENCIES:
+            raise ValueError("Invalid currency code")
+        return value
+
+    @model_validator(mode="after")
+    def validate_amount_precision(self):
+        # Amounts are stored as integer minor units of the currency
+        exponent = self.amount.normalize().as_tuple().exponent
+        if isinstance(exponent, int) and -exponent > currency_exponent(self.currency):
+            raise ValueError(
+                f"Amount has more than {currency_exponent(self.currency)} "
+                f"decimal places for {self.currency}"
+            )
+        return self
+
+    model_config = ConfigDict(
+        from_attributes=True, json_encoders={Decimal: lambda v: float(v)}
+    )
 
 
 class TransactionCreate(TransactionBase):
@@ -54,3 +80,43 @@ class Transaction(TransactionBase):
 
     class Config:
         from_attributes = True
+
+
+# Response fields in output order, for read endpoints that serialise
+# database rows directly instead of validating them through the model
+TRANSACTION_FIELDS = tuple(Transaction.model_fields)
+
+
+class TransactionBulkError(BaseModel):
+    """Validation errors for a single row of a bulk request."""
+    index: int
+    errors: Dict[str, str]
+
+
+class TransactionBulkResult(BaseModel):
+    """Outcome of a bulk transaction ingestion request."""
+    created: int
+    failed: int
+    errors: List[TransactionBulkError]
+
+
+class TransactionTotal(BaseModel):
+    """Exact sum of the matching transactions in one currency."""
+    currency: str
+    total: Decimal
+
+    model_config = ConfigDict(json_encoders={Decimal: lambda v: float(v)})
+
+
+class TransactionRollupBucket(BaseModel):
+    """Total and count of a user's transactions per month, category, type, currency."""
+    year_month: str
+    category: str
+    type: TransactionTypeEnum
+    currency: str
+    total: Decimal
+    count: int
+
+    model_config = ConfigDict(
+        from_attributes=True, json_encoders={Decimal: lambda v: float(v)}
+    )
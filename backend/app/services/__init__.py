@@ -0,0 +1,3 @@
+"""
+Application services that coordinate external APIs and the database.
+"""
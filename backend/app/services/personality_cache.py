@@ -0,0 +1,101 @@
+"""
+In-process cache of decrypted personality profiles.
+
+Traits rarely change, so ``GET /user-profile/personality/{user_id}`` keeps
+each decrypted profile in memory, keyed by ``(user_id, updated_at)``: a
+profile written since it was cached has a new key and is decrypted again.
+Entries are also dropped when a user's profile is created, live at most
+``PERSONALITY_CACHE_TTL`` seconds and are bounded by
+``PERSONALITY_CACHE_SIZE``. Plaintext only ever lives in this process's
+memory; nothing is persisted or pickled.
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+
+from app.config import settings
+from app.models.personality import PersonalityProfile
+from app.utils.cache import TTLCache
+
+# Plaintext of a handful of short traits; the entry cap is the real bound
+MAX_CACHE_BYTES = 16 * 1024 * 1024
+
+
+class PersonalityCache:
+    """
+    LRU of decrypted traits, with hit and decrypt-time counters.
+
+    Args:
+        max_entries: Maximum number of cached profiles; 0 disables caching
+        ttl: Seconds an entry stays valid; 0 disables caching
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self._cache: TTLCache[Dict[str, str]] = TTLCache(
+            ttl=ttl if max_entries > 0 else 0,
+            max_bytes=MAX_CACHE_BYTES,
+            sizeof=lambda traits: sum(len(value) for value in traits.values()),
+            max_entries=max_entries,
+        )
+        self._decrypts = 0
+        self._decrypt_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def get_personality_data(self, profile: PersonalityProfile) -> Dict[str, str]:
+        """Decrypted traits of ``profile``, from the cache when current."""
+        key = (profile.user_id, profile.updated_at)
+        traits = self._cache.get(key)
+        if traits is None:
+            started = time.perf_counter()
+            traits = profile.get_personality_data()
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._decrypts += 1
+                self._decrypt_seconds += elapsed
+            # Traits that failed to decrypt come back empty; retry those next time
+            if all(traits.values()):
+                self._cache.set(key, traits)
+        # A copy, so callers cannot change the cached entry
+        return dict(traits)
+
+    def invalidate_user(self, user_id: int) -> int:
+        """Drop every cached version of ``user_id``'s profile."""
+        return self._cache.invalidate(lambda key: key[0] == user_id)
+
+    def stats(self) -> Dict[str, float]:
+        """Cache counters plus hit ratio and decrypt timings, for monitoring."""
+        stats = self._cache.stats.as_dict()
+        lookups = stats["hits"] + stats["misses"]
+        with self._lock:
+            decrypts, seconds = self._decrypts, self._decrypt_seconds
+        return {
+            **stats,
+            "hit_ratio": stats["hits"] / lookups if lookups else 0.0,
+            "decrypts": decrypts,
+            "decrypt_ms_total": seconds * 1000,
+            "decrypt_ms_avg": seconds * 1000 / decrypts if decrypts else 0.0,
+        }
+
+
+_cache: Optional[PersonalityCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_personality_cache() -> PersonalityCache:
+    """Return the process-wide personality cache, configured from settings."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = PersonalityCache(
+                    settings.PERSONALITY_CACHE_SIZE, settings.PERSONALITY_CACHE_TTL
+                )
+    return _cache
+
+
+def reset_personality_cache() -> None:
+    """Discard the cache and its counters; the next use recreates it."""
+    global _cache
+    with _cache_lock:
+        _cache = None
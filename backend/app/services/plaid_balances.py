@@ -0,0 +1,243 @@
+"""
+Balance history of Plaid accounts.
+
+Every refresh stores each account's current balance in the snapshot row for
+the day, so balance charts read a local table instead of calling Plaid. To
+keep that table, and range queries over it, bounded as it grows,
+``compact_snapshots`` coarsens old rows: daily points older than
+``PLAID_BALANCE_DAILY_DAYS`` become one point per week, and weekly points
+older than ``PLAID_BALANCE_WEEKLY_DAYS`` one point per month. The point kept
+for a period is its last, i.e. the closing balance.
+"""
+
+from datetime import date, datetime, timedelta
+from decimal import ROUND_HALF_EVEN, Decimal
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from plaid.api import plaid_api
+from sqlalchemy import and_, bindparam, delete, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.plaid import PlaidAccount, PlaidBalanceSnapshot, PlaidItem
+from app.schemas.enums import BalanceResolutionEnum
+from app.utils.money import currency_exponent, to_minor
+from app.utils.plaid_client import get_accounts_async
+
+# Core table, for executemany deletes and updates by primary key
+_snapshots = PlaidBalanceSnapshot.__table__
+
+# Primary key of a snapshot: (plaid_account_id, snapshot_date)
+SnapshotKey = Tuple[int, date]
+
+
+def period_start(day: date, resolution: BalanceResolutionEnum) -> date:
+    """First day of the week (Monday) or month containing ``day``."""
+    if resolution is BalanceResolutionEnum.WEEK:
+        return day - timedelta(days=day.weekday())
+    if resolution is BalanceResolutionEnum.MONTH:
+        return day.replace(day=1)
+    return day
+
+
+def balance_fields(account: Any) -> Dict[str, Any]:
+    """
+    Map a Plaid account's ``balances`` onto snapshot column values.
+
+    Balances are float JSON, so they are rounded half-even to the currency's
+    minor unit before conversion, as transaction amounts are.
+    """
+    balances = account.balances
+    currency = (
+        balances.get("iso_currency_code")
+        or balances.get("unofficial_currency_code")
+        or "USD"
+    )
+    quantum = Decimal(1).scaleb(-currency_exponent(currency))
+
+    def minor(amount: Optional[float]) -> Optional[int]:
+        if amount is None:
+            return None
+        return to_minor(
+            Decimal(str(amount)).quantize(quantum, rounding=ROUND_HALF_EVEN), currency
+        )
+
+    return {
+        "currency": currency,
+        "current_minor": minor(balances.get("current")),
+        "available_minor": minor(balances.get("available")),
+    }
+
+
+async def record_balances(
+    db: AsyncSession, plaid_item: PlaidItem, accounts: Iterable[Any], day: date
+) -> int:
+    """
+    Store the balances of ``accounts`` as the item's snapshots for ``day``.
+
+    All rows are written with one upsert, replacing any earlier snapshot of
+    the same day. Accounts we have no ``PlaidAccount`` for are skipped.
+    Nothing is committed; the caller owns the transaction.
+
+    Returns:
+        int: Number of snapshots written
+    """
+    account_ids = dict(
+        (
+            await db.execute(
+                select(PlaidAccount.account_id, PlaidAccount.id).where(
+                    PlaidAccount.plaid_item_id == plaid_item.id
+                )
+            )
+        ).all()
+    )
+    rows = [
+        {
+            **balance_fields(account),
+            "plaid_account_id": account_ids[account.account_id],
+            "snapshot_date": day,
+            "resolution": BalanceResolutionEnum.DAY,
+        }
+        for account in accounts
+        if account.account_id in account_ids
+    ]
+    if rows:
+        stmt = sqlite_insert(PlaidBalanceSnapshot)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                PlaidBalanceSnapshot.plaid_account_id,
+                PlaidBalanceSnapshot.snapshot_date,
+            ],
+            set_={
+                name: stmt.excluded[name]
+                for name in ("currency", "current_minor", "available_minor")
+            },
+        )
+        await db.execute(stmt, rows)
+    return len(rows)
+
+
+async def snapshot_item(
+    db: AsyncSession,
+    client: plaid_api.PlaidApi,
+    plaid_item: PlaidItem,
+    day: Optional[date] = None,
+) -> int:
+    """
+    Fetch the item's balances from Plaid, store them for ``day`` and commit.
+
+    Raises:
+        PlaidError: If the Plaid call fails
+    """
+    accounts = await get_accounts_async(
+        client, plaid_item.access_token, institution_id=plaid_item.institution_id
+    )
+    count = await record_balances(
+        db, plaid_item, accounts, day or datetime.utcnow().date()
+    )
+    await db.commit()
+    return count
+
+
+async def _coarsen(
+    db: AsyncSession,
+    finer: BalanceResolutionEnum,
+    coarser: BalanceResolutionEnum,
+    cutoff: date,
+) -> int:
+    """Reduce ``finer`` snapshots before ``cutoff`` to one per ``coarser`` period."""
+    finer_rows: List[SnapshotKey] = [
+        tuple(row)
+        for row in await db.execute(
+            select(_snapshots.c.plaid_account_id, _snapshots.c.snapshot_date).where(
+                _snapshots.c.resolution == finer, _snapshots.c.snapshot_date < cutoff
+            )
+        )
+    ]
+    if not finer_rows:
+        return 0
+    # A period may already have a coarser point, e.g. after a settings change
+    earliest = min(period_start(day, coarser) for _, day in finer_rows)
+    coarser_rows: List[SnapshotKey] = [
+        tuple(row)
+        for row in await db.execute(
+            select(_snapshots.c.plaid_account_id, _snapshots.c.snapshot_date).where(
+                _snapshots.c.resolution == coarser,
+                _snapshots.c.snapshot_date >= earliest,
+                _snapshots.c.snapshot_date < cutoff,
+                _snapshots.c.plaid_account_id.in_({a for a, _ in finer_rows}),
+            )
+        )
+    ]
+
+    closing: Dict[SnapshotKey, date] = {}  # (account, period start) -> last day
+    for account_id, day in finer_rows + coarser_rows:
+        period = (account_id, period_start(day, coarser))
+        closing[period] = max(closing.get(period, day), day)
+    keep = {(account_id, day) for (account_id, _), day in closing.items()}
+    drop = [pk for pk in finer_rows + coarser_rows if pk not in keep]
+    promote = [pk for pk in finer_rows if pk in keep]
+
+    by_pk = and_(
+        _snapshots.c.plaid_account_id == bindparam("pk_account"),
+        _snapshots.c.snapshot_date == bindparam("pk_date"),
+    )
+    if drop:
+        await db.execute(
+            delete(_snapshots).where(by_pk),
+            [{"pk_account": a, "pk_date": d} for a, d in drop],
+        )
+    if promote:
+        await db.execute(
+            update(_snapshots).where(by_pk).values(resolution=coarser),
+            [{"pk_account": a, "pk_date": d} for a, d in promote],
+        )
+    return len(drop)
+
+
+async def compact_snapshots(db: AsyncSession, today: Optional[date] = None) -> int:
+    """
+    Coarsen aged snapshots of every account and commit.
+
+    Cutoffs are aligned to period starts, so a week or month is only
+    compacted once all of it is old enough.
+
+    Returns:
+        int: Number of snapshots removed
+    """
+    today = today or datetime.utcnow().date()
+    steps = (
+        (
+            BalanceResolutionEnum.DAY,
+            BalanceResolutionEnum.WEEK,
+            settings.PLAID_BALANCE_DAILY_DAYS,
+        ),
+        (
+            BalanceResolutionEnum.WEEK,
+            BalanceResolutionEnum.MONTH,
+            settings.PLAID_BALANCE_WEEKLY_DAYS,
+        ),
+    )
+    removed = 0
+    for finer, coarser, days in steps:
+        cutoff = period_start(today - timedelta(days=days), coarser)
+        removed += await _coarsen(db, finer, coarser, cutoff)
+    await db.commit()
+    return removed
+
+
+def downsample(points: Sequence[Any], start: date, end: date, width: int) -> List[Any]:
+    """
+    Reduce date-ordered ``points`` to at most ``width`` for a chart.
+
+    ``[start, end]`` is split into ``width`` equal slices and the last point
+    of each slice is kept, so every slice shows its closing balance.
+    """
+    if len(points) <= width:
+        return list(points)
+    span = (end - start).days + 1
+    slices: Dict[int, Any] = {}
+    for point in points:
+        slices[(point.snapshot_date - start).days * width // span] = point
+    return list(slices.values())
@@ -0,0 +1,321 @@
+"""
+Background refresh of every linked Plaid item.
+
+``PlaidRefreshWorker`` walks all ``PlaidItem`` rows on a schedule (or when
+triggered) and runs an incremental sync and a balance snapshot for each
+one, several at a time but never more than ``concurrency`` at once and
+never faster than one sync start per ``institution_interval`` seconds
+against the same institution.
+Single items can also be queued, e.g. when Plaid sends a webhook for them.
+The outcome of every attempt is stored on the item, so API requests read
+the local ledger instead of waiting on Plaid.
+"""
+
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import chain, zip_longest
+from typing import AsyncIterator, Callable, Dict, List, Optional, Set
+
+from plaid.api import plaid_api
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.models.plaid import PlaidItem
+from app.services.plaid_balances import compact_snapshots, snapshot_item
+from app.services.plaid_sync import sync_item
+from app.utils.plaid_client import PlaidError, get_plaid_client
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RefreshOutcome:
+    """Result of refreshing one item."""
+
+    item_id: str
+    duration_ms: int
+    error: Optional[str] = None  # Of the transactions sync
+    snapshot_error: Optional[str] = None  # Of the balance snapshot after it
+
+
+class InstitutionRateLimiter:
+    """
+    Spaces out work per institution.
+
+    ``slot`` lets work for one institution start at most once per
+    ``min_interval`` seconds. The interval is waited out before a
+    concurrency slot is taken, so an institution on cooldown never holds a
+    slot that work for other institutions could use.
+    """
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._last_start: Dict[str, float] = {}
+        self._turns: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+    @asynccontextmanager
+    async def slot(
+        self, institution_id: str, semaphore: asyncio.Semaphore
+    ) -> AsyncIterator[None]:
+        """Hold one of ``semaphore``'s slots, taken once the institution is due."""
+        # One waiter per institution at a time, so starts stay in order and apart
+        async with self._turns[institution_id]:
+            last_start = self._last_start.get(institution_id)
+            if last_start is not None:
+                delay = last_start + self.min_interval - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            await semaphore.acquire()
+            self._last_start[institution_id] = time.monotonic()
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+
+def interleave_by_institution(items: List[PlaidItem]) -> List[PlaidItem]:
+    """
+    Order items round-robin across institutions.
+
+    Consecutive items then mostly belong to different institutions, so
+    workers rarely sit idle on an institution's rate limit.
+    """
+    by_institution: Dict[str, List[PlaidItem]] = defaultdict(list)
+    for item in items:
+        by_institution[item.institution_id or ""].append(item)
+    rounds = zip_longest(*by_institution.values())
+    return [item for item in chain.from_iterable(rounds) if item is not None]
+
+
+def describe_error(error: Exception) -> str:
+    """Short, storable description of a failed sync."""
+    # Plaid API errors append the full HTTP response after the first line
+    message = str(error).split("\n", 1)[0] or type(error).__name__
+    if isinstance(error, PlaidError) and error.error_code:
+        return f"{error.error_code}: {message}"
+    return message
+
+
+class PlaidRefreshWorker:
+    """
+    Refreshes every user-linked Plaid item from an asyncio task.
+
+    Args:
+        concurrency: Maximum number of items synced at the same time
+        institution_interval: Minimum seconds between two sync starts
+            against the same institution
+        debounce: Seconds a queued item waits before syncing, so a burst of
+            requests for it results in one sync
+        client_factory: Returns the Plaid client used for every sync
+    """
+
+    def __init__(
+        self,
+        concurrency: int,
+        institution_interval: float,
+        debounce: float = 0.0,
+        client_factory: Callable[[], plaid_api.PlaidApi] = get_plaid_client,
+    ):
+        self.concurrency = concurrency
+        self.institution_interval = institution_interval
+        self.debounce = debounce
+        self.client_factory = client_factory
+        self._task: Optional[asyncio.Task] = None
+        self._refresh: Optional[asyncio.Task] = None
+        # Per-item state for queued syncs and for never syncing one item twice at once
+        self._queued: Dict[int, asyncio.Task] = {}
+        self._requeued: Set[int] = set()
+        self._item_locks: Dict[int, asyncio.Lock] = {}
+
+    @property
+    def refreshing(self) -> bool:
+        """Whether a refresh pass is in progress."""
+        return self._refresh is not None and not self._refresh.done()
+
+    async def refresh_all(
+        self, session_factory: async_sessionmaker
+    ) -> List[RefreshOutcome]:
+        """
+        Sync every item linked to a user and record how each sync went.
+
+        Failures are recorded on the item and returned, never raised, so one
+        broken item does not hold up the others. Items deleted meanwhile are
+        skipped. Aged balance snapshots are compacted once all items are done.
+        """
+        async with session_factory() as db:
+            items = list(
+                await db.scalars(
+                    select(PlaidItem)
+                    .where(PlaidItem.user_id.is_not(None))
+                    .order_by(PlaidItem.id)
+                )
+            )
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        limiter = InstitutionRateLimiter(self.institution_interval)
+
+        async def refresh(item: PlaidItem) -> Optional[RefreshOutcome]:
+            async with limiter.slot(item.institution_id or "", semaphore):
+                return await self.refresh_item(session_factory, item.id)
+
+        items = interleave_by_institution(items)
+        results = await asyncio.gather(*map(refresh, items), return_exceptions=True)
+        outcomes = []
+        for item, result in zip(items, results):
+            if isinstance(result, Exception):
+                # refresh_item records sync errors itself; this failed around them
+                error = describe_error(result)
+                logger.error("Refreshing Plaid item %s failed: %s", item.item_id, error)
+                result = RefreshOutcome(item.item_id, 0, error)
+            if result is not None:
+                outcomes.append(result)
+        async with session_factory() as db:
+            await compact_snapshots(db)
+        return outcomes
+
+    async def refresh_item(
+        self, session_factory: async_sessionmaker, plaid_item_id: int
+    ) -> Optional[RefreshOutcome]:
+        """
+        Sync and snapshot one item in its own session; store the outcome on it.
+
+        The sync commits on its own, so it counts as done (``last_synced_at``
+        advances) even if the balance snapshot after it fails; that failure
+        is only logged and returned.
+
+        Returns:
+            Optional[RefreshOutcome]: None if the item no longer exists
+        """
+        lock = self._item_locks.setdefault(plaid_item_id, asyncio.Lock())
+        async with lock, session_factory() as db:
+            plaid_item = await db.get(PlaidItem, plaid_item_id)
+            if plaid_item is None:
+                self._item_locks.pop(plaid_item_id, None)
+                logger.info("Skipping refresh of deleted Plaid item %s", plaid_item_id)
+                return None
+            item_id = plaid_item.item_id
+            started = time.perf_counter()
+            error = snapshot_error = None
+            try:
+                client = self.client_factory()
+                await sync_item(db, client, plaid_item)
+            except Exception as e:
+                await db.rollback()
+                error = describe_error(e)
+                logger.warning("Syncing Plaid item %s failed: %s", item_id, error)
+            else:
+                try:
+                    await snapshot_item(db, client, plaid_item)
+                except Exception as e:
+                    await db.rollback()
+                    snapshot_error = describe_error(e)
+                    logger.warning(
+                        "Snapshotting balances of Plaid item %s failed: %s",
+                        item_id,
+                        snapshot_error,
+                    )
+            duration_ms = round((time.perf_counter() - started) * 1000)
+            await self._record(db, plaid_item, duration_ms, error)
+            return RefreshOutcome(item_id, duration_ms, error, snapshot_error)
+
+    @staticmethod
+    async def _record(
+        db: AsyncSession, plaid_item: PlaidItem, duration_ms: int, error: Optional[str]
+    ) -> None:
+        if error is None:
+            plaid_item.last_synced_at = datetime.utcnow()
+        plaid_item.last_sync_duration_ms = duration_ms
+        plaid_item.last_sync_error = error
+        await db.commit()
+
+    @property
+    def queued(self) -> int:
+        """Number of items with a queued or running single-item sync."""
+        return len(self._queued)
+
+    def trigger(self, session_factory: async_sessionmaker) -> bool:
+        """
+        Start a refresh pass in the background unless one is already running.
+
+        Returns:
+            bool: True if a new pass was started
+        """
+        if self.refreshing:
+            return False
+        self._refresh = asyncio.create_task(self.refresh_all(session_factory))
+        return True
+
+    def enqueue(self, session_factory: async_sessionmaker, plaid_item_id: int) -> bool:
+        """
+        Sync one item in the background, coalescing repeated requests.
+
+        Requests that arrive before the queued sync starts are absorbed by
+        it. A request that arrives while the item is syncing schedules one
+        more sync afterwards, since the running one may have missed the
+        change being announced.
+
+        Returns:
+            bool: True if a new sync was queued, False if coalesced
+        """
+        if plaid_item_id in self._queued:
+            self._requeued.add(plaid_item_id)
+            return False
+
+        async def run() -> None:
+            try:
+                while True:
+                    await asyncio.sleep(self.debounce)
+                    self._requeued.discard(plaid_item_id)
+                    await self.refresh_item(session_factory, plaid_item_id)
+                    if plaid_item_id not in self._requeued:
+                        return
+            finally:
+                del self._queued[plaid_item_id]
+
+        self._queued[plaid_item_id] = asyncio.create_task(run())
+        return True
+
+    def start(self, session_factory: async_sessionmaker, interval: float) -> None:
+        """Refresh every ``interval`` seconds until ``stop`` is called."""
+
+        async def run() -> None:
+            while True:
+                if self.trigger(session_factory):
+                    try:
+                        await self._refresh
+                    except Exception:
+                        logger.exception("Scheduled Plaid refresh failed")
+                await asyncio.sleep(interval)
+
+        if self._task is None:
+            self._task = asyncio.create_task(run())
+
+    async def stop(self) -> None:
+        """Cancel the schedule and any refresh or queued sync in progress."""
+        tasks = [t for t in (self._task, self._refresh) if t is not None]
+        tasks.extend(self._queued.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = self._refresh = None
+
+
+_worker: Optional[PlaidRefreshWorker] = None
+
+
+def get_refresh_worker() -> PlaidRefreshWorker:
+    """Get the process-wide refresh worker, configured from settings."""
+    global _worker
+    if _worker is None:
+        _worker = PlaidRefreshWorker(
+            settings.PLAID_REFRESH_CONCURRENCY,
+            settings.PLAID_REFRESH_INSTITUTION_INTERVAL,
+            debounce=settings.PLAID_WEBHOOK_DEBOUNCE,
+        )
+    return _worker
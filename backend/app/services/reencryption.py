@@ -0,0 +1,214 @@
+"""
+Background re-encryption of personality profiles after a key rotation.
+
+To rotate the encryption key, the old ``ENCRYPTION_KEY`` moves to
+``ENCRYPTION_PREVIOUS_KEYS`` and a new one takes its place. Reads keep
+working with either key, and ``ProfileReencryptionJob`` moves every stored
+profile over to the new key: ``chunk_size`` rows per transaction, with a
+``pause`` between chunks so the writes never hold the database for long or
+crowd out API requests. Each re-encrypted row records the new key's
+fingerprint, so a stopped job picks up where it left off the next time it
+runs. Once no profile is left on an old key, the old key can be dropped.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from cryptography.fernet import InvalidToken
+from sqlalchemy import bindparam, func, or_, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config import settings
+from app.core import security
+from app.models.personality import PersonalityProfile
+
+logger = logging.getLogger(__name__)
+
+profiles = PersonalityProfile.__table__
+
+
+def needs_reencryption():
+    """Filter for profiles not (known to be) encrypted with the current key."""
+    return or_(
+        PersonalityProfile.encryption_key_id.is_(None),
+        PersonalityProfile.encryption_key_id != security.ENCRYPTION_KEY_ID,
+    )
+
+
+def rotate_rows(rows: Sequence[Row]) -> Tuple[List[Dict[str, object]], List[int]]:
+    """
+    Re-encrypt a chunk of profiles with the current key.
+
+    Returns:
+        Update parameters for the rows that were re-encrypted, and the ids
+        of the rows no configured key could decrypt
+    """
+    params, failed = [], []
+    for row in rows:
+        try:
+            token = security.rotate_token(row.encrypted_traits)
+        except InvalidToken:
+            failed.append(row.id)
+            continue
+        params.append({
+            "row_id": row.id,
+            "old_token": row.encrypted_traits,
+            "new_token": token,
+            "key_id": security.ENCRYPTION_KEY_ID,
+            # Unchanged traits keep their version, so ETags and cached entries
+            # stay valid
+            "row_updated_at": row.updated_at,
+        })
+    return params, failed
+
+
+@dataclass
+class ReencryptionProgress:
+    """Counters of one pass over the profiles."""
+
+    rotated: int = 0
+    # Rows rewritten by someone else meanwhile; already on the current key
+    conflicts: int = 0
+    # Rows no configured key decrypts; left untouched
+    failed: int = 0
+    last_id: int = 0
+
+
+class ProfileReencryptionJob:
+    """
+    Re-encrypts every personality profile still on a previous key.
+
+    Args:
+        chunk_size: Profiles read, re-encrypted and written per transaction
+        pause: Seconds to wait between two chunks
+    """
+
+    def __init__(self, chunk_size: int, pause: float):
+        self.chunk_size = chunk_size
+        self.pause = pause
+        self.progress = ReencryptionProgress()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether a pass is in progress."""
+        return self._task is not None and not self._task.done()
+
+    async def run_chunk(self, session_factory: async_sessionmaker) -> int:
+        """
+        Re-encrypt the next chunk of profiles after ``progress.last_id``.
+
+        Rows are only overwritten if their token is still the one that was
+        read, so a profile written concurrently is never clobbered.
+
+        Returns:
+            int: Number of profiles in the chunk, 0 once none are left
+        """
+        async with session_factory() as db:
+            rows = (
+                await db.execute(
+                    select(
+                        PersonalityProfile.id,
+                        PersonalityProfile.encrypted_traits,
+                        PersonalityProfile.updated_at,
+                    )
+                    .where(
+                        PersonalityProfile.id > self.progress.last_id,
+                        needs_reencryption(),
+                    )
+                    .order_by(PersonalityProfile.id)
+                    .limit(self.chunk_size)
+                )
+            ).all()
+            if not rows:
+                return 0
+
+            # Fernet is CPU-bound; keep it off the event loop
+            params, failed = await asyncio.to_thread(rotate_rows, rows)
+            if params:
+                result = await db.execute(
+                    update(profiles)
+                    .where(
+                        profiles.c.id == bindparam("row_id"),
+                        profiles.c.encrypted_traits == bindparam("old_token"),
+                    )
+                    .values(
+                        encrypted_traits=bindparam("new_token"),
+                        encryption_key_id=bindparam("key_id"),
+                        updated_at=bindparam("row_updated_at"),
+                    ),
+                    params,
+                )
+                await db.commit()
+                self.progress.rotated += result.rowcount
+                self.progress.conflicts += len(params) - result.rowcount
+
+        if failed:
+            logger.error(
+                "Could not decrypt personality profiles %s with any configured key",
+                failed,
+            )
+        self.progress.failed += len(failed)
+        self.progress.last_id = rows[-1].id
+        return len(rows)
+
+    async def run(self, session_factory: async_sessionmaker) -> ReencryptionProgress:
+        """
+        Re-encrypt every profile on a previous key, one chunk at a time.
+
+        Returns:
+            ReencryptionProgress: Counters of this pass
+        """
+        self.progress = ReencryptionProgress()
+        while await self.run_chunk(session_factory):
+            await asyncio.sleep(self.pause)
+
+        async with session_factory() as db:
+            remaining = await db.scalar(
+                select(func.count()).select_from(profiles).where(needs_reencryption())
+            )
+        logger.info(
+            "Re-encrypted %d personality profiles (%d conflicts, %d failed); "
+            "%d still on a previous key",
+            self.progress.rotated,
+            self.progress.conflicts,
+            self.progress.failed,
+            remaining,
+        )
+        return self.progress
+
+    def trigger(self, session_factory: async_sessionmaker) -> bool:
+        """
+        Start a pass in the background unless one is already running.
+
+        Returns:
+            bool: True if a new pass was started
+        """
+        if self.running:
+            return False
+        self._task = asyncio.create_task(self.run(session_factory))
+        return True
+
+    async def stop(self) -> None:
+        """Cancel the pass in progress; committed chunks stay re-encrypted."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+_job: Optional[ProfileReencryptionJob] = None
+
+
+def get_reencryption_job() -> ProfileReencryptionJob:
+    """Get the process-wide re-encryption job, configured from settings."""
+    global _job
+    if _job is None:
+        _job = ProfileReencryptionJob(
+            settings.ENCRYPTION_ROTATION_CHUNK_SIZE,
+            settings.ENCRYPTION_ROTATION_PAUSE,
+        )
+    return _job
@@ -0,0 +1,129 @@
+"""
+In-process TTL cache with LRU eviction under a memory cap.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+
+@dataclass
+class CacheStats:
+    """Counters since the cache was created, plus its current footprint."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0  # Dropped to stay under max_bytes
+    expirations: int = 0  # Dropped because their TTL ran out
+    invalidations: int = 0  # Dropped by invalidate()
+    entries: int = 0
+    bytes: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+class TTLCache(Generic[V]):
+    """
+    Thread-safe cache whose entries live for ``ttl`` seconds.
+
+    The total ``sizeof`` of the stored values is kept under ``max_bytes``
+    (and the number of entries under ``max_entries``) by evicting the least
+    recently used entries; a single value larger than the cap is not stored
+    at all. A ``ttl`` of 0 disables caching.
+
+    Args:
+        ttl: Seconds an entry stays valid after it is set, unless ``set``
+            is given another
+        max_bytes: Cap on the summed size of all values
+        sizeof: Size of a value in bytes; ``len`` suits ``bytes`` values
+        max_entries: Optional cap on the number of entries
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_bytes: int,
+        sizeof: Callable[[V], int] = len,
+        max_entries: Optional[int] = None,
+    ):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.max_entries = max_entries
+        # key -> (expires_at, size, value), least recently used first
+        self._entries: "OrderedDict[Hashable, Tuple[float, int, V]]" = OrderedDict()
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """Return the live value for ``key``, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                self._drop(key)
+                self._stats.expirations += 1
+                entry = None
+            if entry is None:
+                self._stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return entry[2]
+
+    def set(self, key: Hashable, value: V, ttl: Optional[float] = None) -> None:
+        """
+        Store ``value`` under ``key``, evicting old entries as needed.
+
+        ``ttl`` overrides the cache's TTL for this entry, e.g. to expire it
+        with the resource it holds.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        size = self.sizeof(value)
+        if ttl <= 0 or size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            while self._entries and (
+                self._stats.bytes + size > self.max_bytes
+                or self._stats.entries == self.max_entries
+            ):
+                self._drop(next(iter(self._entries)))
+                self._stats.evictions += 1
+            self._entries[key] = (time.monotonic() + ttl, size, value)
+            self._stats.entries += 1
+            self._stats.bytes += size
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> int:
+        """
+        Drop every entry whose key matches ``predicate``.
+
+        Returns:
+            int: Number of entries dropped
+        """
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                self._drop(key)
+            self._stats.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        """Drop every entry; counters are kept."""
+        self.invalidate(lambda key: True)
+
+    @property
+    def stats(self) -> CacheStats:
+        """Snapshot of the counters."""
+        with self._lock:
+            return CacheStats(**self._stats.as_dict())
+
+    def _drop(self, key: Hashable) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._stats.entries -= 1
+        self._stats.bytes -= size
@@ -0,0 +1,48 @@
+"""
+Entity tag helpers for conditional GET requests.
+"""
+
+import hashlib
+from typing import Any, Dict, Optional
+
+from fastapi import Response, status
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Build a strong ETag from values that identify one version of a resource.
+
+    Typically the primary key(s) and ``updated_at`` of every row rendered in
+    the response; any change to one of them yields a different tag.
+
+    Returns:
+        str: Quoted entity tag, e.g. ``"3f2a..."``
+    """
+    digest = hashlib.blake2b(
+        "|".join(map(str, parts)).encode(), digest_size=16
+    ).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an ``If-None-Match`` header against ``etag``.
+
+    Uses the weak comparison required for ``If-None-Match`` (RFC 9110
+    13.1.2): ``W/`` prefixes are ignored and ``*`` matches any tag.
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def not_modified(etag: str, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Return an empty ``304 Not Modified`` response carrying ``etag``."""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={**(headers or {}), "ETag": etag},
+    )
@@ -0,0 +1,65 @@
+"""
+Row encoders for streaming transaction exports.
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Any, AsyncIterable, AsyncIterator, Sequence
+
+# Columns written by the export endpoint, in output order
+EXPORT_COLUMNS = (
+    "id",
+    "user_id",
+    "plaid_item_id",
+    "plaid_account_id",
+    "amount",
+    "currency",
+    "type",
+    "status",
+    "category",
+    "merchant_name",
+    "description",
+    "transaction_date",
+    "posted_date",
+    "created_at",
+    "updated_at",
+)
+
+
+def _plain(value: Any) -> Any:
+    """Convert enum and datetime values to JSON/CSV friendly scalars."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+async def iter_ndjson(
+    batches: AsyncIterable[Sequence[Sequence[Any]]],
+    columns: Sequence[str] = EXPORT_COLUMNS,
+) -> AsyncIterator[str]:
+    """Encode batches of row tuples as newline-delimited JSON, one chunk per batch."""
+    async for batch in batches:
+        yield "".join(
+            json.dumps(dict(zip(columns, map(_plain, row)))) + "\n" for row in batch
+        )
+
+
+async def iter_csv(
+    batches: AsyncIterable[Sequence[Sequence[Any]]],
+    columns: Sequence[str] = EXPORT_COLUMNS,
+) -> AsyncIterator[str]:
+    """Encode batches of row tuples as CSV with a header row, one chunk per batch."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue()
+    async for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([map(_plain, row) for row in batch])
+        yield buffer.getvalue()
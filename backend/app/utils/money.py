@@ -0,0 +1,59 @@
+"""
+Exact money conversions between decimal amounts and integer minor units.
+"""
+
+from decimal import Decimal
+from typing import Union
+
+from sqlalchemy import case
+from sqlalchemy.sql import ColumnElement
+
+# ISO 4217 minor-unit exponents that differ from the usual two decimals
+CURRENCY_EXPONENTS = {"JPY": 0}
+DEFAULT_EXPONENT = 2
+
+
+def currency_exponent(currency: str) -> int:
+    """Return the number of decimal places used by ``currency``."""
+    return CURRENCY_EXPONENTS.get(currency, DEFAULT_EXPONENT)
+
+
+def to_minor(amount: Union[Decimal, int, float, str], currency: str) -> int:
+    """
+    Convert a decimal amount to integer minor units (e.g. cents).
+
+    Floats are converted through their shortest ``repr`` so ``10.1`` means
+    ten dollars and ten cents, not the nearest binary fraction.
+
+    Args:
+        amount: Amount in major units
+        currency: ISO 4217 currency code
+
+    Returns:
+        int: Amount in minor units
+
+    Raises:
+        ValueError: If the amount has more decimal places than the currency
+    """
+    value = amount if isinstance(amount, Decimal) else Decimal(str(amount))
+    minor = value.scaleb(currency_exponent(currency))
+    if minor != minor.to_integral_value():
+        raise ValueError(
+            f"Amount has more than {currency_exponent(currency)} decimal places "
+            f"for {currency}"
+        )
+    return int(minor)
+
+
+def from_minor(minor: int, currency: str) -> Decimal:
+    """Convert integer minor units back to an exact decimal amount."""
+    return Decimal(minor).scaleb(-currency_exponent(currency))
+
+
+def minor_unit_divisor(currency: ColumnElement) -> ColumnElement:
+    """SQL expression for ``10 ** exponent`` of a currency column."""
+    return case(
+        {code: 10**exponent for code, exponent in CURRENCY_EXPONENTS.items()},
+        value=currency,
+        else_=10**DEFAULT_EXPONENT,
+    )
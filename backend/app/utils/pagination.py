@@ -0,0 +1,49 @@
+"""
+Opaque cursor helpers for keyset pagination.
+"""
+
+import base64
+import binascii
+from datetime import datetime
+from typing import Tuple
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(transaction_date: datetime, transaction_id: int) -> str:
+    """
+    Encode a ``(transaction_date, id)`` keyset position as an opaque cursor.
+
+    Args:
+        transaction_date: Sort key of the last row on the page
+        transaction_id: Primary key of the last row on the page (tie-breaker)
+
+    Returns:
+        str: URL-safe cursor string
+    """
+    raw = f"{transaction_date.isoformat()}|{transaction_id}".encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by :func:`encode_cursor`.
+
+    Args:
+        cursor: Opaque cursor string
+
+    Returns:
+        tuple: (transaction_date, id)
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        date_part, id_part = raw.rsplit("|", 1)
+        return datetime.fromisoformat(date_part), int(id_part)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor}") from e
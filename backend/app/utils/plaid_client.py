@@ -2,13 +2,35 @@
 Plaid API client utility.
 """
 
-from datetime import datetime, timedelta
-from typing import Optional
+import asyncio
+import functools
+import json
+import logging
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
 
 from fastapi import HTTPException
+from plaid import ApiException
 from plaid.api import plaid_api
 from plaid.api_client import ApiClient
 from plaid.configuration import Configuration
+from plaid.model.accounts_get_request import AccountsGetRequest
 from plaid.model.country_code import CountryCode
 from plaid.model.item_public_token_exchange_request import (
     ItemPublicTokenExchangeRequest,
@@ -18,8 +40,49 @@ from plaid.model.link_token_create_request_user import LinkTokenCreateRequestUse
 from plaid.model.products import Products
 from plaid.model.transactions_get_request import TransactionsGetRequest
 from plaid.model.transactions_get_request_options import TransactionsGetRequestOptions
+from plaid.model.transactions_sync_request import TransactionsSyncRequest
+from plaid.model.transactions_sync_request_options import (
+    TransactionsSyncRequestOptions,
+)
+from plaid.model.webhook_verification_key_get_request import (
+    WebhookVerificationKeyGetRequest,
+)
+from plaid.model_utils import ModelSimple, OpenApiModel, model_to_dict
+from urllib3.connection import HTTPConnection
+from urllib3.exceptions import HTTPError as Urllib3Error
+from urllib3.exceptions import MaxRetryError
+from urllib3.exceptions import TimeoutError as Urllib3TimeoutError
 
 from app.config import settings
+from app.utils.cache import TTLCache
+from app.utils.resilience import CircuitBreaker, backoff_delay
+
+logger = logging.getLogger(__name__)
+
+# Page sizes for /transactions/sync and /transactions/get (Plaid's maximums)
+SYNC_PAGE_SIZE = 500
+GET_PAGE_SIZE = 500
+
+# Restarts allowed when the item changes while its update is being paginated
+SYNC_MAX_RESTARTS = 3
+
+# Plaid errors worth retrying: rate limits and outages on Plaid's or the
+# institution's side (5xx and 429 responses are always retried)
+RETRYABLE_ERROR_TYPES = {"RATE_LIMIT_EXCEEDED"}
+RETRYABLE_ERROR_CODES = {
+    "INTERNAL_SERVER_ERROR",
+    "PLANNED_MAINTENANCE",
+    "INSTITUTION_DOWN",
+    "INSTITUTION_NOT_RESPONDING",
+    "INSTITUTION_NOT_AVAILABLE",
+}
+
+# Circuit breaker key for calls not tied to an institution (e.g. Link tokens)
+GLOBAL_BREAKER_KEY = "*"
+
+# Plaid's Link token lifetime, the cache TTL if a response has no expiration
+LINK_TOKEN_LIFETIME = 4 * 60 * 60.0
+LINK_TOKEN_CACHE_MAX_BYTES = 16 * 1024 * 1024
 
 
 class PlaidError(Exception):
@@ -31,30 +94,376 @@ class PlaidError(Exception):
         super().__init__(self.message)
 
 
+_client: Optional[plaid_api.PlaidApi] = None
+_client_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+_page_executor: Optional[ThreadPoolExecutor] = None
+_request_slots: Optional[threading.BoundedSemaphore] = None
+_transactions_cache: Optional[TTLCache[bytes]] = None
+_link_token_cache: Optional[TTLCache[str]] = None
+# In-flight Link token requests by cache key, shared by concurrent callers
+_link_token_requests: Dict[Tuple[str, bool], "asyncio.Future[str]"] = {}
+_breakers: Dict[str, CircuitBreaker] = {}
+# Webhook verification keys (JWKs) by key id; Plaid never changes a key
+_webhook_keys: Dict[str, Dict[str, Any]] = {}
+
+T = TypeVar("T")
+
+
+def request_timeout(deadline: Optional[float] = None) -> Tuple[float, float]:
+    """
+    (connect, read) timeout in seconds passed to every Plaid API call.
+
+    With a ``deadline`` (``time.monotonic()`` value), both are capped by the
+    time left until it.
+    """
+    connect, read = settings.PLAID_CONNECT_TIMEOUT, settings.PLAID_READ_TIMEOUT
+    if deadline is not None:
+        remaining = max(deadline - time.monotonic(), 0.001)
+        connect, read = min(connect, remaining), min(read, remaining)
+    return connect, read
+
+
+def _build_plaid_client() -> plaid_api.PlaidApi:
+    configuration = Configuration(
+        host=settings.PLAID_HOST or f"https://{settings.PLAID_ENV.value}.plaid.com",
+        api_key={
+            "clientId": settings.PLAID_CLIENT_ID,
+            "secret": settings.PLAID_SECRET,
+        },
+    )
+    configuration.connection_pool_maxsize = settings.PLAID_POOL_MAXSIZE
+    if settings.PLAID_TCP_KEEPALIVE:
+        configuration.socket_options = HTTPConnection.default_socket_options + [
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        ]
+    return plaid_api.PlaidApi(ApiClient(configuration))
+
+
 def get_plaid_client() -> plaid_api.PlaidApi:
     """
-    Initialize and return a Plaid API client.
+    Return the process-wide Plaid API client, creating it on first use.
+
+    The client and its urllib3 connection pool are shared by all requests
+    and threads, so connections and TLS sessions to Plaid are reused.
 
     Raises:
         PlaidError: If client initialization fails
     """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                try:
+                    _client = _build_plaid_client()
+                except Exception as e:
+                    raise PlaidError(f"Failed to initialize Plaid client: {str(e)}")
+    return _client
+
+
+def get_plaid_executor() -> ThreadPoolExecutor:
+    """
+    Return the process-wide thread pool that runs blocking Plaid calls.
+
+    Its size (``settings.PLAID_EXECUTOR_WORKERS``) caps how many Plaid
+    calls are in flight at once, independently of the threadpool Starlette
+    uses for sync endpoints and file I/O. Page fetches that calls fan out
+    run on ``get_plaid_page_executor``, and every request takes one of the
+    same number of ``request_slot``s, so Plaid requests in flight never
+    exceed it either.
+    """
+    global _executor
+    if _executor is None:
+        with _client_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.PLAID_EXECUTOR_WORKERS,
+                    thread_name_prefix="plaid",
+                )
+    return _executor
+
+
+def get_plaid_page_executor() -> ThreadPoolExecutor:
+    """
+    Return the process-wide thread pool that fetches pages of paginated calls.
+
+    It is shared by every call, so ``settings.PLAID_PAGE_CONCURRENCY`` bounds
+    the page fetches in flight across all of them. Calls on the Plaid
+    executor wait for their pages here instead of starting threads of their
+    own.
+    """
+    global _page_executor
+    if _page_executor is None:
+        with _client_lock:
+            if _page_executor is None:
+                _page_executor = ThreadPoolExecutor(
+                    max_workers=settings.PLAID_PAGE_CONCURRENCY,
+                    thread_name_prefix="plaid-page",
+                )
+    return _page_executor
+
+
+@contextmanager
+def request_slot(deadline: Optional[float] = None) -> Iterator[None]:
+    """
+    Hold one of the ``settings.PLAID_EXECUTOR_WORKERS`` Plaid request slots.
+
+    Raises:
+        PlaidError: With ``PLAID_TIMEOUT`` if no slot frees up before ``deadline``
+    """
+    global _request_slots
+    if _request_slots is None:
+        with _client_lock:
+            if _request_slots is None:
+                _request_slots = threading.BoundedSemaphore(
+                    settings.PLAID_EXECUTOR_WORKERS
+                )
+    slots = _request_slots
+    timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+    if not slots.acquire(timeout=timeout):
+        raise PlaidError("Timed out waiting for a Plaid request slot", "PLAID_TIMEOUT")
     try:
-        configuration = Configuration(
-            host=f"https://{settings.PLAID_ENV.value}.plaid.com",
-            api_key={
-                "clientId": settings.PLAID_CLIENT_ID,
-                "secret": settings.PLAID_SECRET,
-            },
+        yield
+    finally:
+        slots.release()
+
+
+def close_plaid_client() -> None:
+    """
+    Close the shared Plaid client's connections and thread pools.
+
+    The next use recreates them.
+    """
+    global _client, _executor, _page_executor, _request_slots
+    with _client_lock:
+        client, _client = _client, None
+        executors = (_executor, _page_executor)
+        _executor = _page_executor = _request_slots = None
+    for executor in executors:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+    if client is not None:
+        client.api_client.close()
+        client.api_client.rest_client.pool_manager.clear()
+
+
+def get_transactions_cache() -> TTLCache[bytes]:
+    """
+    Return the process-wide cache of ``GET /plaid/transactions`` bodies.
+
+    Keys are ``(item_id, start_date, end_date)``; values are the serialized
+    JSON responses, so the memory cap counts real bytes.
+    """
+    global _transactions_cache
+    if _transactions_cache is None:
+        with _client_lock:
+            if _transactions_cache is None:
+                _transactions_cache = TTLCache(
+                    ttl=settings.PLAID_TRANSACTIONS_CACHE_TTL,
+                    max_bytes=settings.PLAID_TRANSACTIONS_CACHE_MAX_BYTES,
+                )
+    return _transactions_cache
+
+
+def invalidate_cached_transactions(item_id: str) -> int:
+    """Drop every cached transactions response for ``item_id``."""
+    return get_transactions_cache().invalidate(lambda key: key[0] == item_id)
+
+
+def get_link_token_cache() -> TTLCache[str]:
+    """
+    Return the process-wide cache of Link tokens.
+
+    Keys are ``(user_id, use_redirect)``; each entry expires
+    ``PLAID_LINK_TOKEN_REFRESH_MARGIN`` seconds before its token does.
+    """
+    global _link_token_cache
+    if _link_token_cache is None:
+        with _client_lock:
+            if _link_token_cache is None:
+                _link_token_cache = TTLCache(
+                    ttl=LINK_TOKEN_LIFETIME,
+                    max_bytes=LINK_TOKEN_CACHE_MAX_BYTES,
+                    max_entries=settings.PLAID_LINK_TOKEN_CACHE_SIZE,
+                )
+    return _link_token_cache
+
+
+def reset_plaid_caches() -> None:
+    """Discard the response caches and their counters; next use recreates them."""
+    global _transactions_cache, _link_token_cache
+    with _client_lock:
+        _transactions_cache = _link_token_cache = None
+        _webhook_keys.clear()
+
+
+def get_circuit_breaker(institution_id: Optional[str]) -> CircuitBreaker:
+    """Return the circuit breaker for calls against ``institution_id``."""
+    key = institution_id or GLOBAL_BREAKER_KEY
+    breaker = _breakers.get(key)
+    if breaker is None:
+        with _client_lock:
+            breaker = _breakers.setdefault(
+                key,
+                CircuitBreaker(
+                    threshold=settings.PLAID_BREAKER_THRESHOLD,
+                    reset_timeout=settings.PLAID_BREAKER_RESET_TIMEOUT,
+                ),
+            )
+    return breaker
+
+
+def reset_circuit_breakers() -> None:
+    """Close every circuit; breakers are recreated from settings on next use."""
+    with _client_lock:
+        _breakers.clear()
+
+
+def plaid_error_type(error: ApiException) -> Optional[str]:
+    """Extract Plaid's ``error_type`` from an API error response body."""
+    try:
+        return json.loads(error.body).get("error_type")
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def is_retryable(error: Exception) -> bool:
+    """Whether a failed Plaid call may succeed if simply tried again."""
+    if isinstance(error, ApiException):
+        return (
+            error.status == 429
+            or (error.status or 0) >= 500
+            or plaid_error_type(error) in RETRYABLE_ERROR_TYPES
+            or plaid_error_code(error) in RETRYABLE_ERROR_CODES
+        )
+    # Connection failures and timeouts raised by urllib3
+    return isinstance(error, Urllib3Error)
+
+
+def is_timeout(error: BaseException) -> bool:
+    """Whether ``error`` is, or was raised from, a connect or read timeout."""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if isinstance(error, Urllib3TimeoutError) or (
+            isinstance(error, PlaidError) and error.error_code == "PLAID_TIMEOUT"
+        ):
+            return True
+        if isinstance(error, MaxRetryError) and error.reason is not None:
+            error = error.reason
+        else:
+            error = error.__cause__ or error.__context__
+    return False
+
+
+def call_plaid(
+    send: Callable[[Tuple[float, float]], T],
+    institution_id: Optional[str] = None,
+    deadline: Optional[float] = None,
+) -> T:
+    """
+    Make one Plaid API request with retries, inside a circuit breaker.
+
+    ``send`` performs the request with the (connect, read) timeout it is
+    given. Retryable failures are retried up to ``PLAID_RETRY_ATTEMPTS``
+    times in total, with jittered exponential backoff (at least Plaid's
+    ``Retry-After``), as long as the next attempt can start before
+    ``deadline``. Other errors are raised at once.
+
+    Every call against an institution goes through that institution's
+    breaker: once it opens after repeated failures, calls fail fast
+    instead of adding load to a service that is down.
+
+    Raises:
+        PlaidError: With ``CIRCUIT_OPEN`` if the breaker is open
+        Exception: The last error of the request, once retries are exhausted
+    """
+    breaker = get_circuit_breaker(institution_id)
+    if not breaker.allow():
+        raise PlaidError(
+            f"Plaid calls for {institution_id or 'Plaid'} are failing; "
+            f"retry in {breaker.retry_after():.0f}s",
+            "CIRCUIT_OPEN",
         )
-        api_client = ApiClient(configuration)
-        client = plaid_api.PlaidApi(api_client)
-        return client
+    attempt = 0
+    while True:
+        try:
+            with request_slot(deadline):
+                result = send(request_timeout(deadline))
+        except PlaidError:
+            raise
+        except Exception as e:
+            if not is_retryable(e):
+                breaker.record_success()  # Plaid answered; the request was bad
+                raise
+            delay = backoff_delay(
+                attempt, settings.PLAID_RETRY_BASE_DELAY, settings.PLAID_RETRY_MAX_DELAY
+            )
+            retry_after = getattr(e, "headers", None) and e.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+            attempt += 1
+            if attempt >= settings.PLAID_RETRY_ATTEMPTS or (
+                deadline is not None and time.monotonic() + delay >= deadline
+            ):
+                breaker.record_failure()
+                raise
+            logger.info(
+                "Retrying Plaid request in %.2fs after attempt %d failed: %s",
+                delay,
+                attempt,
+                str(e).split("\n", 1)[0],
+            )
+            time.sleep(delay)
+        else:
+            breaker.record_success()
+            return result
+
+
+async def run_plaid_call(
+    func: Callable[..., T],
+    *args: Any,
+    timeout: Optional[float] = None,
+    **kwargs: Any,
+) -> T:
+    """
+    Run a blocking Plaid call on the Plaid thread pool and await its result.
+
+    The event loop keeps serving other requests meanwhile. ``timeout`` is
+    the caller's time budget in seconds (``settings.PLAID_CALL_TIMEOUT`` by
+    default): it is passed to ``func`` as its ``deadline``, which bounds
+    retries and request timeouts, and the caller gets an error if the call
+    still has not finished when it runs out.
+
+    Raises:
+        PlaidError: If the call fails or times out
+    """
+    timeout = settings.PLAID_CALL_TIMEOUT if timeout is None else timeout
+    deadline = time.monotonic() + timeout
+    call = functools.partial(func, *args, deadline=deadline, **kwargs)
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(get_plaid_executor(), call)
+    timed_out = PlaidError(
+        f"Plaid call {func.__name__} timed out after {timeout:g}s", "PLAID_TIMEOUT"
+    )
+    try:
+        return await asyncio.wait_for(future, timeout)
+    except asyncio.TimeoutError:
+        raise timed_out
     except Exception as e:
-        raise PlaidError(f"Failed to initialize Plaid client: {str(e)}")
+        # The request's read timeout is capped at the deadline too, and may
+        # fire just before wait_for does; other errors keep their own code
+        if is_timeout(e) and time.monotonic() >= deadline:
+            raise timed_out from e
+        raise
 
 
 def create_link_token(
-    client: plaid_api.PlaidApi, user_id: str, use_redirect: bool = False
+    client: plaid_api.PlaidApi,
+    user_id: str,
+    use_redirect: bool = False,
+    *,
+    deadline: Optional[float] = None,
 ) -> str:
     """
     Create a Link token for initializing Plaid Link.
@@ -63,10 +472,29 @@ def create_link_token(
         client: Plaid API client
         user_id: Unique identifier for the user
         use_redirect: Whether to use OAuth redirect
+        deadline: ``time.monotonic()`` by which retries must stop
 
     Returns:
         str: Link token
 
+    Raises:
+        PlaidError: If token creation fails
+    """
+    return create_link_token_with_expiration(
+        client, user_id, use_redirect, deadline=deadline
+    )[0]
+
+
+def create_link_token_with_expiration(
+    client: plaid_api.PlaidApi,
+    user_id: str,
+    use_redirect: bool = False,
+    *,
+    deadline: Optional[float] = None,
+) -> Tuple[str, Any]:
+    """
+    ``create_link_token``, also returning the token's ``expiration``.
+
     Raises:
         PlaidError: If token creation fails
     """
@@ -81,16 +509,27 @@ def create_link_token(
 
         if use_redirect:
             request_args["redirect_uri"] = settings.PLAID_REDIRECT_URI
+        if settings.PLAID_WEBHOOK_URL:
+            request_args["webhook"] = settings.PLAID_WEBHOOK_URL
 
         request = LinkTokenCreateRequest(**request_args)
-        response = client.link_token_create(request)
-        return response.link_token
+        response = call_plaid(
+            lambda timeout: client.link_token_create(request, _request_timeout=timeout),
+            deadline=deadline,
+        )
+        return response.link_token, getattr(response, "expiration", None)
+    except PlaidError:
+        raise
     except Exception as e:
         raise PlaidError(f"Failed to create link token: {str(e)}")
 
 
 def exchange_public_token(
-    client: plaid_api.PlaidApi, public_token: str
+    client: plaid_api.PlaidApi,
+    public_token: str,
+    *,
+    institution_id: Optional[str] = None,
+    deadline: Optional[float] = None,
 ) -> tuple[str, str]:
     """
     Exchange a public token for an access token.
@@ -98,6 +537,8 @@ def exchange_public_token(
     Args:
         client: Plaid API client
         public_token: Public token from Plaid Link
+        institution_id: Institution being linked, for its circuit breaker
+        deadline: ``time.monotonic()`` by which retries must stop
 
     Returns:
         tuple: (access_token, item_id)
@@ -107,26 +548,124 @@ def exchange_public_token(
     """
     try:
         request = ItemPublicTokenExchangeRequest(public_token=public_token)
-        response = client.item_public_token_exchange(request)
+        response = call_plaid(
+            lambda timeout: client.item_public_token_exchange(
+                request, _request_timeout=timeout
+            ),
+            institution_id,
+            deadline,
+        )
         return response.access_token, response.item_id
+    except PlaidError:
+        raise
     except Exception as e:
         raise PlaidError(f"Failed to exchange public token: {str(e)}")
 
 
+def get_accounts(
+    client: plaid_api.PlaidApi,
+    access_token: str,
+    *,
+    institution_id: Optional[str] = None,
+    deadline: Optional[float] = None,
+) -> list:
+    """
+    Retrieve an item's accounts with the balances Plaid last cached.
+
+    Args:
+        client: Plaid API client
+        access_token: Plaid access token for the item
+        institution_id: Institution of the item, for its circuit breaker
+        deadline: ``time.monotonic()`` by which retries must stop
+
+    Returns:
+        list: Plaid accounts, each with its ``balances``
+
+    Raises:
+        PlaidError: If the accounts cannot be retrieved
+    """
+    try:
+        request = AccountsGetRequest(access_token=access_token)
+        response = call_plaid(
+            lambda timeout: client.accounts_get(request, _request_timeout=timeout),
+            institution_id,
+            deadline,
+        )
+        return response.accounts
+    except PlaidError:
+        raise
+    except Exception as e:
+        raise PlaidError(f"Failed to retrieve accounts: {str(e)}")
+
+
+def get_webhook_verification_key(
+    client: plaid_api.PlaidApi,
+    key_id: str,
+    *,
+    deadline: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Retrieve the public key Plaid signs webhooks with, as a JWK dict.
+
+    Keys are cached by id, so only the first webhook signed with a key
+    costs a Plaid call.
+
+    Args:
+        client: Plaid API client
+        key_id: ``kid`` from the header of the webhook's JWT
+        deadline: ``time.monotonic()`` by which retries must stop
+
+    Raises:
+        PlaidError: If the key cannot be retrieved; Plaid's error code is kept
+    """
+    key = _webhook_keys.get(key_id)
+    if key is not None:
+        return key
+    try:
+        request = WebhookVerificationKeyGetRequest(key_id=key_id)
+        response = call_plaid(
+            lambda timeout: client.webhook_verification_key_get(
+                request, _request_timeout=timeout
+            ),
+            None,
+            deadline,
+        )
+    except PlaidError:
+        raise
+    except ApiException as e:
+        raise PlaidError(
+            f"Failed to retrieve webhook verification key: {str(e)}",
+            plaid_error_code(e),
+        )
+    except Exception as e:
+        raise PlaidError(f"Failed to retrieve webhook verification key: {str(e)}")
+    key = _webhook_keys[key_id] = _plain(response.key)
+    return key
+
+
 def get_transactions(
     client: plaid_api.PlaidApi,
     access_token: str,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
+    *,
+    institution_id: Optional[str] = None,
+    deadline: Optional[float] = None,
 ) -> dict:
     """
-    Retrieve transactions for a connected account.
+    Retrieve every transaction in a date range for a connected account.
+
+    The first page reports ``total_transactions``; the remaining offset
+    pages are then fetched concurrently on the shared page executor, with
+    the pooled client, and merged back in offset order.
 
     Args:
         client: Plaid API client
         access_token: Plaid access token for the account
         start_date: Start date for transactions (defaults to 30 days ago)
         end_date: End date for transactions (defaults to today)
+        institution_id: Institution of the item, for its circuit breaker
+        deadline: ``time.monotonic()`` by which retries must stop
 
     Returns:
         dict: Transaction data
@@ -138,22 +677,171 @@ def get_transactions(
         start_date = start_date or (datetime.now() - timedelta(days=30))
         end_date = end_date or datetime.now()
 
-        request = TransactionsGetRequest(
-            access_token=access_token,
-            start_date=start_date.date(),
-            end_date=end_date.date(),
-            options=TransactionsGetRequestOptions(
-                include_personal_finance_category=True
-            ),
-        )
-        response = client.transactions_get(request)
-        return {"accounts": response.accounts, "transactions": response.transactions}
+        def fetch_page(offset: int):
+            request = TransactionsGetRequest(
+                access_token=access_token,
+                start_date=start_date.date(),
+                end_date=end_date.date(),
+                options=TransactionsGetRequestOptions(
+                    include_personal_finance_category=True,
+                    count=GET_PAGE_SIZE,
+                    offset=offset,
+                ),
+            )
+            return call_plaid(
+                lambda timeout: client.transactions_get(
+                    request, _request_timeout=timeout
+                ),
+                institution_id,
+                deadline,
+            )
+
+        first = fetch_page(0)
+        transactions = list(first.transactions)
+        offsets = range(len(transactions), first.total_transactions, GET_PAGE_SIZE)
+        if transactions and offsets:
+            for page in get_plaid_page_executor().map(fetch_page, offsets):
+                transactions.extend(page.transactions)
+
+        # Offsets can shift if the item changes mid-pagination; keep first copies
+        seen = set()
+        unique = []
+        for transaction in transactions:
+            if transaction.transaction_id not in seen:
+                seen.add(transaction.transaction_id)
+                unique.append(transaction)
+        return {"accounts": first.accounts, "transactions": unique}
+    except PlaidError:
+        raise
     except Exception as e:
         raise PlaidError(f"Failed to retrieve transactions: {str(e)}")
 
 
+def _plain(value: Any) -> Any:
+    """``value`` as plain data for a JSON encoder (dates are left as is)."""
+    if isinstance(value, ModelSimple):
+        return value.value
+    if isinstance(value, OpenApiModel):
+        return model_to_dict(value, serialize=False)
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    return value
+
+
+def project_plaid_models(
+    models: Iterable[OpenApiModel], fields: Sequence[str]
+) -> List[Dict[str, Any]]:
+    """
+    Reduce Plaid model objects to dicts of ``fields``, in one pass.
+
+    Only the named attributes are read and converted, so the cost follows
+    the projection rather than the model's full (nested) schema. Missing
+    attributes come back as None.
+    """
+    return [{name: _plain(model.get(name)) for name in fields} for model in models]
+
+
+def plaid_error_code(error: ApiException) -> Optional[str]:
+    """Extract Plaid's ``error_code`` from an API error response body."""
+    try:
+        return json.loads(error.body).get("error_code")
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def sync_transactions(
+    client: plaid_api.PlaidApi,
+    access_token: str,
+    cursor: Optional[str] = None,
+    *,
+    institution_id: Optional[str] = None,
+    deadline: Optional[float] = None,
+) -> dict:
+    """
+    Fetch every transaction change since ``cursor`` via /transactions/sync.
+
+    Follows ``has_more`` until the update is complete. If Plaid reports the
+    item changed mid-pagination, the whole update is restarted from
+    ``cursor`` as Plaid requires.
+
+    Args:
+        client: Plaid API client
+        access_token: Plaid access token for the item
+        cursor: Cursor returned by the previous sync, or None for full history
+        institution_id: Institution of the item, for its circuit breaker
+        deadline: ``time.monotonic()`` by which retries must stop
+
+    Returns:
+        dict: ``added``, ``modified`` and ``removed`` transactions and the
+        ``next_cursor`` to store for the next sync
+
+    Raises:
+        PlaidError: If the sync fails
+    """
+    for _ in range(SYNC_MAX_RESTARTS + 1):
+        added, modified, removed = [], [], []
+        next_cursor = cursor
+        try:
+            while True:
+                request_args = {
+                    "access_token": access_token,
+                    "count": SYNC_PAGE_SIZE,
+                    "options": TransactionsSyncRequestOptions(
+                        include_personal_finance_category=True
+                    ),
+                }
+                if next_cursor:
+                    request_args["cursor"] = next_cursor
+                request = TransactionsSyncRequest(**request_args)
+                response = call_plaid(
+                    lambda timeout: client.transactions_sync(
+                        request, _request_timeout=timeout
+                    ),
+                    institution_id,
+                    deadline,
+                )
+                added.extend(response.added)
+                modified.extend(response.modified)
+                removed.extend(response.removed)
+                next_cursor = response.next_cursor
+                if not response.has_more:
+                    return {
+                        "added": added,
+                        "modified": modified,
+                        "removed": removed,
+                        "next_cursor": next_cursor,
+                    }
+        except PlaidError:
+            raise
+        except ApiException as e:
+            error_code = plaid_error_code(e)
+            if error_code != "TRANSACTIONS_SYNC_MUTATION_DURING_PAGINATION":
+                raise PlaidError(f"Failed to sync transactions: {str(e)}", error_code)
+        except Exception as e:
+            raise PlaidError(f"Failed to sync transactions: {str(e)}")
+    raise PlaidError(
+        "Failed to sync transactions: item kept changing during pagination",
+        "TRANSACTIONS_SYNC_MUTATION_DURING_PAGINATION",
+    )
+
+
 def handle_plaid_error(error: Exception) -> HTTPException:
     """Convert Plaid errors to FastAPI HTTP exceptions."""
+    if isinstance(error, PlaidError) and error.error_code == "PLAID_TIMEOUT":
+        return HTTPException(
+            status_code=504,
+            detail={"message": error.message, "error_code": error.error_code},
+        )
+    if isinstance(error, PlaidError) and error.error_code == "CIRCUIT_OPEN":
+        return HTTPException(
+            status_code=503,
+            detail={"message": error.message, "error_code": error.error_code},
+        )
+    if isinstance(error, PlaidError) and error.error_code == "INVALID_WEBHOOK":
+        return HTTPException(
+            status_code=401,
+            detail={"message": error.message, "error_code": error.error_code},
+        )
     if isinstance(error, PlaidError):
         return HTTPException(
             status_code=400,
@@ -163,3 +851,164 @@ def handle_plaid_error(error: Exception) -> HTTPException:
         status_code=500,
         detail={"message": "Internal server error", "error": str(error)},
     )
+
+
+# Async facade: the calls above, run on the Plaid thread pool. ``timeout`` is
+# the calling route's time budget in seconds.
+
+
+async def create_link_token_async(
+    client: plaid_api.PlaidApi,
+    user_id: str,
+    use_redirect: bool = False,
+    *,
+    timeout: Optional[float] = None,
+) -> str:
+    """Awaitable ``create_link_token``."""
+    return await run_plaid_call(
+        create_link_token, client, user_id, use_redirect, timeout=timeout
+    )
+
+
+def link_token_ttl(expiration: Any) -> float:
+    """Seconds a Link token expiring at ``expiration`` may still be handed out."""
+    if not expiration:
+        return LINK_TOKEN_LIFETIME - settings.PLAID_LINK_TOKEN_REFRESH_MARGIN
+    if isinstance(expiration, str):
+        expiration = datetime.fromisoformat(expiration.replace("Z", "+00:00"))
+    if expiration.tzinfo is None:
+        expiration = expiration.replace(tzinfo=timezone.utc)
+    remaining = (expiration - datetime.now(timezone.utc)).total_seconds()
+    return remaining - settings.PLAID_LINK_TOKEN_REFRESH_MARGIN
+
+
+async def get_link_token(
+    client: plaid_api.PlaidApi,
+    user_id: str,
+    use_redirect: bool = False,
+    *,
+    timeout: Optional[float] = None,
+) -> str:
+    """
+    Link token for ``(user_id, use_redirect)``, reused until near expiry.
+
+    Concurrent callers for the same key share one upstream request; a
+    failed request is not cached and reaches every caller waiting on it.
+
+    Raises:
+        PlaidError: If token creation fails
+    """
+    key = (user_id, use_redirect)
+    cache = get_link_token_cache()
+    token = cache.get(key)
+    if token is not None:
+        return token
+
+    loop = asyncio.get_running_loop()
+    request = _link_token_requests.get(key)
+    if request is None or request.get_loop() is not loop:
+
+        async def create() -> str:
+            token, expiration = await run_plaid_call(
+                create_link_token_with_expiration,
+                client,
+                user_id,
+                use_redirect,
+                timeout=timeout,
+            )
+            cache.set(key, token, ttl=link_token_ttl(expiration))
+            return token
+
+        request = _link_token_requests[key] = loop.create_task(create())
+        request.add_done_callback(
+            lambda done: _link_token_requests.get(key) is done
+            and _link_token_requests.pop(key)
+        )
+    # A caller that gives up does not cancel the request the others await
+    return await asyncio.shield(request)
+
+
+async def exchange_public_token_async(
+    client: plaid_api.PlaidApi,
+    public_token: str,
+    *,
+    institution_id: Optional[str] = None,
+    timeout: Optional[float] = None,
+) -> tuple[str, str]:
+    """Awaitable ``exchange_public_token``."""
+    return await run_plaid_call(
+        exchange_public_token,
+        client,
+        public_token,
+        institution_id=institution_id,
+        timeout=timeout,
+    )
+
+
+async def get_transactions_async(
+    client: plaid_api.PlaidApi,
+    access_token: str,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    *,
+    institution_id: Optional[str] = None,
+    timeout: Optional[float] = None,
+) -> dict:
+    """Awaitable ``get_transactions``; may take several round trips."""
+    return await run_plaid_call(
+        get_transactions,
+        client,
+        access_token,
+        start_date,
+        end_date,
+        institution_id=institution_id,
+        timeout=timeout or settings.PLAID_PAGINATED_CALL_TIMEOUT,
+    )
+
+
+async def sync_transactions_async(
+    client: plaid_api.PlaidApi,
+    access_token: str,
+    cursor: Optional[str] = None,
+    *,
+    institution_id: Optional[str] = None,
+    timeout: Optional[float] = None,
+) -> dict:
+    """Awaitable ``sync_transactions``; may take several round trips."""
+    return await run_plaid_call(
+        sync_transactions,
+        client,
+        access_token,
+        cursor,
+        institution_id=institution_id,
+        timeout=timeout or settings.PLAID_PAGINATED_CALL_TIMEOUT,
+    )
+
+
+async def get_accounts_async(
+    client: plaid_api.PlaidApi,
+    access_token: str,
+    *,
+    institution_id: Optional[str] = None,
+    timeout: Optional[float] = None,
+) -> list:
+    """Awaitable ``get_accounts``."""
+    return await run_plaid_call(
+        get_accounts,
+        client,
+        access_token,
+        institution_id=institution_id,
+        timeout=timeout,
+    )
+
+
+async def get_webhook_verification_key_async(
+    client: plaid_api.PlaidApi,
+    key_id: str,
+    *,
+    timeout: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Awaitable ``get_webhook_verification_key``."""
+    return await run_plaid_call(
+        get_webhook_verification_key, client, key_id, timeout=timeout
+    )
@@ -0,0 +1,112 @@
+"""
+Verification of the ``Plaid-Verification`` header Plaid signs webhooks with.
+
+The header is an ES256 JWT whose ``kid`` names a key fetched from
+/webhook_verification_key/get. Its payload carries the time it was issued
+and the SHA-256 of the request body, so a valid header also proves the body
+is unchanged and the delivery recent.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import time
+from typing import Any, Dict, Optional
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.asymmetric.utils import encode_dss_signature
+from plaid.api import plaid_api
+
+from app.config import settings
+from app.utils.plaid_client import PlaidError, get_webhook_verification_key_async
+
+# Errors of our own while fetching a key; any other code means a bad key id
+_UNAVAILABLE_ERROR_CODES = {None, "PLAID_TIMEOUT", "CIRCUIT_OPEN"}
+
+
+def _b64decode(segment: str) -> bytes:
+    """Decode unpadded base64url, as used by JWTs and JWKs."""
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def _public_key(jwk: Dict[str, Any]) -> ec.EllipticCurvePublicKey:
+    """The P-256 public key of an EC ``jwk``."""
+    if jwk.get("kty") != "EC" or jwk.get("crv") != "P-256":
+        raise ValueError(f"Unsupported key {jwk.get('kty')}/{jwk.get('crv')}")
+    return ec.EllipticCurvePublicNumbers(
+        int.from_bytes(_b64decode(jwk["x"]), "big"),
+        int.from_bytes(_b64decode(jwk["y"]), "big"),
+        ec.SECP256R1(),
+    ).public_key()
+
+
+def _invalid(reason: str) -> PlaidError:
+    return PlaidError(f"Invalid Plaid webhook: {reason}", "INVALID_WEBHOOK")
+
+
+async def verify_webhook(
+    client: plaid_api.PlaidApi, body: bytes, signed_jwt: Optional[str]
+) -> None:
+    """
+    Check that ``body`` was sent by Plaid, within ``PLAID_WEBHOOK_MAX_AGE``.
+
+    Args:
+        client: Plaid API client, to fetch the signing key
+        body: Raw request body
+        signed_jwt: Value of the ``Plaid-Verification`` header
+
+    Raises:
+        PlaidError: With ``INVALID_WEBHOOK`` if the header is missing or does
+            not match the body; other codes if the key could not be fetched
+    """
+    if not signed_jwt:
+        raise _invalid("missing Plaid-Verification header")
+    try:
+        header_segment, payload_segment, signature_segment = signed_jwt.split(".")
+        header = json.loads(_b64decode(header_segment))
+        payload = json.loads(_b64decode(payload_segment))
+        signature = _b64decode(signature_segment)
+    except ValueError:
+        raise _invalid("malformed Plaid-Verification header")
+    if not isinstance(header, dict) or not isinstance(payload, dict):
+        raise _invalid("malformed Plaid-Verification header")
+    if header.get("alg") != "ES256" or not isinstance(header.get("kid"), str):
+        raise _invalid("unexpected signing algorithm")
+
+    try:
+        jwk = await get_webhook_verification_key_async(client, header["kid"])
+    except PlaidError as e:
+        if e.error_code in _UNAVAILABLE_ERROR_CODES:
+            raise
+        raise _invalid("unknown signing key")
+    if jwk.get("expired_at") is not None:
+        raise _invalid("expired signing key")
+
+    if len(signature) != 64:
+        raise _invalid("bad signature")
+    try:
+        _public_key(jwk).verify(
+            encode_dss_signature(
+                int.from_bytes(signature[:32], "big"),
+                int.from_bytes(signature[32:], "big"),
+            ),
+            f"{header_segment}.{payload_segment}".encode(),
+            ec.ECDSA(hashes.SHA256()),
+        )
+    except (InvalidSignature, KeyError, ValueError):
+        raise _invalid("bad signature")
+
+    issued_at = payload.get("iat")
+    if (
+        not isinstance(issued_at, (int, float))
+        or time.time() - issued_at > settings.PLAID_WEBHOOK_MAX_AGE
+    ):
+        raise _invalid("stale signature")
+    if not hmac.compare_digest(
+        str(payload.get("request_body_sha256", "")),
+        hashlib.sha256(body).hexdigest(),
+    ):
+        raise _invalid("body does not match signature")
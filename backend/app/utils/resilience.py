@@ -0,0 +1,84 @@
+"""
+Retry backoff and circuit breaking for calls to external services.
+"""
+
+import random
+import threading
+import time
+from enum import Enum
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """
+    Seconds to wait before retry number ``attempt`` (0-based).
+
+    Exponential backoff with full jitter: a uniform draw from
+    ``[0, min(cap, base * 2**attempt)]``, so clients that failed together do
+    not retry in lockstep.
+    """
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"  # Calls flow normally
+    OPEN = "open"  # Calls fail fast
+    HALF_OPEN = "half_open"  # One trial call decides whether to close again
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker for one downstream dependency.
+
+    Opens after ``threshold`` consecutive failures. After ``reset_timeout``
+    seconds it lets a single trial call through; its success closes the
+    circuit and its failure opens it for another ``reset_timeout``.
+    """
+
+    def __init__(self, threshold: int, reset_timeout: float):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            return self._state
+
+    def retry_after(self) -> float:
+        """Seconds until an open circuit lets a trial call through."""
+        with self._lock:
+            if self._state is not CircuitState.OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        """Whether a call may be attempted now."""
+        with self._lock:
+            if self._state is CircuitState.CLOSED:
+                return True
+            if (
+                self._state is CircuitState.OPEN
+                and time.monotonic() >= self._opened_at + self.reset_timeout
+            ):
+                self._state = CircuitState.HALF_OPEN
+                return True
+            # Half-open: the trial call is already in flight
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CircuitState.CLOSED
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if (
+                self._state is CircuitState.HALF_OPEN
+                or self._failures >= self.threshold
+            ):
+                self._state = CircuitState.OPEN
+                self._opened_at = time.monotonic()
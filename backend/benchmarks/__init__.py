@@ -0,0 +1,6 @@
+"""
+Standalone performance benchmarks.
+
+Run a benchmark from the backend directory, e.g.
+``python -m benchmarks.bench_pagination``.
+"""
@@ -0,0 +1,140 @@
+"""
+Latency of concurrent transaction listings: blocking Session vs AsyncSession.
+
+Fires N parallel ``GET /transactions`` requests (deep offset pages, so each
+query does real work) at two ASGI apps sharing one seeded SQLite file:
+
+* ``blocking`` - an ``async def`` handler calling a synchronous ``Session``,
+  i.e. the v1 routes before the async port;
+* ``async`` - the real v1 route on ``AsyncSession`` + aiosqlite.
+
+Usage:
+    python -m benchmarks.bench_async_db [--requests 200] [--rows 100000]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import tempfile
+import time
+from typing import List
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.crud.transaction import transaction_list_query
+from app.database import Base, get_async_db
+from app.main import app as async_app
+from app.schemas.transaction import Transaction
+from benchmarks.bench_pagination import seed
+
+
+def build_blocking_app(session_factory: sessionmaker) -> FastAPI:
+    """An app whose handler blocks the event loop on a synchronous query."""
+    blocking_app = FastAPI()
+
+    def get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @blocking_app.get("/api/v1/transactions/")
+    async def list_transactions(
+        skip: int = 0, limit: int = 100, db: Session = Depends(get_db)
+    ):
+        rows = db.scalars(transaction_list_query(skip=skip, limit=limit)).all()
+        return [Transaction.model_validate(t) for t in rows]
+
+    return blocking_app
+
+
+async def fire(app: FastAPI, requests: int, max_skip: int) -> List[float]:
+    """Send ``requests`` concurrent list calls; return per-request latency in ms."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+
+        async def one(i: int) -> float:
+            started = time.perf_counter()
+            response = await client.get(
+                "/api/v1/transactions/",
+                params={"skip": (i * 7919) % max_skip, "limit": 100},
+            )
+            response.raise_for_status()
+            return (time.perf_counter() - started) * 1000
+
+        return await asyncio.gather(*(one(i) for i in range(requests)))
+
+
+def report(name: str, latencies: List[float], wall: float) -> None:
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"{name:>9}: p50 {statistics.median(ordered):8.1f} ms  "
+        f"p99 {p99:8.1f} ms  wall {wall * 1000:8.1f} ms"
+    )
+
+
+def main() -> None:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        # NullPool: the blocking handlers would otherwise exhaust the pool
+        # while their session teardowns wait behind them on the event loop
+        engine = create_engine(
+            f"sqlite:///{path}",
+            connect_args={"check_same_thread": False},
+            poolclass=NullPool,
+        )
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(bind=engine, autoflush=False)
+        with session_factory() as session:
+            print(f"Seeding {args.rows:,} transactions...")
+            seed(session, args.rows)
+
+        asyncio.run(compare(path, session_factory, args.requests, args.rows))
+        engine.dispose()
+
+
+async def compare(
+    path: str, session_factory: sessionmaker, requests: int, rows: int
+) -> None:
+    """Run both apps on one event loop against the seeded database."""
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async_factory = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with async_factory() as db:
+            yield db
+
+    async_app.dependency_overrides[get_async_db] = override_get_async_db
+    max_skip = max(1, rows - 100)
+    try:
+        for name, target in (
+            ("blocking", build_blocking_app(session_factory)),
+            ("async", async_app),
+        ):
+            started = time.perf_counter()
+            latencies = await fire(target, requests, max_skip)
+            report(name, latencies, time.perf_counter() - started)
+    finally:
+        async_app.dependency_overrides.clear()
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
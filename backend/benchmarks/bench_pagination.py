@@ -0,0 +1,128 @@
+"""
+Compare offset and keyset (cursor) pagination of transactions.
+
+Seeds a temporary SQLite database and times fetching page 1 and page
+10,000 in both modes using ``app.crud.transaction.transaction_list_query``.
+
+Usage:
+    python -m benchmarks.bench_pagination [--page-size 10] [--repeat 20]
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import sessionmaker
+
+from app.crud.transaction import transaction_list_query
+from app.database import Base
+from app.models.plaid import PlaidAccount, PlaidItem
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.schemas.enums import TransactionStatusEnum, TransactionTypeEnum
+
+TARGET_PAGE = 10_000
+
+
+def seed(session, total_rows: int) -> None:
+    """Insert one user/item/account and ``total_rows`` transactions."""
+    session.add(User(id=1, email="bench@example.com", hashed_password="x"))
+    session.add(PlaidItem(id=1, item_id="item", access_token="token"))
+    session.add(PlaidAccount(id=1, plaid_item_id=1, account_id="acct", name="Bench"))
+    session.flush()
+
+    start = datetime(2015, 1, 1)
+    batch = []
+    for i in range(total_rows):
+        when = start + timedelta(minutes=i * 7)
+        batch.append(
+            {
+                "user_id": 1,
+                "plaid_item_id": 1,
+                "plaid_account_id": 1,
+                "amount_minor": (i % 500) * 100,
+                "currency": "USD",
+                "type": TransactionTypeEnum.EXPENSE,
+                "category": "bench",
+                "status": TransactionStatusEnum.POSTED,
+                "transaction_date": when,
+                "posted_date": when,
+            }
+        )
+        if len(batch) == 10_000:
+            session.execute(insert(Transaction), batch)
+            batch = []
+    if batch:
+        session.execute(insert(Transaction), batch)
+    session.commit()
+
+
+def list_transactions(session, **kwargs):
+    """Run one page of the listing query on a synchronous session."""
+    return session.scalars(transaction_list_query(**kwargs)).all()
+
+
+def time_call(fn, repeat: int) -> float:
+    """Return the median wall time of ``fn`` in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    total_rows = args.page_size * TARGET_PAGE
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        session = sessionmaker(bind=engine)()
+
+        print(f"Seeding {total_rows:,} transactions...")
+        seed(session, total_rows)
+
+        deep_skip = (TARGET_PAGE - 1) * args.page_size
+        boundary = list_transactions(session, skip=deep_skip - 1, limit=1)[0]
+        deep_after = (boundary.transaction_date, boundary.id)
+        session.expunge_all()
+
+        plan = session.execute(
+            text(
+                "EXPLAIN QUERY PLAN SELECT id FROM transactions "
+                "WHERE (transaction_date, id) > (:d, :i) "
+                "ORDER BY transaction_date, id LIMIT :n"
+            ),
+            {"d": deep_after[0], "i": deep_after[1], "n": args.page_size},
+        ).fetchall()
+        print("Cursor query plan:", "; ".join(row[-1] for row in plan))
+
+        cases = {
+            "offset page 1": lambda: list_transactions(session, limit=args.page_size),
+            f"offset page {TARGET_PAGE:,}": lambda: list_transactions(
+                session, skip=deep_skip, limit=args.page_size
+            ),
+            "cursor page 1": lambda: list_transactions(session, limit=args.page_size),
+            f"cursor page {TARGET_PAGE:,}": lambda: list_transactions(
+                session, after=deep_after, limit=args.page_size
+            ),
+        }
+        for name, fn in cases.items():
+            elapsed = time_call(lambda: (fn(), session.expunge_all()), args.repeat)
+            print(f"{name:>20}: {elapsed:8.3f} ms")
+
+        session.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Throughput of personality profile create and read, and its storage size.
+
+Compares two encodings of the four encrypted traits:
+
+* ``per-trait`` - one Fernet token per trait, base64-encoded again, in four
+  columns, i.e. ``PersonalityProfile`` before the traits were packed;
+* ``packed`` - all traits as JSON in one Fernet token (``encrypted_traits``),
+  as the model stores them now.
+
+``crypto`` times only building and reading back the encrypted values;
+``orm`` runs the current model end to end against a temporary SQLite file
+(insert and commit in batches, then select and decrypt every profile).
+
+Usage:
+    python -m benchmarks.bench_personality [--profiles 5000]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core.security import decrypt_data, encrypt_data
+from app.database import Base
+from app.models import PersonalityProfile, User
+from app.models.personality import PERSONALITY_TRAITS
+
+BATCH_SIZE = 500
+
+
+def make_traits(count: int) -> List[Dict[str, str]]:
+    return [
+        {trait: "abc"[(i + n) % 3] for n, trait in enumerate(PERSONALITY_TRAITS)}
+        for i in range(count)
+    ]
+
+
+def per_second(count: int, func: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    func()
+    return count / (time.perf_counter() - started)
+
+
+def bench_crypto(traits: List[Dict[str, str]]) -> None:
+    count = len(traits)
+
+    per_trait = [{t: encrypt_data(data[t]) for t in data} for data in traits]
+    packed = []
+    for data in traits:
+        profile = PersonalityProfile()
+        profile.set_personality_data(data)
+        packed.append(profile)
+
+    variants = (
+        (
+            "per-trait",
+            lambda: [{t: encrypt_data(data[t]) for t in data} for data in traits],
+            lambda: [{t: decrypt_data(row[t]) for t in row} for row in per_trait],
+            sum(len(v) for v in per_trait[0].values()),
+        ),
+        (
+            "packed",
+            lambda: [PersonalityProfile().set_personality_data(d) for d in traits],
+            lambda: [profile.get_personality_data() for profile in packed],
+            len(packed[0].encrypted_traits),
+        ),
+    )
+    print(f"crypto, {count:,} profiles")
+    for name, create, read, size in variants:
+        print(
+            f"  {name:<10} create {per_second(count, create):9,.0f}/s  "
+            f"read {per_second(count, read):9,.0f}/s  {size:4d} bytes/profile"
+        )
+
+
+def bench_orm(traits: List[Dict[str, str]]) -> None:
+    count = len(traits)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        with Session(engine) as db:
+            db.add_all(
+                User(id=i + 1, email=f"user{i}@example.com", hashed_password="x")
+                for i in range(count)
+            )
+            db.commit()
+
+        def create() -> None:
+            with Session(engine) as db:
+                for start in range(0, count, BATCH_SIZE):
+                    for i, data in enumerate(traits[start : start + BATCH_SIZE]):
+                        profile = PersonalityProfile(user_id=start + i + 1)
+                        profile.set_personality_data(data)
+                        db.add(profile)
+                    db.commit()
+
+        def read() -> None:
+            with Session(engine) as db:
+                for profile in db.query(PersonalityProfile):
+                    profile.get_personality_data()
+
+        print(f"orm, {count:,} profiles")
+        print(
+            f"  {'packed':<10} create {per_second(count, create):9,.0f}/s  "
+            f"read {per_second(count, read):9,.0f}/s"
+        )
+        engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--profiles", type=int, default=5000)
+    args = parser.parse_args()
+
+    traits = make_traits(args.profiles)
+    bench_crypto(traits)
+    bench_orm(traits)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Per-call latency of Plaid requests: new client per call vs shared pooled client.
+
+Runs ``create_link_token`` against a local fake Plaid server (see
+``tests/fake_plaid.py``):
+
+* ``per-call`` - a fresh ``Configuration``/``ApiClient``/``PlaidApi`` for
+  every call, i.e. ``get_plaid_client()`` before it was shared, so every
+  call opens a new connection;
+* ``shared`` - the process-wide client, reusing pooled connections.
+
+The fake server is plain HTTP on loopback, so ``--handshake-ms`` adds a
+delay per new connection to stand in for the TCP + TLS handshake with the
+real API (typically tens of milliseconds).
+
+Usage:
+    python -m benchmarks.bench_plaid_client [--calls 200] [--threads 8] \
+        [--handshake-ms 0]
+"""
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+
+from app.config import settings
+from app.utils import plaid_client
+from tests.fake_plaid import FakePlaidServer
+
+
+def measure(calls: int, threads: int, make_client: Callable) -> List[float]:
+    """Issue ``calls`` link-token requests; return per-call latency in ms."""
+
+    def one(i: int) -> float:
+        started = time.perf_counter()
+        plaid_client.create_link_token(make_client(), f"bench_user_{i}")
+        return (time.perf_counter() - started) * 1000
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return list(pool.map(one, range(calls)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--handshake-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    variants = (
+        ("per-call", plaid_client._build_plaid_client),
+        ("shared", plaid_client.get_plaid_client),
+    )
+    for name, make_client in variants:
+        with FakePlaidServer(handshake_delay=args.handshake_ms / 1000) as server:
+            settings.PLAID_HOST = server.url
+            plaid_client.close_plaid_client()
+            latencies = sorted(measure(args.calls, args.threads, make_client))
+            plaid_client.close_plaid_client()
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        print(
+            f"{name:>8}: mean {statistics.mean(latencies):7.2f} ms  "
+            f"p50 {statistics.median(latencies):7.2f} ms  p99 {p99:7.2f} ms  "
+            f"connections {server.connections}"
+        )
+
+
+if __name__ == "__main__":
+    main()
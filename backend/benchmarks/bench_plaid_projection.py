@@ -0,0 +1,159 @@
+"""
+Payload size and conversion cost of ``GET /plaid/transactions`` bodies.
+
+Fetches realistic transactions (location, payment_meta, counterparties)
+from a local fake Plaid server (see ``tests/fake_plaid.py``) once, then
+times turning the plaid-python models into a JSON body:
+
+* ``full`` - every attribute via ``to_dict()``, i.e. the whole model as
+  the endpoint shipped it before projection;
+* ``default`` - ``DEFAULT_PLAID_TRANSACTION_FIELDS``, the endpoint's
+  compact default;
+* ``minimal`` - ``fields=transaction_id,amount,date``.
+
+Usage:
+    python -m benchmarks.bench_plaid_projection [--repeat 20]
+"""
+
+import argparse
+import gzip
+import time
+from typing import Any, Callable, Dict, List
+
+from fastapi.responses import ORJSONResponse
+
+from app.config import settings
+from app.schemas.plaid import DEFAULT_PLAID_TRANSACTION_FIELDS
+from app.utils import plaid_client
+from tests.fake_plaid import FakePlaidServer, FakeTransactionsGet, plaid_transaction
+
+ROW_COUNTS = (100, 2_000)
+MINIMAL_FIELDS = ("transaction_id", "amount", "date")
+
+
+def rich_transaction(i: int) -> Dict[str, Any]:
+    """A card purchase with the nested details Plaid typically returns."""
+    return plaid_transaction(
+        f"txn_{i:06d}",
+        "acc_checking",
+        round(3 + (i % 500) * 1.37, 2),
+        f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}",
+        authorized_date=f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}",
+        merchant_name=f"Merchant {i % 37}",
+        merchant_entity_id=f"ent_{i % 37:04d}",
+        logo_url=f"https://plaid-merchant-logos.plaid.com/merchant_{i % 37}.png",
+        website=f"merchant{i % 37}.example.com",
+        category=["Food and Drink", "Restaurants", "Coffee Shop"],
+        category_id="13005043",
+        personal_finance_category={
+            "primary": "FOOD_AND_DRINK",
+            "detailed": "FOOD_AND_DRINK_COFFEE",
+            "confidence_level": "VERY_HIGH",
+        },
+        personal_finance_category_icon_url=(
+            "https://plaid-category-icons.plaid.com/PFC_FOOD_AND_DRINK.png"
+        ),
+        location={
+            "address": f"{100 + i % 900} Market St",
+            "city": "San Francisco",
+            "region": "CA",
+            "postal_code": "94105",
+            "country": "US",
+            "lat": 37.7897,
+            "lon": -122.3972,
+            "store_number": str(i % 120),
+        },
+        payment_meta={
+            "reference_number": None,
+            "ppd_id": None,
+            "payee": None,
+            "by_order_of": None,
+            "payer": None,
+            "payment_method": None,
+            "payment_processor": None,
+            "reason": None,
+        },
+        counterparties=[
+            {
+                "name": f"Merchant {i % 37}",
+                "type": "merchant",
+                "website": f"merchant{i % 37}.example.com",
+                "logo_url": (
+                    f"https://plaid-merchant-logos.plaid.com/merchant_{i % 37}.png"
+                ),
+                "entity_id": f"ent_{i % 37:04d}",
+                "confidence_level": "VERY_HIGH",
+            }
+        ],
+        account_owner=None,
+        pending_transaction_id=None,
+        check_number=None,
+        original_description=None,
+        transaction_type="place",
+    )
+
+
+def fetch(count: int) -> List[Any]:
+    """Plaid transaction models as ``get_transactions`` returns them."""
+    route = FakeTransactionsGet([rich_transaction(i) for i in range(count)])
+    with FakePlaidServer(routes={"/transactions/get": route}) as server:
+        settings.PLAID_HOST = server.url
+        plaid_client.close_plaid_client()
+        data = plaid_client.get_transactions(
+            plaid_client.get_plaid_client(), "access-bench", None, None
+        )
+        plaid_client.close_plaid_client()
+    return data["transactions"]
+
+
+def best_of(repeat: int, func: Callable[[], bytes]) -> float:
+    """Return the fastest of ``repeat`` calls in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    for count in ROW_COUNTS:
+        transactions = fetch(count)
+        variants = {
+            "full": lambda: ORJSONResponse(
+                {"transactions": [t.to_dict() for t in transactions]}
+            ).body,
+            "default": lambda: ORJSONResponse(
+                {
+                    "transactions": plaid_client.project_plaid_models(
+                        transactions, DEFAULT_PLAID_TRANSACTION_FIELDS
+                    )
+                }
+            ).body,
+            "minimal": lambda: ORJSONResponse(
+                {
+                    "transactions": plaid_client.project_plaid_models(
+                        transactions, MINIMAL_FIELDS
+                    )
+                }
+            ).body,
+        }
+        print(f"{count:,} transactions")
+        full_ms = None
+        for name, render in variants.items():
+            body = render()
+            elapsed_ms = best_of(args.repeat, render)
+            full_ms = full_ms or elapsed_ms
+            print(
+                f"  {name:<8} {elapsed_ms:8.2f} ms ({full_ms / elapsed_ms:5.1f}x)  "
+                f"{len(body) / 1024:8.1f} KiB  "
+                f"{len(gzip.compress(body)) / 1024:7.1f} KiB gzipped"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Cost of turning transaction rows into a JSON response body.
+
+Compares the two read paths of ``GET /transactions`` on in-memory data, so
+only serialisation is measured:
+
+* ``validated`` - ``Transaction.model_validate`` per ORM object, then FastAPI's
+  ``response_model`` validation and ``JSONResponse`` rendering, i.e. the
+  listing before the fast path;
+* ``orjson`` - column tuples zipped into dicts and rendered by
+  ``ORJSONResponse``, as the endpoint does now.
+
+Usage:
+    python -m benchmarks.bench_serialization [--repeat 20]
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+
+from app.models import Transaction as TransactionModel
+from app.schemas.enums import TransactionStatusEnum, TransactionTypeEnum
+from app.schemas.transaction import TRANSACTION_FIELDS, Transaction
+
+ROW_COUNTS = (100, 10_000)
+
+
+def make_transactions(count: int) -> List[TransactionModel]:
+    started = datetime(2024, 1, 1)
+    return [
+        TransactionModel(
+            id=i + 1,
+            user_id=1,
+            plaid_item_id=1,
+            plaid_account_id=1,
+            amount=f"{i % 500}.{i % 100:02d}",
+            currency="USD",
+            type=TransactionTypeEnum.EXPENSE,
+            status=TransactionStatusEnum.POSTED,
+            category="groceries",
+            merchant_name=f"Merchant {i % 37}",
+            description=None,
+            transaction_date=started + timedelta(minutes=i),
+            posted_date=started + timedelta(minutes=i),
+            created_at=started,
+            updated_at=started,
+        )
+        for i in range(count)
+    ]
+
+
+def best_of(repeat: int, func: Callable[[], bytes]) -> float:
+    """Return the fastest of ``repeat`` calls in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    adapter = TypeAdapter(List[Transaction])
+    for count in ROW_COUNTS:
+        objects = make_transactions(count)
+        rows = [
+            tuple(
+                float(t.amount) if name == "amount" else getattr(t, name)
+                for name in TRANSACTION_FIELDS
+            )
+            for t in objects
+        ]
+
+        def validated() -> bytes:
+            content = [Transaction.model_validate(t) for t in objects]
+            content = adapter.validate_python(content)
+            return JSONResponse(adapter.dump_python(content, mode="json")).body
+
+        def fast() -> bytes:
+            return ORJSONResponse(
+                [dict(zip(TRANSACTION_FIELDS, row)) for row in rows]
+            ).body
+
+        assert adapter.validate_json(validated()) == adapter.validate_json(fast())
+        slow_ms = best_of(args.repeat, validated)
+        fast_ms = best_of(args.repeat, fast)
+        print(
+            f"{count:>6,} rows: validated {slow_ms:8.2f} ms  "
+            f"orjson {fast_ms:8.2f} ms  ({slow_ms / fast_ms:4.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
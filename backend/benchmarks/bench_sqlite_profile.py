@@ -0,0 +1,143 @@
+"""
+Mixed read/write throughput under each SQLite storage profile.
+
+For every profile a fresh database file is seeded, then writer threads
+insert single transactions (one commit each) while reader threads list
+pages, for a fixed duration. ``default`` is SQLite's stock configuration
+(rollback journal, synchronous=FULL, 2 MiB cache, 5 s pysqlite timeout).
+
+Usage:
+    python -m benchmarks.bench_sqlite_profile [--seconds 5] [--writers 2] [--readers 6]
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.config import SQLITE_STORAGE_PROFILES, Environment
+from app.crud.transaction import transaction_list_query
+from app.database import Base, configure_sqlite_engine
+from app.models.transaction import Transaction
+from app.schemas.enums import TransactionStatusEnum, TransactionTypeEnum
+from benchmarks.bench_pagination import seed
+
+SEED_ROWS = 20_000
+
+
+def run_profile(path: str, pragmas: dict, seconds: float, writers: int, readers: int):
+    """Return (writes, reads, errors) completed within ``seconds``."""
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False},
+        pool_size=writers + readers,
+    )
+    if pragmas:
+        configure_sqlite_engine(engine, pragmas)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as session:
+        seed(session, SEED_ROWS)
+
+    counts = {"writes": 0, "reads": 0, "errors": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def bump(key: str) -> None:
+        with lock:
+            counts[key] += 1
+
+    def writer() -> None:
+        with factory() as session:
+            while time.perf_counter() < deadline:
+                now = datetime.utcnow()
+                try:
+                    session.execute(
+                        insert(Transaction),
+                        [
+                            {
+                                "user_id": 1,
+                                "plaid_item_id": 1,
+                                "plaid_account_id": 1,
+                                "amount_minor": 100,
+                                "currency": "USD",
+                                "type": TransactionTypeEnum.EXPENSE,
+                                "category": "bench",
+                                "status": TransactionStatusEnum.PENDING,
+                                "transaction_date": now,
+                                "posted_date": now,
+                            }
+                        ],
+                    )
+                    session.commit()
+                    bump("writes")
+                except OperationalError:
+                    session.rollback()
+                    bump("errors")
+
+    def reader(offset: int) -> None:
+        with factory() as session:
+            skip = offset
+            while time.perf_counter() < deadline:
+                try:
+                    session.scalars(
+                        transaction_list_query(skip=skip % SEED_ROWS, limit=100)
+                    ).all()
+                    session.rollback()
+                    session.expunge_all()
+                    bump("reads")
+                except OperationalError:
+                    session.rollback()
+                    bump("errors")
+                skip += 997
+
+    threads = [threading.Thread(target=writer) for _ in range(writers)]
+    threads += [
+        threading.Thread(target=reader, args=(i * 101,)) for i in range(readers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+    return counts["writes"], counts["reads"], counts["errors"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--readers", type=int, default=6)
+    args = parser.parse_args()
+
+    profiles = {"default": {}}
+    profiles.update(
+        {
+            env.value: SQLITE_STORAGE_PROFILES[env]
+            for env in Environment
+            if env != Environment.TEST
+        }
+    )
+    for name, pragmas in profiles.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            writes, reads, errors = run_profile(
+                os.path.join(tmp, "bench.db"),
+                pragmas,
+                args.seconds,
+                args.writers,
+                args.readers,
+            )
+        print(
+            f"{name:>12}: {writes / args.seconds:9.1f} writes/s  "
+            f"{reads / args.seconds:9.1f} reads/s  {errors} lock errors"
+        )
+
+
+if __name__ == "__main__":
+    main()
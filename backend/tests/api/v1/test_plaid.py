@@ -9,9 +9,23 @@ from plaid.model.plaid_error import PlaidError as PlaidApiError
 from datetime import datetime, timedelta
 from sqlalchemy.exc import SQLAlchemyError
 
+from app.config import settings
 from app.models.plaid import PlaidItem, PlaidAccount
-from app.schemas.plaid import PlaidAccountRequest
-from app.utils.plaid_client import PlaidError
+from app.models.transaction import Transaction
+from app.models.transaction_rollup import TransactionRollup
+from app.schemas.plaid import (
+    DEFAULT_PLAID_TRANSACTION_FIELDS,
+    PLAID_ACCOUNT_FIELDS,
+    PlaidAccountRequest,
+)
+from app.services import plaid_sync
+from app.utils.plaid_client import PlaidError, get_transactions_cache
+from tests.fake_plaid import (
+    FakePlaidServer,
+    FakeTransactionsGet,
+    FakeTransactionsSync,
+    plaid_transaction,
+)
 
 @patch("app.api.v1.plaid.get_plaid_client")
 def test_create_link_token(mock_get_client, client: TestClient, mock_plaid_client):
@@ -357,7 +371,7 @@ def test_get_transactions_db_error(mock_get_client, client: TestClient, db: Sess
     item_id = plaid_item.item_id
     
     # Mock the database query to raise an error
-    with patch("sqlalchemy.orm.Session.query") as mock_query:
+    with patch("sqlalchemy.ext.asyncio.AsyncSession.scalar") as mock_query:
         mock_query.side_effect = SQLAlchemyError("Database connection error")
         
         response = client.get(f"/api/v1/plaid/transactions/{item_id}")
@@ -388,4 +402,281 @@ def test_exchange_public_token_invalid_account_type(mock_get_client, client: Tes
     assert response.status_code == 422
     data = response.json()
     assert "detail" in data
-    assert any("type" in error["loc"] for error in data["detail"]) 
\ No newline at end of file
+    assert any("type" in error["loc"] for error in data["detail"])
+
+def test_sync_transactions(
+    client: TestClient, db: Session, test_plaid_account, monkeypatch
+):
+    """Test incremental sync applies only the changes since the stored cursor."""
+    account_id = test_plaid_account.account_id
+    sync = FakeTransactionsSync({
+        "": {
+            "added": [
+                plaid_transaction("t1", account_id, 12.5, "2024-03-01"),
+                plaid_transaction("t2", account_id, -1000, "2024-03-02"),
+            ],
+            "next_cursor": "c1",
+        },
+        "c1": {
+            "added": [
+                plaid_transaction("t3", account_id, 4.25, "2024-03-03", pending=True),
+                plaid_transaction("t4", "unknown_account", 1, "2024-03-03"),
+            ],
+            "next_cursor": "c2",
+        },
+    })
+    item_id = test_plaid_account.item.item_id
+
+    with FakePlaidServer(routes={"/transactions/sync": sync}) as server:
+        monkeypatch.setattr(settings, "PLAID_HOST", server.url)
+
+        response = client.post(f"/api/v1/plaid/transactions/{item_id}/sync")
+        assert response.status_code == 200
+        assert response.json() == {
+            "added": 3, "modified": 0, "removed": 0, "skipped": 1
+        }
+        assert sync.cursors == ["", "c1"]
+
+        sync.pages["c2"] = {
+            "modified": [plaid_transaction("t1", account_id, 15, "2024-03-01")],
+            "removed": ["t3"],
+            "next_cursor": "c3",
+        }
+        response = client.post(f"/api/v1/plaid/transactions/{item_id}/sync")
+        assert response.json() == {
+            "added": 0, "modified": 1, "removed": 1, "skipped": 0
+        }
+        assert sync.cursors == ["", "c1", "c2"]
+
+    db.expire_all()
+    item = db.query(PlaidItem).filter_by(item_id=item_id).one()
+    assert item.transactions_cursor == "c3"
+    rows = {t.plaid_transaction_id: t for t in db.query(Transaction).all()}
+    assert set(rows) == {"t1", "t2"}
+    assert rows["t1"].amount_minor == 1500
+    assert rows["t1"].type.value == "expense"
+    assert rows["t2"].type.value == "income"
+    assert rows["t2"].amount_minor == 100000
+    rollups = {
+        (r.type.value, r.total_minor, r.count)
+        for r in db.query(TransactionRollup).all()
+    }
+    assert rollups == {("expense", 1500, 1), ("income", 100000, 1)}
+
+def test_sync_transactions_not_found(client: TestClient):
+    response = client.post("/api/v1/plaid/transactions/non_existent_id/sync")
+    assert response.status_code == 404
+
+@patch("app.api.v1.plaid.get_plaid_client")
+def test_get_transactions_is_cached_until_the_item_syncs(
+    mock_get_client, client: TestClient, test_plaid_item, mock_plaid_client, monkeypatch
+):
+    """Repeated reads are served from the cache; a sync drops the item's entries."""
+    mock_get_client.return_value = mock_plaid_client
+    url = f"/api/v1/plaid/transactions/{test_plaid_item.item_id}"
+    dated = {"start_date": "2024-01-01T00:00:00", "end_date": "2024-01-31T00:00:00"}
+
+    first = client.get(url)
+    assert first.headers["X-Cache"] == "MISS"
+    second = client.get(url)
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.json() == first.json()
+    assert client.get(url, params=dated).headers["X-Cache"] == "MISS"
+    assert mock_plaid_client.transactions_get.call_count == 2
+
+    async def no_changes(client, access_token, cursor, **kwargs):
+        return {"added": [], "modified": [], "removed": [], "next_cursor": "c1"}
+
+    monkeypatch.setattr("app.services.plaid_sync.sync_transactions_async", no_changes)
+    assert client.post(f"{url}/sync").status_code == 200
+    assert get_transactions_cache().stats.entries == 0
+    assert client.get(url).headers["X-Cache"] == "MISS"
+
+    stats = client.get("/api/v1/plaid/cache/stats").json()["transactions"]
+    assert (stats["hits"], stats["misses"], stats["invalidations"]) == (1, 3, 2)
+
+def test_sync_updates_pending_transaction_when_it_posts(
+    client: TestClient, db: Session, test_plaid_account, monkeypatch
+):
+    """A posted transaction replacing a pending one updates the same row."""
+    account_id = test_plaid_account.account_id
+    posted = plaid_transaction(
+        "t_posted", account_id, 10.5, "2024-03-04",
+        pending_transaction_id="t_pending", authorized_date="2024-03-01",
+    )
+    sync = FakeTransactionsSync({
+        "": {
+            "added": [
+                plaid_transaction(
+                    "t_pending", account_id, 10, "2024-03-01", pending=True
+                )
+            ],
+            "next_cursor": "c1",
+        },
+    })
+    url = f"/api/v1/plaid/transactions/{test_plaid_account.item.item_id}/sync"
+
+    with FakePlaidServer(routes={"/transactions/sync": sync}) as server:
+        monkeypatch.setattr(settings, "PLAID_HOST", server.url)
+        client.post(url)
+        pending_row_id = db.query(Transaction.id).scalar()
+
+        sync.pages["c1"] = {
+            "added": [posted], "removed": ["t_pending"], "next_cursor": "c2"
+        }
+        response = client.post(url)
+        assert response.json() == {
+            "added": 0, "modified": 1, "removed": 0, "skipped": 0
+        }
+        # Re-delivered transactions update their row rather than duplicating it
+        sync.pages["c2"] = {
+            "added": [posted], "modified": [posted], "next_cursor": "c3"
+        }
+        response = client.post(url)
+        assert response.json() == {
+            "added": 0, "modified": 1, "removed": 0, "skipped": 0
+        }
+
+    db.expire_all()
+    row = db.query(Transaction).one()
+    assert row.id == pending_row_id
+    assert row.plaid_transaction_id == "t_posted"
+    assert row.status.value == "posted"
+    assert row.amount_minor == 1050
+    assert row.transaction_date.day == 1 and row.posted_date.day == 4
+    rollups = [(r.total_minor, r.count) for r in db.query(TransactionRollup).all()]
+    assert rollups == [(1050, 1)]
+
+
+def test_sync_skips_pending_transaction_posted_in_the_same_sync(
+    client: TestClient, db: Session, test_plaid_account, monkeypatch
+):
+    """A pending transaction replaced within one sync never gets a row."""
+    account_id = test_plaid_account.account_id
+    sync = FakeTransactionsSync({
+        "": {
+            "added": [
+                plaid_transaction(
+                    "t_pending", account_id, 10, "2024-03-01", pending=True
+                ),
+                plaid_transaction(
+                    "t_posted", account_id, 10, "2024-03-02",
+                    pending_transaction_id="t_pending",
+                ),
+            ],
+            "removed": ["t_pending"],
+            "next_cursor": "c1",
+        },
+    })
+    url = f"/api/v1/plaid/transactions/{test_plaid_account.item.item_id}/sync"
+
+    with FakePlaidServer(routes={"/transactions/sync": sync}) as server:
+        monkeypatch.setattr(settings, "PLAID_HOST", server.url)
+        response = client.post(url)
+
+    assert response.json() == {"added": 1, "modified": 0, "removed": 0, "skipped": 0}
+    assert [t.plaid_transaction_id for t in db.query(Transaction).all()] == ["t_posted"]
+
+
+def test_sync_queries_ids_in_chunks(
+    client: TestClient, db: Session, test_plaid_account, monkeypatch
+):
+    """Ids beyond one query's worth are read, moved and deleted chunk by chunk."""
+    monkeypatch.setattr(plaid_sync, "ID_CHUNK_SIZE", 2)
+    account_id = test_plaid_account.account_id
+    first_ids = [f"t_{kind}{n}" for kind in ("pending", "gone") for n in range(5)]
+    sync = FakeTransactionsSync({
+        "": {
+            "added": [
+                plaid_transaction(i, account_id, 1, "2024-03-01", pending=True)
+                for i in first_ids
+            ],
+            "next_cursor": "c1",
+        },
+    })
+    url = f"/api/v1/plaid/transactions/{test_plaid_account.item.item_id}/sync"
+
+    with FakePlaidServer(routes={"/transactions/sync": sync}) as server:
+        monkeypatch.setattr(settings, "PLAID_HOST", server.url)
+        client.post(url)
+
+        sync.pages["c1"] = {
+            "added": [
+                plaid_transaction(
+                    f"t_posted{n}", account_id, 2, "2024-03-02",
+                    pending_transaction_id=f"t_pending{n}",
+                )
+                for n in range(5)
+            ],
+            "removed": first_ids,
+            "next_cursor": "c2",
+        }
+        response = client.post(url)
+
+    assert response.json() == {"added": 0, "modified": 5, "removed": 5, "skipped": 0}
+    assert sorted(t.plaid_transaction_id for t in db.query(Transaction).all()) == [
+        f"t_posted{n}" for n in range(5)
+    ]
+
+def test_get_transactions_projects_requested_fields(
+    client: TestClient, test_plaid_item, monkeypatch
+):
+    """Transactions carry the compact default fields, or only those requested."""
+    account = {
+        "account_id": "acc_1",
+        "balances": {
+            "available": 90.0,
+            "current": 100.0,
+            "limit": None,
+            "iso_currency_code": "USD",
+            "unofficial_currency_code": None,
+        },
+        "mask": "0000",
+        "name": "Checking",
+        "official_name": None,
+        "type": "depository",
+        "subtype": "checking",
+    }
+    transactions = FakeTransactionsGet(
+        [
+            plaid_transaction(
+                "t1",
+                "acc_1",
+                12.5,
+                "2024-03-01",
+                merchant_name="Cafe",
+                category=["Food and Drink"],
+                personal_finance_category={
+                    "primary": "FOOD_AND_DRINK",
+                    "detailed": "FOOD_AND_DRINK_COFFEE",
+                },
+            )
+        ],
+        accounts=[account],
+    )
+    url = f"/api/v1/plaid/transactions/{test_plaid_item.item_id}"
+
+    with FakePlaidServer(routes={"/transactions/get": transactions}) as server:
+        monkeypatch.setattr(settings, "PLAID_HOST", server.url)
+
+        data = client.get(url).json()
+        assert data["accounts"] == [
+            {name: account[name] for name in PLAID_ACCOUNT_FIELDS}
+        ]
+        [transaction] = data["transactions"]
+        assert tuple(transaction) == DEFAULT_PLAID_TRANSACTION_FIELDS
+        assert transaction["date"] == "2024-03-01"
+        assert transaction["personal_finance_category"]["primary"] == "FOOD_AND_DRINK"
+        assert "payment_channel" not in transaction
+
+        response = client.get(
+            url, params={"fields": "transaction_id, amount,category,amount"}
+        )
+        assert response.headers["X-Cache"] == "MISS"
+        assert response.json()["transactions"] == [
+            {"transaction_id": "t1", "amount": 12.5, "category": ["Food and Drink"]}
+        ]
+
+        response = client.get(url, params={"fields": "transaction_id,access_token"})
+        assert response.status_code == 400
+        assert client.get(url, params={"fields": ","}).status_code == 400
@@ -3,8 +3,9 @@ Test configuration and fixtures.
 """
 import pytest
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool
 from fastapi.testclient import TestClient
 from unittest.mock import Mock, patch
 from datetime import datetime, timedelta
@@ -14,23 +15,39 @@ from plaid.model.account_base import AccountBase
 from plaid.model.transaction import Transaction as PlaidTransaction
 from plaid.model.link_token_create_response import LinkTokenCreateResponse
 
-from app.database import Base, get_db
+from app.config import settings
+from app.database import (
+    Base,
+    configure_sqlite_engine,
+    get_async_db,
+    get_async_sessionmaker,
+    get_db,
+)
 from app.main import app
 from app.models.user import User
 from app.models.plaid import PlaidItem, PlaidAccount
 from app.models.transaction import Transaction
 from app.schemas.enums import TransactionTypeEnum, TransactionStatusEnum
+from app.services.personality_cache import reset_personality_cache
+from app.utils.plaid_client import (
+    close_plaid_client,
+    reset_circuit_breakers,
+    reset_plaid_caches,
+)
 
-# Test database
-SQLALCHEMY_DATABASE_URL = "sqlite://"
+# Test database: a per-test file so the sync fixture session and the async
+# sessions used by the API routes see the same data
+@pytest.fixture
+def database_path(tmp_path):
+    return tmp_path / "test.db"
 
 @pytest.fixture
-def db():
+def db(database_path):
     engine = create_engine(
-        SQLALCHEMY_DATABASE_URL,
+        f"sqlite:///{database_path}",
         connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
     )
+    configure_sqlite_engine(engine, settings.sqlite_pragmas)
     TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     Base.metadata.create_all(bind=engine)
 
@@ -40,19 +57,54 @@ def db():
     finally:
         db.close()
         Base.metadata.drop_all(bind=engine)
+        engine.dispose()
 
 @pytest.fixture
-def client(db):
+def async_session_factory(db, database_path):
+    """Async session factory bound to the test database."""
+    # NullPool: TestClient may drive each request on a fresh event loop
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{database_path}", poolclass=NullPool
+    )
+    configure_sqlite_engine(engine.sync_engine, settings.sqlite_pragmas)
+    yield async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+@pytest.fixture
+def client(db, async_session_factory):
     """Create a test client."""
     def override_get_db():
         try:
             yield db
         finally:
             pass
-    
+
+    async def override_get_async_db():
+        async with async_session_factory() as session:
+            yield session
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_async_sessionmaker] = lambda: async_session_factory
     return TestClient(app)
 
+@pytest.fixture(autouse=True)
+def reset_decrypted_profiles():
+    """Give every test an empty decrypted personality profile cache."""
+    reset_personality_cache()
+    yield
+    reset_personality_cache()
+
+@pytest.fixture(autouse=True)
+def reset_plaid_client():
+    """Give every test a fresh process-wide Plaid client, cache and breakers."""
+    close_plaid_client()
+    reset_plaid_caches()
+    reset_circuit_breakers()
+    yield
+    close_plaid_client()
+    reset_plaid_caches()
+    reset_circuit_breakers()
+
 @pytest.fixture
 def mock_plaid_client():
     """Create a mock Plaid client."""
@@ -98,6 +150,7 @@ def test_user(db):
 def test_plaid_item(db, test_user):
     """Create a test Plaid item."""
     item = PlaidItem(
+        user_id=test_user.id,
         item_id="test_item_id",
         access_token="test_access_token",
         institution_id="ins_123",
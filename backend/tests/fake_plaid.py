@@ -0,0 +1,371 @@
+"""
+Local stand-in for the Plaid HTTP API.
+
+Serves canned JSON over HTTP/1.1 keep-alive on 127.0.0.1 so the real
+plaid-python client (and its urllib3 pool) can be exercised end to end.
+Point ``settings.PLAID_HOST`` at ``server.url`` to use it.
+"""
+
+import base64
+import hashlib
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.asymmetric.utils import decode_dss_signature
+
+Handler = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+class FakePlaidApiError(Exception):
+    """Raise from a route handler to answer with a Plaid error response."""
+
+    def __init__(
+        self, error_code: str, status: int = 400, error_type: str = "API_ERROR"
+    ):
+        super().__init__(error_code)
+        self.error_code = error_code
+        self.status = status
+        self.error_type = error_type
+
+
+class FailFirst:
+    """
+    Route handler that raises ``failures`` in order, then defers to ``handler``.
+
+    Lets a test inject transient errors in front of a working route.
+    """
+
+    def __init__(self, handler: Handler, failures: List[FakePlaidApiError]):
+        self.handler = handler
+        self.failures = list(failures)
+        self._lock = threading.Lock()
+
+    def __call__(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            failure = self.failures.pop(0) if self.failures else None
+        if failure is not None:
+            raise failure
+        return self.handler(body)
+
+
+# The ``item`` object of responses that include one
+ITEM = {
+    "item_id": "item-fake",
+    "webhook": None,
+    "error": None,
+    "available_products": [],
+    "billed_products": ["transactions"],
+    "consent_expiration_time": None,
+    "update_type": "background",
+}
+
+
+def link_token_create(body: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "link_token": f"link-sandbox-{uuid.uuid4()}",
+        "expiration": "2030-01-01T00:00:00Z",
+        "request_id": uuid.uuid4().hex,
+    }
+
+
+def item_public_token_exchange(body: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "access_token": f"access-sandbox-{body['public_token']}",
+        "item_id": f"item-{body['public_token']}",
+        "request_id": uuid.uuid4().hex,
+    }
+
+
+def plaid_account(
+    account_id: str,
+    current: Optional[float],
+    available: Optional[float] = None,
+    **fields: Any,
+) -> Dict[str, Any]:
+    """JSON for one Plaid account with every field the client requires."""
+    return {
+        "account_id": account_id,
+        "balances": {
+            "available": available,
+            "current": current,
+            "limit": None,
+            "iso_currency_code": "USD",
+            "unofficial_currency_code": None,
+        },
+        "mask": "0000",
+        "name": f"Account {account_id}",
+        "official_name": None,
+        "type": "depository",
+        "subtype": "checking",
+        **fields,
+    }
+
+
+class FakeAccountsGet:
+    """/accounts/get handler serving ``accounts``, which tests may change."""
+
+    def __init__(self, accounts: List[Dict[str, Any]] = None):
+        self.accounts = accounts or []
+
+    def __call__(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "accounts": self.accounts,
+            "item": ITEM,
+            "request_id": uuid.uuid4().hex,
+        }
+
+
+def plaid_transaction(
+    transaction_id: str,
+    account_id: str,
+    amount: float,
+    date: str,
+    pending: bool = False,
+    **fields: Any,
+) -> Dict[str, Any]:
+    """JSON for one Plaid transaction with every field the client requires."""
+    return {
+        "transaction_id": transaction_id,
+        "account_id": account_id,
+        "amount": amount,
+        "iso_currency_code": "USD",
+        "unofficial_currency_code": None,
+        "date": date,
+        "pending": pending,
+        "name": f"Transaction {transaction_id}",
+        "authorized_date": None,
+        "authorized_datetime": None,
+        "datetime": None,
+        "payment_channel": "online",
+        "transaction_code": None,
+        **fields,
+    }
+
+
+class FakeTransactionsSync:
+    """
+    /transactions/sync handler replaying a scripted change stream.
+
+    ``pages`` maps the request cursor (``""`` for the initial sync) to the
+    ``added``/``modified``/``removed`` lists and ``next_cursor`` of the page
+    returned for it; ``has_more`` is set when ``next_cursor`` has a page too.
+    """
+
+    def __init__(self, pages: Dict[str, Dict[str, Any]]):
+        self.pages = pages
+        self.cursors: List[str] = []
+
+    def __call__(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        cursor = body.get("cursor", "")
+        self.cursors.append(cursor)
+        page = self.pages.get(cursor, {"next_cursor": cursor})
+        return {
+            "added": page.get("added", []),
+            "modified": page.get("modified", []),
+            "removed": [
+                {"transaction_id": transaction_id}
+                for transaction_id in page.get("removed", [])
+            ],
+            "next_cursor": page["next_cursor"],
+            "has_more": page["next_cursor"] in self.pages
+            and page["next_cursor"] != cursor,
+            "request_id": uuid.uuid4().hex,
+        }
+
+
+class FakeTransactionsGet:
+    """
+    /transactions/get handler serving ``transactions`` by offset and count.
+
+    Tracks the peak number of requests being answered at the same time.
+    """
+
+    def __init__(
+        self,
+        transactions: List[Dict[str, Any]],
+        latency: float = 0.0,
+        accounts: List[Dict[str, Any]] = None,
+    ):
+        self.transactions = transactions
+        self.latency = latency
+        self.accounts = accounts or []
+        self.offsets: List[int] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        options = body.get("options", {})
+        offset, count = options.get("offset", 0), options.get("count", 100)
+        with self._lock:
+            self.offsets.append(offset)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.latency)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        return {
+            "accounts": self.accounts,
+            "transactions": self.transactions[offset : offset + count],
+            "total_transactions": len(self.transactions),
+            "item": ITEM,
+            "request_id": uuid.uuid4().hex,
+        }
+
+
+class FakeWebhookSigner:
+    """
+    /webhook_verification_key/get handler for a key of its own.
+
+    ``sign`` makes the ``Plaid-Verification`` header Plaid would send with a
+    webhook body; only the key with id ``key_id`` is served.
+    """
+
+    def __init__(self, key_id: str = "fake-key"):
+        self.key_id = key_id
+        self._key = ec.generate_private_key(ec.SECP256R1())
+
+    def sign(
+        self, body: bytes, issued_at: Optional[float] = None, key_id: str = None
+    ) -> str:
+        header = {"alg": "ES256", "kid": key_id or self.key_id, "typ": "JWT"}
+        payload = {
+            "iat": int(time.time() if issued_at is None else issued_at),
+            "request_body_sha256": hashlib.sha256(body).hexdigest(),
+        }
+        signing_input = b".".join(
+            _b64encode(json.dumps(part).encode()) for part in (header, payload)
+        )
+        r, s = decode_dss_signature(
+            self._key.sign(signing_input, ec.ECDSA(hashes.SHA256()))
+        )
+        signature = r.to_bytes(32, "big") + s.to_bytes(32, "big")
+        return b".".join([signing_input, _b64encode(signature)]).decode()
+
+    def __call__(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        if body["key_id"] != self.key_id:
+            raise FakePlaidApiError("INVALID_FIELD", error_type="INVALID_REQUEST")
+        numbers = self._key.public_key().public_numbers()
+        return {
+            "key": {
+                "alg": "ES256",
+                "crv": "P-256",
+                "kid": self.key_id,
+                "kty": "EC",
+                "use": "sig",
+                "x": _b64encode(numbers.x.to_bytes(32, "big")).decode(),
+                "y": _b64encode(numbers.y.to_bytes(32, "big")).decode(),
+                "created_at": int(time.time()),
+                "expired_at": None,
+            },
+            "request_id": uuid.uuid4().hex,
+        }
+
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+class FakePlaidServer:
+    """
+    Threaded fake Plaid server, usable as a context manager.
+
+    Args:
+        routes: Extra or overriding ``path -> handler(request_json)`` routes
+        latency: Seconds to sleep before answering each request
+        handshake_delay: Seconds to sleep once per new connection, standing
+            in for the TCP + TLS handshake of the real API
+
+    Attributes:
+        connections: Number of TCP connections accepted so far
+        requests: Paths of the requests served so far, in order
+    """
+
+    def __init__(
+        self,
+        routes: Dict[str, Handler] = None,
+        latency: float = 0.0,
+        handshake_delay: float = 0.0,
+    ):
+        self.routes: Dict[str, Handler] = {
+            "/link/token/create": link_token_create,
+            "/item/public_token/exchange": item_public_token_exchange,
+            "/accounts/get": FakeAccountsGet(),
+            **(routes or {}),
+        }
+        self.latency = latency
+        self.handshake_delay = handshake_delay
+        self.connections = 0
+        self.requests: List[str] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "FakePlaidServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler_class(self):
+        fake = self
+
+        class PlaidRequestHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with fake._lock:
+                    fake.connections += 1
+                if fake.handshake_delay:
+                    time.sleep(fake.handshake_delay)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                with fake._lock:
+                    fake.requests.append(self.path)
+                if fake.latency:
+                    time.sleep(fake.latency)
+
+                handler = fake.routes.get(self.path)
+                try:
+                    if handler is None:
+                        raise FakePlaidApiError("NOT_FOUND", 404)
+                    status, payload = 200, handler(body)
+                except FakePlaidApiError as e:
+                    status = e.status
+                    payload = {
+                        "error_type": e.error_type,
+                        "error_code": e.error_code,
+                        "error_message": e.error_code,
+                        "request_id": uuid.uuid4().hex,
+                    }
+                encoded = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(encoded)))
+                self.end_headers()
+                self.wfile.write(encoded)
+
+            def log_message(self, format, *args):
+                pass
+
+        return PlaidRequestHandler
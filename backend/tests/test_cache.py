@@ -0,0 +1,74 @@
+"""
+Tests for the in-process TTL cache.
+"""
+import time
+
+from app.utils.cache import TTLCache
+
+
+def test_entries_expire_after_ttl():
+    cache = TTLCache(ttl=0.05, max_bytes=100)
+    cache.set("a", b"value")
+    assert cache.get("a") == b"value"
+    time.sleep(0.06)
+    assert cache.get("a") is None
+
+    stats = cache.stats
+    assert (stats.hits, stats.misses, stats.expirations) == (1, 1, 1)
+    assert (stats.entries, stats.bytes) == (0, 0)
+
+
+def test_least_recently_used_entries_are_evicted_under_the_byte_cap():
+    cache = TTLCache(ttl=60, max_bytes=10)
+    cache.set("a", b"aaaa")
+    cache.set("b", b"bbbb")
+    cache.get("a")  # "b" is now the least recently used
+    cache.set("c", b"cccc")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"aaaa"
+    assert cache.get("c") == b"cccc"
+    assert (cache.stats.evictions, cache.stats.bytes) == (1, 8)
+
+
+def test_oversized_values_and_zero_ttl_are_not_stored():
+    cache = TTLCache(ttl=60, max_bytes=4)
+    cache.set("a", b"too large")
+    assert cache.get("a") is None
+
+    disabled = TTLCache(ttl=0, max_bytes=100)
+    disabled.set("a", b"value")
+    assert disabled.get("a") is None
+
+
+def test_replacing_a_key_keeps_the_size_accurate():
+    cache = TTLCache(ttl=60, max_bytes=100)
+    cache.set("a", b"12345")
+    cache.set("a", b"12")
+    assert (cache.stats.entries, cache.stats.bytes) == (1, 2)
+
+
+def test_invalidate_drops_matching_keys():
+    cache = TTLCache(ttl=60, max_bytes=100)
+    cache.set(("item_1", None, None), b"1")
+    cache.set(("item_1", "2024-01-01", None), b"2")
+    cache.set(("item_2", None, None), b"3")
+
+    assert cache.invalidate(lambda key: key[0] == "item_1") == 2
+    assert cache.get(("item_1", None, None)) is None
+    assert cache.get(("item_2", None, None)) == b"3"
+    assert cache.stats.invalidations == 2
+
+
+def test_entry_cap_and_per_entry_ttl():
+    cache = TTLCache(ttl=60, max_bytes=100, max_entries=2)
+    cache.set("a", b"a", ttl=0.05)
+    cache.set("b", b"b")
+    cache.set("c", b"c")  # Evicts "a", the least recently used
+
+    assert cache.get("a") is None
+    assert cache.stats.evictions == 1
+    cache.set("d", b"d", ttl=0.05)
+    time.sleep(0.06)
+    assert cache.get("d") is None
+    assert cache.get("c") == b"c"
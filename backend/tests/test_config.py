@@ -5,7 +5,7 @@ import os
 import unittest
 from pathlib import Path
 
-from app.config import Settings, Environment
+from app.config import SQLITE_STORAGE_PROFILES, Settings, Environment
 
 
 class TestConfigSettings(unittest.TestCase):
@@ -22,6 +22,9 @@ class TestConfigSettings(unittest.TestCase):
             del os.environ["ENVIRONMENT"]
         if "DATABASE_PATH" in os.environ:
             del os.environ["DATABASE_PATH"]
+        for name in list(os.environ):
+            if name.startswith("SQLITE_"):
+                del os.environ[name]
 
     def tearDown(self):
         # Restore original environment variables
@@ -70,6 +73,31 @@ class TestConfigSettings(unittest.TestCase):
         # since the file might not exist in the test environment
         self.assertEqual(settings.model_config["env_file"], "custom.env")
 
+    def test_sqlite_storage_profile_presets(self):
+        """Test that each environment resolves to its storage preset."""
+        for environment in Environment:
+            os.environ["ENVIRONMENT"] = environment.value
+            settings = Settings()
+            self.assertEqual(
+                settings.sqlite_pragmas, SQLITE_STORAGE_PROFILES[environment]
+            )
+        self.assertEqual(
+            SQLITE_STORAGE_PROFILES[Environment.PROD]["journal_mode"], "WAL"
+        )
+
+    def test_sqlite_storage_profile_override(self):
+        """Test that individual pragmas can be overridden from the environment."""
+        os.environ["SQLITE_SYNCHRONOUS"] = "OFF"
+        os.environ["SQLITE_BUSY_TIMEOUT"] = "250"
+        settings = Settings()
+        pragmas = settings.sqlite_pragmas
+        self.assertEqual(pragmas["synchronous"], "OFF")
+        self.assertEqual(pragmas["busy_timeout"], 250)
+        self.assertEqual(
+            pragmas["journal_mode"],
+            SQLITE_STORAGE_PROFILES[Environment.DEV]["journal_mode"],
+        )
+
 
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,95 @@
+"""
+Tests for database engine configuration.
+"""
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect, text
+
+from app.core.security import decrypt_json, encrypt_data
+from app.database import Base, configure_sqlite_engine
+
+
+def test_storage_profile_applied_to_new_connections(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pragmas.db'}")
+    configure_sqlite_engine(engine, {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -8000,
+        "temp_store": "MEMORY",
+        "busy_timeout": 1234,
+    })
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA cache_size")).scalar() == -8000
+        assert conn.execute(text("PRAGMA temp_store")).scalar() == 2  # MEMORY
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 1234
+    engine.dispose()
+
+
+def test_storage_profile_rejects_unsafe_values(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pragmas.db'}")
+    configure_sqlite_engine(engine, {"journal_mode": "WAL; DROP TABLE users"})
+    with pytest.raises(ValueError):
+        engine.connect()
+    engine.dispose()
+
+
+def alembic_config(url):
+    """Alembic configuration of this repo's migrations, run against ``url``."""
+    config = Config()
+    script_location = Path(__file__).parents[1] / "alembic"
+    config.set_main_option("script_location", str(script_location))
+    config.set_main_option("sqlalchemy.url", url)
+    return config
+
+
+def test_migrations_build_a_new_database(tmp_path):
+    """``alembic upgrade head`` alone creates every table the models define."""
+    url = f"sqlite:///{tmp_path / 'migrated.db'}"
+    config = alembic_config(url)
+    command.upgrade(config, "head")
+
+    engine = create_engine(url)
+    tables = set(inspect(engine).get_table_names())
+    engine.dispose()
+    assert set(Base.metadata.tables) <= tables
+
+
+def test_traits_migration_keeps_empty_traits(tmp_path):
+    """Traits the old ``encrypt_data`` stored as ``""`` survive packing."""
+    url = f"sqlite:///{tmp_path / 'migrated.db'}"
+    config = alembic_config(url)
+    command.upgrade(config, "20261018_plaid_balance_snapshots")
+
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO users (id, email, hashed_password, is_active) "
+            "VALUES (1, 'user@example.com', 'x', 1)"
+        ))
+        conn.execute(
+            text(
+                "INSERT INTO personality_profiles (user_id, openness, social_energy, "
+                "learning_style, activity_intensity, created_at, updated_at) "
+                "VALUES (1, :openness, '', '', '', :now, :now)"
+            ),
+            {"openness": encrypt_data("c"), "now": datetime(2026, 1, 1)},
+        )
+    command.upgrade(config, "head")
+
+    with engine.connect() as conn:
+        token = conn.execute(
+            text("SELECT encrypted_traits FROM personality_profiles")
+        ).scalar()
+    engine.dispose()
+    assert decrypt_json(token) == {
+        "openness": "c",
+        "social_energy": "",
+        "learning_style": "",
+        "activity_intensity": "",
+    }
@@ -0,0 +1,51 @@
+"""
+Tests for minor-unit money conversions.
+"""
+from decimal import Decimal
+
+import pytest
+
+from app.models.transaction import Transaction
+from app.utils.money import from_minor, to_minor
+
+
+@pytest.mark.parametrize("amount, currency, minor", [
+    (Decimal("10.10"), "USD", 1010),
+    (10.1, "USD", 1010),
+    ("0.30", "EUR", 30),
+    (1000, "JPY", 1000),
+    (Decimal("1E+3"), "GBP", 100000),
+])
+def test_to_minor(amount, currency, minor):
+    assert to_minor(amount, currency) == minor
+
+
+@pytest.mark.parametrize("amount, currency", [
+    (Decimal("0.001"), "USD"),
+    (Decimal("10.5"), "JPY"),
+])
+def test_to_minor_rejects_excess_precision(amount, currency):
+    with pytest.raises(ValueError):
+        to_minor(amount, currency)
+
+
+def test_from_minor_round_trip():
+    assert from_minor(1010, "USD") == Decimal("10.10")
+    assert from_minor(1010, "JPY") == Decimal("1010")
+    large = Decimal("123456789.99")
+    assert from_minor(to_minor(large, "USD"), "USD") == large
+
+
+def test_transaction_amount_follows_currency():
+    transaction = Transaction(amount=Decimal("12.34"), currency="EUR")
+    assert transaction.amount_minor == 1234
+    assert transaction.amount == Decimal("12.34")
+
+    # Changing the currency keeps the decimal amount, not the minor units
+    transaction.amount = 12
+    transaction.currency = "JPY"
+    assert transaction.amount_minor == 12
+    assert transaction.amount == Decimal("12")
+
+    with pytest.raises(ValueError):
+        transaction.amount = Decimal("0.5")
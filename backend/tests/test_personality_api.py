@@ -135,4 +135,77 @@ def test_get_nonexistent_personality_profile(client):
     response = client.get("/api/v1/user-profile/personality/999")
     
     assert response.status_code == status.HTTP_404_NOT_FOUND
-    assert "not found" in response.json()["detail"] 
\ No newline at end of file
+    assert "not found" in response.json()["detail"]
+
+def test_get_personality_profile_not_modified(client, test_user, db: Session):
+    """Test a matching If-None-Match returns 304 without decrypting anything."""
+    from unittest.mock import patch
+    from app.models.personality import PersonalityProfile
+
+    profile = PersonalityProfile(user_id=test_user.id)
+    profile.set_personality_data({
+        "openness": "a",
+        "social_energy": "b",
+        "learning_style": "c",
+        "activity_intensity": "a"
+    })
+    db.add(profile)
+    db.commit()
+
+    url = f"/api/v1/user-profile/personality/{test_user.id}"
+    response = client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    etag = response.headers["ETag"]
+
+    with patch("app.models.personality.decrypt_json") as decrypt:
+        response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+    decrypt.assert_not_called()
+
+    response = client.get(url, headers={"If-None-Match": '"stale"'})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["openness"] == "a"
+
+def test_get_personality_profile_is_served_from_the_decrypted_cache(
+    client, test_user, db: Session
+):
+    """Test traits are decrypted once per profile version and stats are exposed."""
+    from datetime import datetime, timedelta
+    from unittest.mock import patch
+    from app.core.security import decrypt_json
+    from app.models.personality import PersonalityProfile
+
+    profile = PersonalityProfile(user_id=test_user.id)
+    profile.set_personality_data({
+        "openness": "a",
+        "social_energy": "b",
+        "learning_style": "c",
+        "activity_intensity": "a"
+    })
+    db.add(profile)
+    db.commit()
+
+    url = f"/api/v1/user-profile/personality/{test_user.id}"
+    with patch("app.models.personality.decrypt_json", wraps=decrypt_json) as decrypt:
+        assert client.get(url).json()["openness"] == "a"
+        assert client.get(url).json()["openness"] == "a"
+        assert decrypt.call_count == 1
+
+        # A new version of the profile is a new cache key
+        profile.set_personality_data({
+            "openness": "c",
+            "social_energy": "b",
+            "learning_style": "c",
+            "activity_intensity": "a"
+        })
+        profile.updated_at = datetime.utcnow() + timedelta(seconds=1)
+        db.commit()
+        assert client.get(url).json()["openness"] == "c"
+        assert decrypt.call_count == 2
+
+    stats = client.get("/api/v1/user-profile/personality/cache/stats").json()
+    assert (stats["hits"], stats["misses"], stats["decrypts"]) == (1, 2, 2)
+    assert stats["hit_ratio"] == 1 / 3
+    assert stats["decrypt_ms_total"] > 0
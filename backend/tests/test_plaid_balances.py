@@ -0,0 +1,151 @@
+"""
+Tests for Plaid balance snapshots, their compaction and the history endpoint.
+"""
+import asyncio
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.models.plaid import PlaidBalanceSnapshot
+from app.schemas.enums import BalanceResolutionEnum
+from app.services.plaid_balances import balance_fields, compact_snapshots
+from app.services.plaid_refresh import PlaidRefreshWorker
+from tests.fake_plaid import FakeAccountsGet, FakePlaidServer, plaid_account
+
+DAY, WEEK, MONTH = BalanceResolutionEnum
+
+
+def add_daily_snapshots(db, plaid_account_id, last_day, days):
+    """One snapshot per day up to ``last_day``; the balance is the day's ordinal."""
+    for n in range(days):
+        day = last_day - timedelta(days=n)
+        db.add(PlaidBalanceSnapshot(
+            plaid_account_id=plaid_account_id,
+            snapshot_date=day,
+            resolution=DAY,
+            currency="USD",
+            current_minor=day.toordinal(),
+            available_minor=None,
+        ))
+    db.commit()
+
+
+def test_refresh_snapshots_balances_once_per_day(
+    db, test_plaid_account, async_session_factory, monkeypatch
+):
+    """Each refresh writes the day's balances, replacing the earlier snapshot."""
+    accounts = FakeAccountsGet([
+        plaid_account(test_plaid_account.account_id, 100.25, 90),
+        plaid_account("unknown_account", 1),
+    ])
+    worker = PlaidRefreshWorker(concurrency=1, institution_interval=0)
+    item_id = test_plaid_account.plaid_item_id
+
+    with FakePlaidServer(routes={"/accounts/get": accounts}) as server:
+        monkeypatch.setattr(settings, "PLAID_HOST", server.url)
+        monkeypatch.setattr(
+            "app.services.plaid_refresh.sync_item", lambda *args: asyncio.sleep(0)
+        )
+        outcome = asyncio.run(worker.refresh_item(async_session_factory, item_id))
+        assert outcome.error is None
+        accounts.accounts[0]["balances"]["current"] = 120.5
+        asyncio.run(worker.refresh_item(async_session_factory, item_id))
+
+    [snapshot] = db.query(PlaidBalanceSnapshot).all()
+    assert snapshot.snapshot_date == datetime.utcnow().date()
+    assert snapshot.resolution is DAY
+    assert (snapshot.current_minor, snapshot.available_minor) == (12050, 9000)
+
+
+def test_balance_fields_round_float_balances_half_even():
+    """Float noise and sub-unit digits round to the currency's minor unit."""
+    balances = plaid_account("a1", 0.1 + 0.2, 10.125)["balances"]
+    account = SimpleNamespace(balances=balances)
+    assert balance_fields(account) == {
+        "currency": "USD", "current_minor": 30, "available_minor": 1012,
+    }
+
+    account.balances.update(current=1234.5, available=None, iso_currency_code="JPY")
+    assert balance_fields(account) == {
+        "currency": "JPY", "current_minor": 1234, "available_minor": None,
+    }
+
+
+def test_compaction_keeps_recent_days_and_closing_weeks_and_months(
+    db, test_plaid_account, async_session_factory, monkeypatch
+):
+    """Old daily points collapse to weekly, older weekly ones to monthly."""
+    monkeypatch.setattr(settings, "PLAID_BALANCE_DAILY_DAYS", 30)
+    monkeypatch.setattr(settings, "PLAID_BALANCE_WEEKLY_DAYS", 120)
+    today = date(2026, 10, 18)  # A Sunday
+    add_daily_snapshots(db, test_plaid_account.id, today, 365)
+
+    async def compact():
+        async with async_session_factory() as session:
+            return await compact_snapshots(session, today)
+
+    removed = asyncio.run(compact())
+    assert asyncio.run(compact()) == 0
+
+    db.expire_all()
+    rows = (
+        db.query(PlaidBalanceSnapshot)
+        .order_by(PlaidBalanceSnapshot.snapshot_date)
+        .all()
+    )
+    assert len(rows) == 365 - removed
+    by_resolution = {
+        resolution: [r.snapshot_date for r in rows if r.resolution is resolution]
+        for resolution in BalanceResolutionEnum
+    }
+    # Whole weeks before the daily cutoff (Monday 2026-09-14) are weekly
+    assert by_resolution[DAY][0] == date(2026, 9, 14)
+    assert len(by_resolution[DAY]) == 35
+    assert all(d.weekday() == 6 for d in by_resolution[WEEK])
+    # Whole months before the weekly cutoff (2026-06-01) are monthly
+    assert by_resolution[WEEK][0] == date(2026, 6, 7)
+    assert by_resolution[MONTH][-1] == date(2026, 5, 31)
+    # A month closes with its last weekly point
+    assert all((d + timedelta(days=7)).month != d.month for d in by_resolution[MONTH])
+    # Every kept point is the closing balance of its period
+    assert all(r.current_minor == r.snapshot_date.toordinal() for r in rows)
+
+
+def test_balance_history_is_downsampled_to_the_chart_width(
+    client: TestClient, db, test_plaid_account
+):
+    """The range query returns at most ``width`` closing balances."""
+    last_day = datetime.utcnow().date()
+    add_daily_snapshots(db, test_plaid_account.id, last_day, 100)
+    url = f"/api/v1/plaid/accounts/{test_plaid_account.account_id}/balances"
+
+    first_day = last_day - timedelta(days=99)
+    data = client.get(
+        url, params={"start_date": first_day.isoformat(), "width": 10}
+    ).json()
+    assert data["account_id"] == test_plaid_account.account_id
+    assert data["currency"] == "USD"
+    points = data["points"]
+    assert len(points) == 10
+    assert points[-1]["snapshot_date"] == last_day.isoformat()
+    assert points[-1]["current"] == last_day.toordinal() / 100
+    assert points[-1]["available"] is None
+    dates = [p["snapshot_date"] for p in points]
+    assert dates == sorted(dates)
+
+    start = last_day - timedelta(days=4)
+    points = client.get(
+        url, params={"start_date": start.isoformat(), "end_date": last_day.isoformat()}
+    ).json()["points"]
+    assert [p["snapshot_date"] for p in points] == [
+        (start + timedelta(days=n)).isoformat() for n in range(5)
+    ]
+
+    assert client.get(url, params={"width": 1}).status_code == 422
+    assert client.get(
+        url, params={"start_date": last_day.isoformat(), "end_date": start.isoformat()}
+    ).status_code == 400
+    response = client.get("/api/v1/plaid/accounts/unknown/balances")
+    assert response.status_code == 404
@@ -1,12 +1,42 @@
 """
 Tests for Plaid client integration.
 """
+import asyncio
+import gc
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from unittest.mock import Mock, patch
 
+import httpx
 import pytest
 from plaid.model.link_token_create_response import LinkTokenCreateResponse
+from urllib3.exceptions import ReadTimeoutError
 
-from app.utils.plaid_client import PlaidError, create_link_token, get_plaid_client
+from app.config import settings
+from app.main import app
+from app.utils.plaid_client import (
+    GET_PAGE_SIZE,
+    PlaidError,
+    close_plaid_client,
+    create_link_token,
+    create_link_token_async,
+    get_link_token,
+    get_plaid_client,
+    get_transactions,
+    run_plaid_call,
+    sync_transactions,
+)
+from tests import fake_plaid
+from tests.fake_plaid import (
+    FailFirst,
+    FakePlaidApiError,
+    FakePlaidServer,
+    FakeTransactionsGet,
+    FakeTransactionsSync,
+    link_token_create,
+    plaid_transaction,
+)
 
 
 @patch("app.utils.plaid_client.Configuration")
@@ -70,4 +100,338 @@ def test_create_link_token_with_redirect(mock_plaid_api, mock_api_client, mock_c
         assert link_token == "test_link_token_with_redirect", "Link token should match mock response"
         mock_client.link_token_create.assert_called_once()
     except PlaidError as e:
-        pytest.fail(f"Failed to create link token with redirect: {str(e)}") 
\ No newline at end of file
+        pytest.fail(f"Failed to create link token with redirect: {str(e)}")
+
+
+def test_plaid_client_is_shared_and_reuses_connections(monkeypatch):
+    """Test the process-wide client keeps its HTTP connection across calls."""
+    with FakePlaidServer() as server:
+        monkeypatch.setattr(settings, "PLAID_HOST", server.url)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            clients = set(pool.map(lambda _: id(get_plaid_client()), range(16)))
+        assert len(clients) == 1
+
+        for i in range(5):
+            link_token = create_link_token(get_plaid_client(), f"user_{i}")
+            assert link_token.startswith("link-")
+        assert server.requests == ["/link/token/create"] * 5
+        assert server.connections == 1
+
+        close_plaid_client()
+        create_link_token(get_plaid_client(), "user_after_close")
+        assert server.connections == 2
+
+
+def test_sync_transactions_restarts_after_mutation(monkeypatch):
+    """Test a mid-pagination mutation restarts the update from the original cursor."""
+    sync = FakeTransactionsSync({
+        "c0": {
+            "added": [plaid_transaction("t1", "a1", 1, "2024-03-01")],
+            "next_cursor": "c1",
+        },
+        "c1": {
+            "added": [plaid_transaction("t2", "a1", 2, "2024-03-02")],
+            "next_cursor": "c2",
+        },
+    })
+    failures = ["c1"]
+
+    def flaky_sync(body):
+        if body.get("cursor") in failures:
+            failures.remove(body["cursor"])
+            raise FakePlaidApiError("TRANSACTIONS_SYNC_MUTATION_DURING_PAGINATION")
+        return sync(body)
+
+    with FakePlaidServer(routes={"/transactions/sync": flaky_sync}) as server:
+        monkeypatch.setattr(settings, "PLAID_HOST", server.url)
+        changes = sync_transactions(get_plaid_client(), "access-token", "c0")
+
+    assert [t.transaction_id for t in changes["added"]] == ["t1", "t2"]
+    assert changes["next_cursor"] == "c2"
+    assert sync.cursors == ["c0", "c0", "c1"]
+
+
+def test_get_transactions_fetches_every_page_concurrently(monkeypatch):
+    """Test all offset pages are fetched in parallel and merged in order."""
+    total = GET_PAGE_SIZE * 4 + 123
+    transactions = FakeTransactionsGet(
+        [plaid_transaction(f"t{i}", "a1", 1, "2024-03-01") for i in range(total)],
+        latency=0.05,
+    )
+    monkeypatch.setattr(settings, "PLAID_PAGE_CONCURRENCY", 3)
+
+    with FakePlaidServer(routes={"/transactions/get": transactions}) as server:
+        monkeypatch.setattr(settings, "PLAID_HOST", server.url)
+        result = get_transactions(get_plaid_client(), "access-token")
+
+    assert [t.transaction_id for t in result["transactions"]] == [
+        f"t{i}" for i in range(total)
+    ]
+    assert sorted(transactions.offsets) == list(range(0, total, GET_PAGE_SIZE))
+    assert transactions.max_in_flight == 3
+
+
+def test_concurrent_get_transactions_share_the_request_limit(monkeypatch):
+    """Test page fetches of parallel calls stay within PLAID_EXECUTOR_WORKERS."""
+    total = GET_PAGE_SIZE * 4 + 1
+    transactions = FakeTransactionsGet(
+        [plaid_transaction(f"t{i}", "a1", 1, "2024-03-01") for i in range(total)],
+        latency=0.05,
+    )
+    monkeypatch.setattr(settings, "PLAID_EXECUTOR_WORKERS", 3)
+    monkeypatch.setattr(settings, "PLAID_PAGE_CONCURRENCY", 4)
+
+    with FakePlaidServer(routes={"/transactions/get": transactions}) as server:
+        monkeypatch.setattr(settings, "PLAID_HOST", server.url)
+        with ThreadPoolExecutor(max_workers=3) as callers:
+            results = list(callers.map(
+                lambda _: get_transactions(get_plaid_client(), "access-token"), range(3)
+            ))
+
+    assert all(len(result["transactions"]) == total for result in results)
+    assert transactions.max_in_flight == 3
+
+
+def test_run_plaid_call_times_out(monkeypatch, client):
+    """Test a Plaid call slower than its timeout fails fast with a 504."""
+    monkeypatch.setattr(settings, "PLAID_CALL_TIMEOUT", 0.1)
+    with FakePlaidServer(latency=0.5) as server:
+        monkeypatch.setattr(settings, "PLAID_HOST", server.url)
+        with pytest.raises(PlaidError) as exc_info:
+            asyncio.run(create_link_token_async(get_plaid_client(), "slow_user"))
+        assert exc_info.value.error_code == "PLAID_TIMEOUT"
+
+        response = client.post(
+            "/api/v1/plaid/create_link_token", json={"user_id": "slow_user"}
+        )
+        assert response.status_code == 504
+        assert response.json()["detail"]["error_code"] == "PLAID_TIMEOUT"
+
+
+def test_run_plaid_call_keeps_late_errors_that_are_not_timeouts(monkeypatch):
+    """Test only timeouts are reported as PLAID_TIMEOUT once the deadline passed."""
+
+    async def wait_without_timeout(future, timeout):
+        return await future
+
+    def fail_late(error, *, deadline):
+        time.sleep(max(deadline - time.monotonic(), 0) + 0.01)
+        raise error
+
+    read_timeout = PlaidError("Failed to create link token: Read timed out.")
+    read_timeout.__cause__ = ReadTimeoutError(None, "/link/token/create", "timed out")
+
+    # Let each error arrive after the deadline, before wait_for notices it
+    monkeypatch.setattr(asyncio, "wait_for", wait_without_timeout)
+    for error, error_code in [
+        (PlaidError("Login required", "ITEM_LOGIN_REQUIRED"), "ITEM_LOGIN_REQUIRED"),
+        (PlaidError("Breaker open", "CIRCUIT_OPEN"), "CIRCUIT_OPEN"),
+        (read_timeout, "PLAID_TIMEOUT"),
+    ]:
+        with pytest.raises(PlaidError) as exc_info:
+            asyncio.run(run_plaid_call(fail_late, error, timeout=0.05))
+        assert exc_info.value.error_code == error_code
+
+
+def test_slow_plaid_calls_do_not_block_other_requests(monkeypatch, client):
+    """Load test: unrelated endpoints stay fast while Plaid calls are slow."""
+    latency = 0.5
+    monkeypatch.setattr(settings, "PLAID_EXECUTOR_WORKERS", 4)
+
+    async def load():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as http:
+
+            async def link_tokens():
+                started = time.perf_counter()
+                responses = await asyncio.gather(*(
+                    http.post(
+                        "/api/v1/plaid/create_link_token",
+                        json={"user_id": f"user_{i}"},
+                    )
+                    for i in range(8)
+                ))
+                return [r.status_code for r in responses], time.perf_counter() - started
+
+            async def ping():
+                # Time from when each request is due, so a stalled loop counts too
+                latencies = []
+                for _ in range(20):
+                    due = time.perf_counter() + 0.05
+                    await asyncio.sleep(0.05)
+                    assert (await http.get("/")).status_code == 200
+                    latencies.append(time.perf_counter() - due)
+                return latencies
+
+            (statuses, elapsed), latencies = await asyncio.gather(link_tokens(), ping())
+            return statuses, elapsed, latencies
+
+    # Keep objects left by earlier tests out of the collector: a full
+    # collection of them pauses the loop for longer than the ping budget
+    gc.collect()
+    gc.freeze()
+    try:
+        with FakePlaidServer(latency=latency) as server:
+            monkeypatch.setattr(settings, "PLAID_HOST", server.url)
+            statuses, elapsed, latencies = asyncio.run(load())
+    finally:
+        gc.unfreeze()
+
+    assert statuses == [200] * 8
+    # 8 calls on 4 Plaid threads take two rounds
+    assert elapsed >= 2 * latency
+    assert max(latencies) < 0.1
+
+
+@pytest.fixture
+def fast_retries(monkeypatch):
+    """Retry settings that keep backoff sleeps short."""
+    monkeypatch.setattr(settings, "PLAID_RETRY_ATTEMPTS", 4)
+    monkeypatch.setattr(settings, "PLAID_RETRY_BASE_DELAY", 0.01)
+    monkeypatch.setattr(settings, "PLAID_RETRY_MAX_DELAY", 0.05)
+
+
+def test_transient_plaid_errors_are_retried(monkeypatch, fast_retries):
+    """Test rate limits and 5xx responses are retried until the call succeeds."""
+    route = FailFirst(link_token_create, [
+        FakePlaidApiError("TRANSACTIONS_LIMIT", 429, "RATE_LIMIT_EXCEEDED"),
+        FakePlaidApiError("INTERNAL_SERVER_ERROR", 500),
+        FakePlaidApiError("INSTITUTION_DOWN", 400, "INSTITUTION_ERROR"),
+    ])
+    with FakePlaidServer(routes={"/link/token/create": route}) as server:
+        monkeypatch.setattr(settings, "PLAID_HOST", server.url)
+        assert create_link_token(get_plaid_client(), "user").startswith("link-")
+    assert len(server.requests) == 4
+
+
+def test_permanent_plaid_errors_are_not_retried(monkeypatch, fast_retries):
+    """Test a bad request fails at once."""
+    route = FailFirst(
+        link_token_create,
+        [FakePlaidApiError("INVALID_FIELD", 400, "INVALID_REQUEST")],
+    )
+    with FakePlaidServer(routes={"/link/token/create": route}) as server:
+        monkeypatch.setattr(settings, "PLAID_HOST", server.url)
+        with pytest.raises(PlaidError):
+            create_link_token(get_plaid_client(), "user")
+    assert len(server.requests) == 1
+
+
+def test_retries_stop_when_the_time_budget_runs_out(monkeypatch):
+    """Test no retry starts after the caller's deadline."""
+    monkeypatch.setattr(settings, "PLAID_RETRY_ATTEMPTS", 100)
+    monkeypatch.setattr(settings, "PLAID_RETRY_BASE_DELAY", 0.1)
+    monkeypatch.setattr(settings, "PLAID_RETRY_MAX_DELAY", 0.1)
+    route = FailFirst(
+        link_token_create, [FakePlaidApiError("INTERNAL_SERVER_ERROR", 503)] * 100
+    )
+    with FakePlaidServer(routes={"/link/token/create": route}) as server:
+        monkeypatch.setattr(settings, "PLAID_HOST", server.url)
+        started = time.monotonic()
+        with pytest.raises(PlaidError):
+            create_link_token(get_plaid_client(), "user", deadline=started + 0.3)
+        assert time.monotonic() - started < 0.4
+    assert 1 < len(server.requests) < 10
+
+
+def test_circuit_breaker_fails_fast_per_institution(monkeypatch, fast_retries):
+    """Test an institution that keeps failing is cut off, and only that one."""
+    monkeypatch.setattr(settings, "PLAID_BREAKER_THRESHOLD", 2)
+    monkeypatch.setattr(settings, "PLAID_BREAKER_RESET_TIMEOUT", 0.2)
+    healthy = FakeTransactionsGet([])
+    down = {"ins_down"}
+
+    def transactions_get(body):
+        if body["access_token"] in down:
+            raise FakePlaidApiError(
+                "INSTITUTION_NOT_RESPONDING", 400, "INSTITUTION_ERROR"
+            )
+        return healthy(body)
+
+    with FakePlaidServer(routes={"/transactions/get": transactions_get}) as server:
+        monkeypatch.setattr(settings, "PLAID_HOST", server.url)
+        plaid = get_plaid_client()
+
+        for _ in range(2):
+            with pytest.raises(PlaidError):
+                get_transactions(plaid, "ins_down", institution_id="ins_down")
+        sent = len(server.requests)
+        with pytest.raises(PlaidError) as exc_info:
+            get_transactions(plaid, "ins_down", institution_id="ins_down")
+        assert exc_info.value.error_code == "CIRCUIT_OPEN"
+        assert len(server.requests) == sent
+        result = get_transactions(plaid, "ins_up", institution_id="ins_up")
+        assert result["transactions"] == []
+
+        # After the reset timeout a trial call goes through and closes the circuit
+        down.clear()
+        time.sleep(0.2)
+        result = get_transactions(plaid, "ins_down", institution_id="ins_down")
+        assert result["transactions"] == []
+
+
+def test_link_tokens_are_reused_until_near_expiry(monkeypatch):
+    """Test a user's Link token is cached and concurrent requests share one call."""
+    expiration = datetime.now(timezone.utc) + timedelta(hours=4)
+
+    def link_token_create(body):
+        return {
+            **fake_plaid.link_token_create(body),
+            "expiration": expiration.isoformat(),
+        }
+
+    async def get_tokens(user_id, count, use_redirect=False):
+        return await asyncio.gather(
+            *(
+                get_link_token(get_plaid_client(), user_id, use_redirect)
+                for _ in range(count)
+            )
+        )
+
+    with FakePlaidServer(latency=0.1) as server:
+        server.routes["/link/token/create"] = link_token_create
+        monkeypatch.setattr(settings, "PLAID_HOST", server.url)
+
+        tokens = asyncio.run(get_tokens("user", 5))
+        assert len(set(tokens)) == 1
+        assert asyncio.run(get_tokens("user", 1)) == tokens[:1]
+        assert server.requests.count("/link/token/create") == 1
+
+        # Another redirect mode or user gets its own token
+        assert asyncio.run(get_tokens("user", 1, use_redirect=True)) != tokens[:1]
+        assert asyncio.run(get_tokens("other", 1)) != tokens[:1]
+        assert server.requests.count("/link/token/create") == 3
+
+        # A token within the refresh margin of its expiration is replaced
+        expiration = datetime.now(timezone.utc) + timedelta(
+            seconds=settings.PLAID_LINK_TOKEN_REFRESH_MARGIN + 0.2
+        )
+        fresh = asyncio.run(get_tokens("soon", 1))
+        time.sleep(0.3)
+        assert asyncio.run(get_tokens("soon", 1)) != fresh
+        assert server.requests.count("/link/token/create") == 5
+
+
+def test_failed_link_token_requests_reach_every_caller_and_are_not_cached(
+    monkeypatch,
+):
+    """Test concurrent callers share a failure, and the next call tries again."""
+    async def get_tokens(count):
+        return await asyncio.gather(
+            *(get_link_token(get_plaid_client(), "user") for _ in range(count)),
+            return_exceptions=True,
+        )
+
+    with FakePlaidServer(latency=0.1) as server:
+        server.routes["/link/token/create"] = FailFirst(
+            fake_plaid.link_token_create,
+            [FakePlaidApiError("INVALID_FIELD", 400, "INVALID_REQUEST")],
+        )
+        monkeypatch.setattr(settings, "PLAID_HOST", server.url)
+
+        results = asyncio.run(get_tokens(3))
+        assert all(isinstance(r, PlaidError) for r in results)
+        assert asyncio.run(get_tokens(1))[0].startswith("link-")
+        assert server.requests.count("/link/token/create") == 2
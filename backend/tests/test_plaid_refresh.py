@@ -0,0 +1,303 @@
+"""
+Tests for the background Plaid refresh worker.
+"""
+import asyncio
+import json
+import threading
+import time
+import uuid
+
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.main import app
+from app.models.plaid import PlaidItem
+from app.services.plaid_refresh import PlaidRefreshWorker, get_refresh_worker
+from tests.fake_plaid import FakePlaidApiError, FakePlaidServer, FakeWebhookSigner
+
+
+class RecordingSync:
+    """/transactions/sync handler with no changes that records every call."""
+
+    def __init__(self, latency: float, failing_tokens=()):
+        self.latency = latency
+        self.failing_tokens = set(failing_tokens)
+        self.started = {}
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, body):
+        with self._lock:
+            self.started[body["access_token"]] = time.monotonic()
+            self.calls.append(body["access_token"])
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.latency)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        if body["access_token"] in self.failing_tokens:
+            raise FakePlaidApiError("ITEM_LOGIN_REQUIRED")
+        return {
+            "added": [],
+            "modified": [],
+            "removed": [],
+            "next_cursor": "cursor-1",
+            "has_more": False,
+            "request_id": uuid.uuid4().hex,
+        }
+
+
+def post_webhook(client, signer, payload, **sign_options):
+    """POST ``payload`` to the webhook endpoint, signed unless ``signer`` is None."""
+    body = json.dumps(payload).encode()
+    headers = {"Content-Type": "application/json"}
+    if signer is not None:
+        headers["Plaid-Verification"] = signer.sign(body, **sign_options)
+    return client.post("/api/v1/plaid/webhook", content=body, headers=headers)
+
+
+def add_items(db, user, institutions):
+    for n, institution_id in enumerate(institutions):
+        db.add(PlaidItem(
+            user_id=user.id,
+            item_id=f"item_{n}",
+            access_token=f"token_{n}",
+            institution_id=institution_id,
+            institution_name=institution_id,
+        ))
+    db.commit()
+
+
+def test_refresh_all_bounds_concurrency_and_records_outcomes(
+    db, test_user, async_session_factory, monkeypatch
+):
+    """Items sync in parallel within the limits; each outcome lands on its item."""
+    add_items(db, test_user, ["ins_a", "ins_a", "ins_a", "ins_b", "ins_b", "ins_c"])
+    sync = RecordingSync(latency=0.1, failing_tokens={"token_4"})
+    worker = PlaidRefreshWorker(concurrency=2, institution_interval=0.3)
+
+    with FakePlaidServer(routes={"/transactions/sync": sync}) as server:
+        monkeypatch.setattr(settings, "PLAID_HOST", server.url)
+        outcomes = asyncio.run(worker.refresh_all(async_session_factory))
+
+    assert sorted(o.item_id for o in outcomes) == [f"item_{n}" for n in range(6)]
+    assert sync.max_in_flight == 2
+    starts = sorted(sync.started[f"token_{n}"] for n in range(3))
+    assert all(b - a >= 0.25 for a, b in zip(starts, starts[1:]))
+
+    db.expire_all()
+    items = {item.item_id: item for item in db.query(PlaidItem).all()}
+    failed = items.pop("item_4")
+    assert failed.last_synced_at is None
+    assert failed.last_sync_error.startswith("ITEM_LOGIN_REQUIRED")
+    assert failed.transactions_cursor is None
+    for item in items.values():
+        assert item.last_synced_at is not None
+        assert item.last_sync_duration_ms >= 100
+        assert item.last_sync_error is None
+        assert item.transactions_cursor == "cursor-1"
+
+
+def test_refresh_all_survives_deleted_and_crashing_items(
+    db, test_user, async_session_factory, monkeypatch
+):
+    """A deleted item is skipped and an unexpected error stays with its item."""
+    add_items(db, test_user, ["ins_a", "ins_b", "ins_c"])
+    sync = RecordingSync(latency=0)
+    worker = PlaidRefreshWorker(concurrency=3, institution_interval=0)
+    record = PlaidRefreshWorker._record
+
+    async def failing_record(db, plaid_item, duration_ms, error):
+        if plaid_item.item_id == "item_1":
+            raise RuntimeError("database unavailable")
+        await record(db, plaid_item, duration_ms, error)
+
+    monkeypatch.setattr(PlaidRefreshWorker, "_record", staticmethod(failing_record))
+    with FakePlaidServer(routes={"/transactions/sync": sync}) as server:
+        monkeypatch.setattr(settings, "PLAID_HOST", server.url)
+        assert asyncio.run(worker.refresh_item(async_session_factory, 999)) is None
+        outcomes = asyncio.run(worker.refresh_all(async_session_factory))
+
+    errors = {o.item_id: o.error for o in outcomes}
+    assert errors == {"item_0": None, "item_1": "database unavailable", "item_2": None}
+    db.expire_all()
+    assert db.query(PlaidItem).filter_by(item_id="item_2").one().last_synced_at
+
+
+def test_failed_snapshot_keeps_the_sync_recorded(
+    db, test_user, async_session_factory, monkeypatch
+):
+    """A sync that committed stays recorded when the balance snapshot fails."""
+    add_items(db, test_user, ["ins_a"])
+    item_id = db.query(PlaidItem.id).scalar()
+    worker = PlaidRefreshWorker(concurrency=1, institution_interval=0)
+
+    def accounts_get(body):
+        raise FakePlaidApiError("PRODUCTS_NOT_SUPPORTED")
+
+    routes = {
+        "/transactions/sync": RecordingSync(latency=0),
+        "/accounts/get": accounts_get,
+    }
+    with FakePlaidServer(routes=routes) as server:
+        monkeypatch.setattr(settings, "PLAID_HOST", server.url)
+        outcome = asyncio.run(worker.refresh_item(async_session_factory, item_id))
+
+    assert outcome.error is None
+    assert outcome.snapshot_error.startswith("Failed to retrieve accounts")
+    db.expire_all()
+    item = db.get(PlaidItem, item_id)
+    assert item.last_synced_at is not None
+    assert item.last_sync_error is None
+    assert item.transactions_cursor == "cursor-1"
+
+
+def test_refresh_endpoint_runs_in_background(
+    client: TestClient, db, test_user, monkeypatch
+):
+    """POST /plaid/refresh returns at once; GET /plaid/items shows the result."""
+    add_items(db, test_user, ["ins_a", "ins_b"])
+    sync = RecordingSync(latency=0.2)
+    worker = PlaidRefreshWorker(concurrency=2, institution_interval=0)
+    monkeypatch.setattr(settings, "PLAID_REFRESH_INTERVAL", 0)
+    app.dependency_overrides[get_refresh_worker] = lambda: worker
+
+    try:
+        # Entering the client keeps one event loop alive across requests
+        with FakePlaidServer(routes={"/transactions/sync": sync}) as server, client:
+            monkeypatch.setattr(settings, "PLAID_HOST", server.url)
+
+            started = time.monotonic()
+            response = client.post("/api/v1/plaid/refresh")
+            assert response.status_code == 202
+            assert response.json() == {"started": True}
+            assert time.monotonic() - started < 0.2
+            assert client.post("/api/v1/plaid/refresh").json() == {"started": False}
+
+            deadline = time.monotonic() + 5
+            while worker.refreshing and time.monotonic() < deadline:
+                time.sleep(0.02)
+            items = client.get("/api/v1/plaid/items").json()
+    finally:
+        app.dependency_overrides.pop(get_refresh_worker, None)
+
+    assert [item["item_id"] for item in items] == ["item_0", "item_1"]
+    for item in items:
+        assert item["last_synced_at"] is not None
+        assert item["last_sync_error"] is None
+
+
+def test_enqueue_coalesces_and_resyncs_after_a_change_mid_sync(
+    db, test_user, async_session_factory, monkeypatch
+):
+    """Requests before a queued sync starts are absorbed; one during it adds a rerun."""
+    add_items(db, test_user, ["ins_a"])
+    item_id = db.query(PlaidItem.id).scalar()
+    sync = RecordingSync(latency=0.3)
+    worker = PlaidRefreshWorker(concurrency=1, institution_interval=0, debounce=0.1)
+
+    async def burst():
+        assert worker.enqueue(async_session_factory, item_id)
+        assert not worker.enqueue(async_session_factory, item_id)
+        while not sync.in_flight:  # Debounce over, first sync in flight
+            await asyncio.sleep(0.01)
+        assert not worker.enqueue(async_session_factory, item_id)
+        while worker.queued:
+            await asyncio.sleep(0.02)
+
+    with FakePlaidServer(routes={"/transactions/sync": sync}) as server:
+        monkeypatch.setattr(settings, "PLAID_HOST", server.url)
+        asyncio.run(burst())
+
+    assert sync.calls == ["token_0", "token_0"]
+
+
+def test_webhook_queues_a_sync_of_only_that_item(
+    client: TestClient, db, test_user, monkeypatch
+):
+    """A burst of TRANSACTIONS webhooks for one item triggers one sync of it."""
+    add_items(db, test_user, ["ins_a", "ins_b"])
+    sync = RecordingSync(latency=0.05)
+    worker = PlaidRefreshWorker(concurrency=1, institution_interval=0, debounce=0.1)
+    signer = FakeWebhookSigner()
+    monkeypatch.setattr(settings, "PLAID_REFRESH_INTERVAL", 0)
+    app.dependency_overrides[get_refresh_worker] = lambda: worker
+
+    def webhook(code, item_id="item_0", type="TRANSACTIONS"):
+        response = post_webhook(
+            client,
+            signer,
+            {"webhook_type": type, "webhook_code": code, "item_id": item_id},
+        )
+        assert response.status_code == 200
+        return response.json()["status"]
+
+    routes = {"/transactions/sync": sync, "/webhook_verification_key/get": signer}
+    try:
+        with FakePlaidServer(routes=routes) as server, client:
+            monkeypatch.setattr(settings, "PLAID_HOST", server.url)
+
+            assert webhook("SYNC_UPDATES_AVAILABLE") == "queued"
+            assert webhook("DEFAULT_UPDATE") == "coalesced"
+            assert webhook("TRANSACTIONS_REMOVED") == "coalesced"
+            assert webhook("SYNC_UPDATES_AVAILABLE", item_id="unknown") == "ignored"
+            assert webhook("ERROR", type="ITEM") == "ignored"
+
+            deadline = time.monotonic() + 5
+            while worker.queued and time.monotonic() < deadline:
+                time.sleep(0.02)
+    finally:
+        app.dependency_overrides.pop(get_refresh_worker, None)
+
+    assert sync.calls == ["token_0"]
+    db.expire_all()
+    assert db.query(PlaidItem).filter_by(item_id="item_0").one().last_synced_at
+    assert db.query(PlaidItem).filter_by(item_id="item_1").one().last_synced_at is None
+
+
+def test_webhook_without_a_valid_signature_is_rejected(
+    client: TestClient, db, test_user, monkeypatch
+):
+    """Unsigned, forged, stale or tampered webhooks get a 401 and queue nothing."""
+    add_items(db, test_user, ["ins_a"])
+    worker = PlaidRefreshWorker(concurrency=1, institution_interval=0)
+    signer = FakeWebhookSigner()
+    payload = {
+        "webhook_type": "TRANSACTIONS",
+        "webhook_code": "SYNC_UPDATES_AVAILABLE",
+        "item_id": "item_0",
+    }
+    app.dependency_overrides[get_refresh_worker] = lambda: worker
+
+    try:
+        with FakePlaidServer(
+            routes={"/webhook_verification_key/get": signer}
+        ) as server, client:
+            monkeypatch.setattr(settings, "PLAID_HOST", server.url)
+
+            responses = [
+                post_webhook(client, None, payload),
+                post_webhook(client, FakeWebhookSigner(), payload),
+                post_webhook(client, signer, payload, key_id="unknown-key"),
+                post_webhook(client, signer, payload, issued_at=time.time() - 600),
+            ]
+            body = json.dumps(payload).encode()
+            responses.append(client.post(
+                "/api/v1/plaid/webhook",
+                content=body.replace(b"item_0", b"item_1"),
+                headers={
+                    "Content-Type": "application/json",
+                    "Plaid-Verification": signer.sign(body),
+                },
+            ))
+            queued = worker.queued
+    finally:
+        app.dependency_overrides.pop(get_refresh_worker, None)
+
+    assert [r.status_code for r in responses] == [401] * 5
+    assert {r.json()["detail"]["error_code"] for r in responses} == {"INVALID_WEBHOOK"}
+    assert not queued
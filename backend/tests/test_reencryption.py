@@ -0,0 +1,132 @@
+"""
+Tests for encryption key rotation and the background re-encryption job.
+"""
+import asyncio
+import json
+import logging
+from datetime import datetime
+
+import pytest
+from cryptography.fernet import Fernet, MultiFernet
+
+from app.core import security
+from app.core.security import ENCRYPTION_KEY_ID, decrypt_json, key_id
+from app.models.personality import PersonalityProfile
+from app.models.user import User
+from app.services.reencryption import ProfileReencryptionJob
+
+TRAITS = {
+    "openness": "c",
+    "social_energy": "a",
+    "learning_style": "b",
+    "activity_intensity": "c",
+}
+
+
+@pytest.fixture
+def old_key():
+    return Fernet.generate_key()
+
+
+@pytest.fixture
+def rotated(old_key, monkeypatch):
+    """Current ENCRYPTION_KEY, with ``old_key`` configured as a previous key."""
+    monkeypatch.setattr(
+        security,
+        "fernet",
+        MultiFernet([Fernet(security.ENCRYPTION_KEY), Fernet(old_key)]),
+    )
+
+
+def add_profiles(db, count, old_key):
+    """``count`` profiles encrypted with ``old_key``, as before a rotation."""
+    updated_at = datetime(2026, 1, 1)
+    profiles = []
+    for n in range(count):
+        user = User(email=f"user{n}@example.com", hashed_password="x")
+        db.add(user)
+        db.flush()
+        profiles.append(PersonalityProfile(
+            user_id=user.id,
+            encrypted_traits=Fernet(old_key).encrypt(json.dumps(TRAITS).encode()),
+            encryption_key_id=key_id(old_key) if n % 2 else None,
+            updated_at=updated_at,
+        ))
+    db.add_all(profiles)
+    db.commit()
+    return profiles
+
+
+def test_previous_keys_decrypt_and_unknown_keys_are_logged(old_key, rotated, caplog):
+    """Tokens from a previous key still decrypt; undecryptable ones are reported."""
+    token = Fernet(old_key).encrypt(b'{"openness":"c"}')
+    assert decrypt_json(token) == {"openness": "c"}
+
+    new_token = security.rotate_token(token)
+    assert Fernet(security.ENCRYPTION_KEY).decrypt(new_token) == b'{"openness":"c"}'
+
+    with caplog.at_level(logging.WARNING, logger="app.core.security"):
+        assert decrypt_json(Fernet(Fernet.generate_key()).encrypt(b"{}")) == {}
+    assert "Could not decrypt" in caplog.text
+
+
+def test_job_reencrypts_profiles_in_chunks_and_resumes(
+    db, old_key, rotated, async_session_factory, caplog
+):
+    """Profiles move to the current key chunk by chunk; versions are kept."""
+    profiles = add_profiles(db, 5, old_key)
+    broken = profiles[3]
+    broken.encrypted_traits = Fernet(Fernet.generate_key()).encrypt(b"{}")
+    db.commit()
+
+    job = ProfileReencryptionJob(chunk_size=2, pause=0)
+    # A stopped pass leaves its committed chunk on the current key ...
+    assert asyncio.run(job.run_chunk(async_session_factory)) == 2
+    db.expire_all()
+    assert [p.encryption_key_id for p in profiles[:2]] == [ENCRYPTION_KEY_ID] * 2
+
+    # ... and the next pass only visits the rest
+    with caplog.at_level(logging.ERROR, logger="app.services.reencryption"):
+        progress = asyncio.run(job.run(async_session_factory))
+    assert (progress.rotated, progress.conflicts, progress.failed) == (2, 0, 1)
+    assert f"[{broken.id}]" in caplog.text
+
+    db.expire_all()
+    current = Fernet(security.ENCRYPTION_KEY)
+    for profile in profiles:
+        if profile is broken:
+            assert profile.encryption_key_id != ENCRYPTION_KEY_ID
+            continue
+        assert profile.encryption_key_id == ENCRYPTION_KEY_ID
+        assert profile.updated_at == datetime(2026, 1, 1)
+        assert current.decrypt(profile.encrypted_traits)
+        assert profile.get_personality_data() == TRAITS
+
+    # Nothing left but the undecryptable row
+    progress = asyncio.run(job.run(async_session_factory))
+    assert (progress.rotated, progress.failed) == (0, 1)
+
+
+def test_job_does_not_overwrite_concurrent_writes(
+    db, old_key, rotated, async_session_factory, monkeypatch
+):
+    """A profile rewritten after the chunk was read keeps the new traits."""
+    [profile] = add_profiles(db, 1, old_key)
+    job = ProfileReencryptionJob(chunk_size=10, pause=0)
+
+    from app.services import reencryption
+
+    def rotate_and_race(rows):
+        params, failed = rotate_rows(rows)
+        profile.set_personality_data({**TRAITS, "openness": "a"})
+        db.commit()
+        return params, failed
+
+    rotate_rows = reencryption.rotate_rows
+    monkeypatch.setattr(reencryption, "rotate_rows", rotate_and_race)
+    progress = asyncio.run(job.run(async_session_factory))
+    assert (progress.rotated, progress.conflicts) == (0, 1)
+
+    db.expire_all()
+    assert profile.get_personality_data()["openness"] == "a"
+    assert profile.encryption_key_id == ENCRYPTION_KEY_ID
@@ -0,0 +1,44 @@
+"""
+Tests for retry backoff and the circuit breaker.
+"""
+import time
+
+from app.utils.resilience import CircuitBreaker, CircuitState, backoff_delay
+
+
+def test_backoff_delay_is_jittered_exponential_and_capped():
+    for attempt, ceiling in [(0, 0.5), (1, 1.0), (2, 2.0), (10, 8.0)]:
+        delays = [backoff_delay(attempt, base=0.5, cap=8.0) for _ in range(200)]
+        assert all(0 <= delay <= ceiling for delay in delays)
+        assert max(delays) > ceiling / 2
+
+
+def test_circuit_opens_after_threshold_and_half_opens_after_timeout():
+    breaker = CircuitBreaker(threshold=3, reset_timeout=0.05)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN
+    assert not breaker.allow()
+
+    time.sleep(0.05)
+    assert breaker.allow()  # The one trial call
+    assert breaker.state is CircuitState.HALF_OPEN
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN
+
+    time.sleep(0.05)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state is CircuitState.CLOSED
+    assert breaker.allow()
+
+
+def test_success_resets_the_failure_count():
+    breaker = CircuitBreaker(threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state is CircuitState.CLOSED
@@ -0,0 +1,62 @@
+"""
+Query plan checks for transaction listings.
+
+Every supported filter combination is compiled and run through
+``EXPLAIN QUERY PLAN``; a full table scan or a sort of the whole result set
+fails the build.
+"""
+import itertools
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.crud.transaction import transaction_list_query
+from app.schemas.enums import TransactionStatusEnum, TransactionTypeEnum
+
+FILTER_VALUES = {
+    "user_id": [None, 1],
+    "status": [None, TransactionStatusEnum.POSTED],
+    "type": [None, TransactionTypeEnum.EXPENSE],
+    "start_date": [None, datetime(2024, 1, 1)],
+    "end_date": [None, datetime(2024, 12, 31)],
+    "after": [None, (datetime(2024, 6, 1), 42)],
+}
+
+COMBINATIONS = [
+    dict(zip(FILTER_VALUES, values))
+    for values in itertools.product(*FILTER_VALUES.values())
+]
+
+
+def _combination_id(filters):
+    active = [name for name, value in filters.items() if value is not None]
+    return "+".join(active) or "unfiltered"
+
+
+def query_plan(db: Session, **filters) -> list:
+    """Return the EXPLAIN QUERY PLAN detail lines for a listing query."""
+    query = transaction_list_query(limit=100, **filters)
+    sql = query.compile(
+        db.get_bind(), compile_kwargs={"literal_binds": True}
+    )
+    rows = db.execute(text(f"EXPLAIN QUERY PLAN {sql}")).fetchall()
+    return [row[-1] for row in rows]
+
+
+@pytest.mark.parametrize(
+    "filters", COMBINATIONS, ids=map(_combination_id, COMBINATIONS)
+)
+def test_transaction_listing_uses_index(db: Session, filters):
+    plan = query_plan(db, **filters)
+    details = " | ".join(plan)
+
+    assert not any(
+        line.startswith("SCAN transactions") and "INDEX" not in line for line in plan
+    ), f"Full table scan: {details}"
+    assert not any("TEMP B-TREE" in line for line in plan), f"Sort step: {details}"
+    if filters["user_id"] is not None or filters["status"] is not None:
+        # Equality filters must seek into a composite index, not walk one
+        assert plan[0].startswith("SEARCH transactions USING"), details
+
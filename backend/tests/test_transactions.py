@@ -1,13 +1,22 @@
 """
 Tests for transaction endpoints.
 """
+import asyncio
+import csv
+import io
+import json
 import pytest
 from datetime import datetime, timedelta
 from fastapi import status
 from sqlalchemy.orm import Session
 
+from app.crud import transaction as transaction_crud
 from app.models.transaction import Transaction
+from app.models.transaction_rollup import TransactionRollup
+from app.models.user import User
 from app.schemas.enums import TransactionTypeEnum, TransactionStatusEnum
+from app.schemas.transaction import MAX_BULK_TRANSACTIONS
+from app.schemas.transaction import Transaction as TransactionSchema
 
 
 def test_create_transaction(client, test_transaction):
@@ -281,4 +290,350 @@ def test_get_transactions_by_date_range(client, db: Session, test_user, test_pla
     response = client.get(f"/api/v1/transactions/?start_date={start_date}&end_date={end_date}")
     assert response.status_code == status.HTTP_200_OK
     data = response.json()
-    assert len(data) == 1  # Only the transaction with base_date should be included 
\ No newline at end of file
+    assert len(data) == 1  # Only the transaction with base_date should be included 
+
+def test_list_transactions_cursor_pagination(
+    client, db: Session, test_user, test_plaid_account
+):
+    """Test walking all pages with the keyset cursor."""
+    base_date = datetime(2024, 3, 1)
+    for i in range(5):
+        db.add(Transaction(
+            amount=10.0 + i,
+            currency="USD",
+            type=TransactionTypeEnum.EXPENSE,
+            status=TransactionStatusEnum.POSTED,
+            category="groceries",
+            # Two rows share each date so the id tie-breaker is exercised
+            transaction_date=base_date + timedelta(days=i // 2),
+            posted_date=base_date + timedelta(days=i // 2),
+            user_id=test_user.id,
+            plaid_item_id=test_plaid_account.plaid_item_id,
+            plaid_account_id=test_plaid_account.id
+        ))
+    db.commit()
+
+    seen = []
+    response = client.get("/api/v1/transactions/?limit=2")
+    while True:
+        assert response.status_code == status.HTTP_200_OK
+        seen.extend(t["id"] for t in response.json())
+        next_cursor = response.headers.get("X-Next-Cursor")
+        if not next_cursor:
+            break
+        response = client.get(f"/api/v1/transactions/?limit=2&cursor={next_cursor}")
+
+    offset_ids = [t["id"] for t in client.get("/api/v1/transactions/").json()]
+    assert seen == offset_ids
+    assert len(seen) == 5
+
+
+def test_list_transactions_invalid_cursor(client):
+    response = client.get("/api/v1/transactions/?cursor=not-a-cursor")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_bulk_create_transactions(client, db: Session, test_transaction):
+    """Test bulk ingestion with a mix of valid and invalid rows."""
+    bad_reference = dict(test_transaction, plaid_account_id=999)
+    bad_currency = dict(test_transaction, currency="INVALID")
+    bad_amount = dict(test_transaction, amount=-5)
+    rows = [test_transaction, bad_reference, test_transaction, bad_currency, bad_amount]
+
+    response = client.post("/api/v1/transactions/bulk", json=rows)
+    assert response.status_code == status.HTTP_201_CREATED
+    data = response.json()
+    assert data["created"] == 2
+    assert data["failed"] == 3
+    assert [e["index"] for e in data["errors"]] == [1, 3, 4]
+    assert "plaid_account_id" in data["errors"][0]["errors"]
+    assert "currency" in data["errors"][1]["errors"]
+    assert "amount" in data["errors"][2]["errors"]
+    assert db.query(Transaction).count() == 2
+
+
+def test_bulk_create_transactions_too_many(client, test_transaction):
+    rows = [test_transaction] * (MAX_BULK_TRANSACTIONS + 1)
+    response = client.post("/api/v1/transactions/bulk", json=rows)
+    assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+
+
+def test_export_transactions(client, db: Session, test_user, test_plaid_account):
+    """Test streaming exports in both formats with filters applied."""
+    statuses = [TransactionStatusEnum.PENDING, TransactionStatusEnum.POSTED] * 3
+    for i, txn_status in enumerate(statuses):
+        db.add(Transaction(
+            amount=10.0 + i,
+            currency="USD",
+            type=TransactionTypeEnum.EXPENSE,
+            status=txn_status,
+            category="groceries",
+            transaction_date=datetime(2024, 3, 1) + timedelta(days=i),
+            posted_date=datetime(2024, 3, 1) + timedelta(days=i),
+            user_id=test_user.id,
+            plaid_item_id=test_plaid_account.plaid_item_id,
+            plaid_account_id=test_plaid_account.id
+        ))
+    db.commit()
+
+    response = client.get("/api/v1/transactions/export?format=ndjson&status=posted")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 3
+    assert all(row["status"] == "posted" for row in rows)
+    assert [row["amount"] for row in rows] == [11.0, 13.0, 15.0]
+
+    response = client.get("/api/v1/transactions/export?format=csv")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/csv")
+    records = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(records) == 6
+    assert records[0]["transaction_date"] == "2024-03-01T00:00:00"
+
+
+def test_list_transactions_by_user(client, db: Session, test_transaction):
+    other_user = User(email="other@example.com", hashed_password="hash")
+    db.add(other_user)
+    db.commit()
+
+    client.post("/api/v1/transactions/", json=test_transaction)
+    client.post(
+        "/api/v1/transactions/", json=dict(test_transaction, user_id=other_user.id)
+    )
+
+    response = client.get(f"/api/v1/transactions/?user_id={other_user.id}")
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 1
+    assert data[0]["user_id"] == other_user.id
+
+
+def test_transaction_summary_tracks_changes(client, test_transaction):
+    """Test rollups follow creates, bulk creates, updates and deletes."""
+    march = dict(test_transaction, transaction_date="2024-03-05T10:00:00")
+    april = dict(test_transaction, transaction_date="2024-04-02T10:00:00", amount=40.0)
+
+    created = client.post("/api/v1/transactions/", json=march).json()
+    client.post("/api/v1/transactions/bulk", json=[march, april])
+
+    user_id = test_transaction["user_id"]
+    response = client.get(f"/api/v1/transactions/summary?user_id={user_id}")
+    assert response.status_code == 200
+    assert [
+        (b["year_month"], b["category"], b["total"], b["count"])
+        for b in response.json()
+    ] == [
+        ("2024-03", "groceries", 200.0, 2),
+        ("2024-04", "groceries", 40.0, 1),
+    ]
+
+    # Moving a transaction to another category moves its amount between buckets
+    client.put(
+        f"/api/v1/transactions/{created['id']}",
+        json=dict(march, category="dining", amount=25.0),
+    )
+    response = client.get(
+        "/api/v1/transactions/summary",
+        params={"user_id": user_id, "start_month": "2024-03", "end_month": "2024-03"},
+    )
+    assert [(b["category"], b["total"], b["count"]) for b in response.json()] == [
+        ("dining", 25.0, 1),
+        ("groceries", 100.0, 1),
+    ]
+
+    # Emptied buckets disappear
+    client.delete(f"/api/v1/transactions/{created['id']}")
+    response = client.get(
+        "/api/v1/transactions/summary",
+        params={"user_id": user_id, "type": "expense"},
+    )
+    assert [b["category"] for b in response.json()] == ["groceries", "groceries"]
+
+
+def assert_rollups_match_transactions(db: Session, user_id: int):
+    """The rollup buckets equal a fresh aggregate of the user's transactions."""
+    db.expire_all()
+    expected = {}
+    for t in db.query(Transaction).filter_by(user_id=user_id):
+        key = (t.transaction_date.strftime("%Y-%m"), t.category, t.type, t.currency)
+        total, count = expected.get(key, (0, 0))
+        expected[key] = (total + t.amount_minor, count + 1)
+    assert {
+        (r.year_month, r.category, r.type, r.currency): (r.total_minor, r.count)
+        for r in db.query(TransactionRollup).filter_by(user_id=user_id)
+    } == expected
+
+
+def test_transaction_summary_survives_concurrent_writes(
+    client, db, async_session_factory, test_transaction
+):
+    """Test racing deletes and stale updates never adjust a rollup twice."""
+    user_id = test_transaction["user_id"]
+    kept = client.post("/api/v1/transactions/", json=test_transaction).json()
+    deleted = client.post("/api/v1/transactions/", json=test_transaction).json()
+
+    async def delete(transaction_id):
+        async with async_session_factory() as session:
+            removed = await transaction_crud.delete_transaction(session, transaction_id)
+            await session.commit()
+            return removed
+
+    async def delete_twice():
+        return await asyncio.gather(delete(deleted["id"]), delete(deleted["id"]))
+
+    assert sorted(asyncio.run(delete_twice())) == [False, True]
+    assert_rollups_match_transactions(db, user_id)
+    response = client.get(f"/api/v1/transactions/summary?user_id={user_id}")
+    assert [(b["total"], b["count"]) for b in response.json()] == [(100.0, 1)]
+    assert client.delete(f"/api/v1/transactions/{deleted['id']}").status_code == 404
+
+    # An update based on a read that another update has since overtaken
+    async def stale_update():
+        async with async_session_factory() as session:
+            current = await transaction_crud.get_transaction_row(
+                session, ("id", *transaction_crud.ROLLUP_SOURCE_COLUMNS), kept["id"]
+            )
+            client.put(
+                f"/api/v1/transactions/{kept['id']}",
+                json=dict(test_transaction, category="dining"),
+            )
+            return await transaction_crud.update_transaction(
+                session, current._mapping, {"category": "travel"}
+            )
+
+    assert asyncio.run(stale_update()) is False
+    assert_rollups_match_transactions(db, user_id)
+    assert db.get(Transaction, kept["id"]).category == "dining"
+
+
+def test_transaction_summary_invalid_month(client, test_user):
+    response = client.get(
+        f"/api/v1/transactions/summary?user_id={test_user.id}&start_month=2024-13"
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_transaction_amounts_are_exact(client, test_transaction):
+    """Test amounts round-trip and sum without floating point drift."""
+    for amount in ["0.10", "0.20"]:
+        response = client.post(
+            "/api/v1/transactions/", json=dict(test_transaction, amount=amount)
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+    client.post(
+        "/api/v1/transactions/",
+        json=dict(test_transaction, amount=1500, currency="JPY"),
+    )
+
+    response = client.get(
+        f"/api/v1/transactions/totals?user_id={test_transaction['user_id']}"
+    )
+    assert response.status_code == 200
+    assert response.json() == [
+        {"currency": "JPY", "total": 1500},
+        {"currency": "USD", "total": 0.3},
+    ]
+    response = client.get(
+        "/api/v1/transactions/totals",
+        params={"user_id": test_transaction["user_id"], "status": "posted"},
+    )
+    assert response.json() == []
+
+    response = client.get(
+        f"/api/v1/transactions/summary?user_id={test_transaction['user_id']}"
+    )
+    assert sorted((b["currency"], b["total"]) for b in response.json()) == [
+        ("JPY", 1500.0),
+        ("USD", 0.3),
+    ]
+
+
+def test_create_transaction_excess_precision(client, test_transaction):
+    response = client.post(
+        "/api/v1/transactions/", json=dict(test_transaction, amount="10.001")
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    response = client.post(
+        "/api/v1/transactions/",
+        json=dict(test_transaction, amount="10.5", currency="JPY"),
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_update_transaction_currency_and_amount_together(client, test_transaction):
+    """Test a new currency applies to the new amount, not the stored one."""
+    created = client.post(
+        "/api/v1/transactions/", json=dict(test_transaction, amount="10.50")
+    ).json()
+
+    response = client.put(
+        f"/api/v1/transactions/{created['id']}",
+        json=dict(test_transaction, currency="JPY", amount="1000"),
+    )
+    assert response.status_code == 200
+    assert (response.json()["amount"], response.json()["currency"]) == (1000, "JPY")
+
+    response = client.get(
+        f"/api/v1/transactions/summary?user_id={test_transaction['user_id']}"
+    )
+    assert [(b["currency"], b["total"]) for b in response.json()] == [("JPY", 1000.0)]
+
+
+def test_read_endpoints_match_response_model(
+    client, db: Session, test_user, test_plaid_account
+):
+    """Test the fast read path produces the same JSON as the Pydantic schema."""
+    transaction = Transaction(
+        amount="1234.56",
+        currency="EUR",
+        type=TransactionTypeEnum.INCOME,
+        status=TransactionStatusEnum.POSTED,
+        category="salary",
+        merchant_name=None,
+        description="Payroll",
+        transaction_date=datetime(2024, 3, 1, 9, 30, 15, 123456),
+        posted_date=datetime(2024, 3, 2),
+        user_id=test_user.id,
+        plaid_item_id=test_plaid_account.plaid_item_id,
+        plaid_account_id=test_plaid_account.id
+    )
+    db.add(transaction)
+    db.commit()
+    expected = json.loads(
+        TransactionSchema.model_validate(transaction).model_dump_json()
+    )
+
+    response = client.get(f"/api/v1/transactions/{transaction.id}")
+    assert response.status_code == 200
+    assert response.json() == expected
+    assert list(response.json()) == list(expected)
+
+    response = client.get("/api/v1/transactions/")
+    assert response.json() == [expected]
+
+
+def test_conditional_get_transactions(client, test_transaction):
+    """Test ETags on the read endpoints change only when the data does."""
+    created = client.post("/api/v1/transactions/", json=test_transaction).json()
+    url = f"/api/v1/transactions/{created['id']}"
+
+    etag = client.get(url).headers["ETag"]
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+
+    list_etag = client.get("/api/v1/transactions/").headers["ETag"]
+    response = client.get(
+        "/api/v1/transactions/", headers={"If-None-Match": f"W/{list_etag}"}
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    client.put(url, json=dict(test_transaction, category="dining"))
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
+    response = client.get("/api/v1/transactions/", headers={"If-None-Match": list_etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()[0]["category"] == "dining"